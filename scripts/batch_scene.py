@@ -0,0 +1,122 @@
+#!/usr/bin/python
+# ================================
+# (C)2024 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# modo python
+# batch cable and IK setup for the scenes of one headless session
+# usage:
+# - started by batch_setup.py through modo_cl: @batch_scene.py "<job file>"
+
+import re
+import time
+
+import lx
+import modo
+
+import h3d_cable_setup.scripts.cable_setup as cable_setup
+import h3d_cable_setup.scripts.ik_setup_by_selected_vertices as ik_setup
+from h3d_cable_setup.scripts.batch_setup import (
+    MODE_CABLES,
+    STATUS_FAILED,
+    STATUS_OK,
+    BatchJob,
+    SceneResult,
+    append_result,
+)
+from h3d_cable_setup.scripts.chain_resample import ChainResampling
+
+
+def get_curve_meshes(pattern: str) -> list[modo.Item]:
+    # curve detection is left to the cable planner, meshes without curves are skipped there
+    name_pattern = re.compile(pattern)
+    return [mesh for mesh in modo.Scene().meshes if name_pattern.search(mesh.name)]
+
+
+def get_selection_set_meshes(selection_set: str) -> list[modo.Item]:
+    meshes = []
+    for mesh in modo.Scene().meshes:
+        pick_maps = mesh.geometry.vmaps.getMapsByType([lx.symbol.i_VMAP_PICK])  # type: ignore
+        if any(pick_map.name == selection_set for pick_map in pick_maps):
+            meshes.append(mesh)
+    return meshes
+
+
+def select_set_vertices(meshes: list[modo.Item], selection_set: str) -> None:
+    # IK setup reads selected vertices of every mesh
+    lxq = ik_setup.lxq
+    lxq.eval('select.drop item')
+    for mesh in meshes:
+        lxq.select(mesh, replace=False)
+    lxq.eval('select.type vertex')
+    lxq.eval('select.drop vertex')
+    lxq.eval(f'select.useSet "{selection_set}" select')
+    lxq.flush()
+
+
+def build_cables(job: BatchJob, result: SceneResult) -> None:
+    meshes = get_curve_meshes(job.curve_pattern)
+    result.matched = len(meshes)
+    if not meshes:
+        return
+    cables = cable_setup.build_cables(meshes, job.is_profile_independent)
+    cable_setup.lxq.flush()
+    result.built = sum(1 for cable in cables if cable.cable_mesh)
+
+
+def build_ik_setups(job: BatchJob, result: SceneResult) -> None:
+    meshes = get_selection_set_meshes(job.selection_set)
+    result.matched = len(meshes)
+    if not meshes:
+        return
+    select_set_vertices(meshes, job.selection_set)
+    resampling = ChainResampling(job.joint_count, job.max_segment_length)
+    ik_results = ik_setup.build_ik_setups(meshes, resampling)
+    ik_setup.lxq.flush()
+    result.built = sum(1 for ik_result in ik_results if ik_result.status != ik_setup.STATUS_SKIPPED)
+
+
+def process_scene(job: BatchJob, scene: str) -> SceneResult:
+    result = SceneResult(scene, job.mode)
+    start = time.perf_counter()
+    is_opened = False
+    try:
+        lx.eval(f'scene.open "{scene}" normal')
+        is_opened = True
+        if job.mode == MODE_CABLES:
+            build_cables(job, result)
+        else:
+            build_ik_setups(job, result)
+        if job.is_save and result.built:
+            lx.eval('scene.save')
+        result.status = STATUS_OK
+    except Exception as error:
+        result.status = STATUS_FAILED
+        result.message = f'{type(error).__name__}: {error}'
+    finally:
+        # queued commands of a failed scene must not leak into the next one
+        # and the journal would grow for the whole batch
+        for queue in (cable_setup.lxq, ik_setup.lxq):
+            queue.commands.clear()
+            queue.journal.clear()
+        if is_opened:
+            lx.eval('!scene.close')
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def main():
+    args = lx.args()
+    if not args:
+        print('Please provide a batch job file')
+        return
+    job = BatchJob.read(args[0])
+    for scene in job.scenes:
+        result = process_scene(job, scene)
+        append_result(job.results, result)
+        print(f'{result.status}: {scene}, {result.built} of {result.matched} built, {result.seconds:.3f} s '
+              f'{result.message}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,325 @@
+#!/usr/bin/python
+# ================================
+# (C)2024 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# python
+# batch cable and IK setup over many scene files with a bounded pool of headless modo sessions
+# every session runs batch_scene.py on a chunk of scenes, results are collected per scene file
+# usage:
+# - from the kits folder: python -m h3d_cable_setup.scripts.batch_setup [options] scene.lxo [scene.lxo ...]
+# - cables for curves named by the [...] token convention: --cables
+# - cables for curves matching a name pattern: --cables "^wire_.*\[.*\]$"
+# - IK setup by vertex selection set: --ik "IK chain"
+# - scene list file, one path per line: --list scenes.txt
+# no modo dependencies, modo_cl is started for every session
+
+import argparse
+import csv
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from h3d_cable_setup.scripts.cable_params import NAME_PATTERN
+
+
+MODE_CABLES = 'cables'
+MODE_IK = 'ik'
+MODES = (MODE_CABLES, MODE_IK)
+
+STATUS_OK = 'ok'
+STATUS_FAILED = 'failed'
+STATUS_NOT_RUN = 'not run'
+
+JOB_VERSION = 1
+
+MODO_CL_ENV = 'MODO_CL'
+DEFAULT_MODO_CL = 'modo_cl'
+BATCH_SCENE_SCRIPT = 'kit_h3d_cable_setup:scripts/batch_scene.py'
+
+DEFAULT_WORKERS = 2
+# modo_cl startup takes seconds, several scenes are processed per session
+DEFAULT_SCENES_PER_SESSION = 10
+DEFAULT_SESSION_TIMEOUT = 3600.0
+DEFAULT_OUTPUT = 'h3d_batch'
+
+JOB_FILE_EXT = '.job.json'
+RESULTS_FILE_EXT = '.results.jsonl'
+REPORT_JSON_FILE_EXT = '.json'
+REPORT_CSV_FILE_EXT = '.csv'
+
+
+class BatchJob:
+    """Scenes and selection rule of one headless session"""
+
+    def __init__(self, scenes: list[str], mode: str, results: str) -> None:
+        if mode not in MODES:
+            raise ValueError(f'{mode=}')
+        self.scenes = scenes
+        self.mode = mode
+        self.results = results
+        self.curve_pattern = NAME_PATTERN.pattern
+        self.selection_set = ''
+        self.is_profile_independent = False
+        self.joint_count = 0
+        self.max_segment_length = 0.0
+        self.is_save = True
+
+    def as_dict(self) -> dict:
+        return {
+            'version': JOB_VERSION,
+            'scenes': self.scenes,
+            'mode': self.mode,
+            'results': self.results,
+            'curve_pattern': self.curve_pattern,
+            'selection_set': self.selection_set,
+            'is_profile_independent': self.is_profile_independent,
+            'joint_count': self.joint_count,
+            'max_segment_length': self.max_segment_length,
+            'is_save': self.is_save,
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> 'BatchJob':
+        if data.get('version') != JOB_VERSION:
+            raise ValueError(f'{data.get("version")=}')
+        job = BatchJob(data['scenes'], data['mode'], data['results'])
+        job.curve_pattern = data['curve_pattern']
+        job.selection_set = data['selection_set']
+        job.is_profile_independent = data['is_profile_independent']
+        job.joint_count = data['joint_count']
+        job.max_segment_length = data['max_segment_length']
+        job.is_save = data['is_save']
+        return job
+
+    def write(self, filename: str) -> None:
+        with open(filename, 'w') as file:
+            json.dump(self.as_dict(), file, indent=4)
+
+    @staticmethod
+    def read(filename: str) -> 'BatchJob':
+        with open(filename) as file:
+            return BatchJob.from_dict(json.load(file))
+
+    def copy(self, scenes: list[str], results: str) -> 'BatchJob':
+        data = self.as_dict()
+        data['scenes'] = scenes
+        data['results'] = results
+        return BatchJob.from_dict(data)
+
+
+class SceneResult:
+    """Outcome and timing of one scene file"""
+
+    def __init__(self, scene: str, mode: str) -> None:
+        self.scene = scene
+        self.mode = mode
+        self.status = STATUS_NOT_RUN
+        self.matched = 0
+        self.built = 0
+        self.seconds = 0.0
+        self.session = -1
+        self.message = ''
+
+    def as_dict(self) -> dict:
+        return {
+            'scene': self.scene,
+            'mode': self.mode,
+            'status': self.status,
+            'matched': self.matched,
+            'built': self.built,
+            'seconds': self.seconds,
+            'session': self.session,
+            'message': self.message,
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> 'SceneResult':
+        result = SceneResult(data['scene'], data['mode'])
+        result.status = data['status']
+        result.matched = data['matched']
+        result.built = data['built']
+        result.seconds = data['seconds']
+        result.session = data.get('session', -1)
+        result.message = data.get('message', '')
+        return result
+
+
+def append_result(filename: str, result: SceneResult) -> None:
+    # one line per scene, written as soon as the scene is done so a crashed session keeps finished scenes
+    with open(filename, 'a') as file:
+        file.write(json.dumps(result.as_dict(), separators=(',', ':')) + '\n')
+
+
+def read_results(filename: str) -> list[SceneResult]:
+    if not os.path.exists(filename):
+        return []
+    results = []
+    with open(filename) as file:
+        for line in file:
+            try:
+                results.append(SceneResult.from_dict(json.loads(line)))
+            except (ValueError, KeyError):
+                # a session killed while writing leaves a partial last line
+                continue
+    return results
+
+
+def get_chunks(scenes: list[str], scenes_per_session: int) -> list[list[str]]:
+    if scenes_per_session < 1:
+        raise ValueError(f'{scenes_per_session=}')
+    return [scenes[i:i + scenes_per_session] for i in range(0, len(scenes), scenes_per_session)]
+
+
+def get_session_commands(job_filename: str) -> str:
+    # modo_cl reads commands from stdin
+    return f'@{{{BATCH_SCENE_SCRIPT}}} "{job_filename}"\napp.quit\n'
+
+
+def run_session(modo_cl: str, job: BatchJob, job_filename: str, session: int, timeout: float) -> list[SceneResult]:
+    job.write(job_filename)
+    message = ''
+    try:
+        completed = subprocess.run(
+            [modo_cl],
+            input=get_session_commands(job_filename),
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+        if completed.returncode:
+            message = f'{modo_cl} exit code {completed.returncode}'
+    except subprocess.TimeoutExpired:
+        message = f'session timed out after {timeout} s'
+    except OSError as error:
+        message = f'{modo_cl}: {error}'
+
+    results = {result.scene: result for result in read_results(job.results)}
+    session_results = []
+    for scene in job.scenes:
+        result = results.get(scene)
+        if not result:
+            result = SceneResult(scene, job.mode)
+            result.message = message or 'no result reported by the session'
+        result.session = session
+        session_results.append(result)
+    return session_results
+
+
+def run_batch(
+        scenes: list[str],
+        job: BatchJob,
+        modo_cl: str,
+        workers: int = DEFAULT_WORKERS,
+        scenes_per_session: int = DEFAULT_SCENES_PER_SESSION,
+        timeout: float = DEFAULT_SESSION_TIMEOUT) -> list[SceneResult]:
+    # every worker thread waits for one modo_cl process at a time
+    if workers < 1:
+        raise ValueError(f'{workers=}')
+    chunks = get_chunks([os.path.abspath(scene) for scene in scenes], scenes_per_session)
+    with tempfile.TemporaryDirectory(prefix='h3d_batch_') as folder:
+        sessions = []
+        for session, chunk in enumerate(chunks):
+            basename = os.path.join(folder, f'session_{session}')
+            sessions.append((job.copy(chunk, basename + RESULTS_FILE_EXT), basename + JOB_FILE_EXT, session))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(run_session, modo_cl, session_job, job_filename, session, timeout)
+                for session_job, job_filename, session in sessions
+            ]
+            return [result for future in futures for result in future.result()]
+
+
+def write_report_json(filename: str, results: list[SceneResult], seconds: float) -> None:
+    with open(filename, 'w') as file:
+        json.dump({
+            'seconds': seconds,
+            'scenes': len(results),
+            'failed': sum(result.status != STATUS_OK for result in results),
+            'results': [result.as_dict() for result in results],
+        }, file, indent=4)
+
+
+def write_report_csv(filename: str, results: list[SceneResult]) -> None:
+    with open(filename, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=list(SceneResult('', MODE_CABLES).as_dict().keys()))
+        writer.writeheader()
+        for result in results:
+            writer.writerow(result.as_dict())
+
+
+def get_report(results: list[SceneResult], seconds: float) -> str:
+    failed = [result for result in results if result.status != STATUS_OK]
+    scene_seconds = sum(result.seconds for result in results)
+    lines = [
+        f'{len(results)} scenes, {len(failed)} failed, {seconds:.1f} s wall time, '
+        f'{scene_seconds:.1f} s in scenes, {scene_seconds / max(len(results), 1):.2f} s per scene'
+    ]
+    lines.extend(f'{result.status}: {result.scene} {result.message}' for result in failed)
+    return '\n'.join(lines)
+
+
+def read_scene_list(filename: str) -> list[str]:
+    # relative paths are relative to the list file
+    folder = os.path.dirname(os.path.abspath(filename))
+    with open(filename) as file:
+        return [os.path.join(folder, line.strip()) for line in file if line.strip() and not line.startswith('#')]
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='batch cable and IK setup over scene files')
+    parser.add_argument('scenes', nargs='*', help='scene files')
+    parser.add_argument('--list', help='text file with one scene path per line')
+    rule = parser.add_mutually_exclusive_group(required=True)
+    rule.add_argument('--cables', nargs='?', const=NAME_PATTERN.pattern, metavar='PATTERN',
+                      help='build cables for curve meshes with names matching the pattern, [...] tokens by default')
+    rule.add_argument('--ik', metavar='SELECTION_SET', help='build IK setups for vertices of the selection set')
+    parser.add_argument('--independent', action='store_true', help='independent cable profiles')
+    parser.add_argument('--joints', type=int, default=0, help='IK joint count')
+    parser.add_argument('--segment', type=float, default=0.0, help='IK maximum segment length')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='concurrent modo_cl sessions')
+    parser.add_argument('--scenes-per-session', type=int, default=DEFAULT_SCENES_PER_SESSION)
+    parser.add_argument('--timeout', type=float, default=DEFAULT_SESSION_TIMEOUT, help='seconds per session')
+    parser.add_argument('--modo-cl', default=os.environ.get(MODO_CL_ENV, DEFAULT_MODO_CL), help='modo_cl executable')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='report basename for .json and .csv files')
+    parser.add_argument('--no-save', action='store_true', help='leave scene files unchanged')
+    return parser
+
+
+def main() -> int:
+    args = get_parser().parse_args()
+    scenes: list[str] = list(args.scenes)
+    if args.list:
+        scenes.extend(read_scene_list(args.list))
+    if not scenes:
+        print('No scene files given')
+        return 1
+
+    job = BatchJob([], MODE_IK if args.ik else MODE_CABLES, '')
+    if args.ik:
+        job.selection_set = args.ik
+    else:
+        job.curve_pattern = args.cables
+    job.is_profile_independent = args.independent
+    job.joint_count = args.joints
+    job.max_segment_length = args.segment
+    job.is_save = not args.no_save
+
+    workers = max(1, min(args.workers, math.ceil(len(scenes) / args.scenes_per_session)))
+    start = time.perf_counter()
+    results = run_batch(scenes, job, args.modo_cl, workers, args.scenes_per_session, args.timeout)
+    seconds = time.perf_counter() - start
+
+    write_report_json(args.output + REPORT_JSON_FILE_EXT, results, seconds)
+    write_report_csv(args.output + REPORT_CSV_FILE_EXT, results)
+    print(get_report(results, seconds))
+    return 1 if any(result.status != STATUS_OK for result in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,224 @@
+#!/usr/bin/python
+# ================================
+# (C)2024 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# modo python
+# benchmark cable setup and IK setup
+# usage:
+# - select curve mesh
+# - run command: @benchmark.py
+# - cable or IK setup only: @benchmark.py cables, @benchmark.py ik
+# - store current results as baseline: @benchmark.py baseline
+# - emulate slower commands, seconds per lx.eval call: @benchmark.py latency:0.001
+# - outside modo against the fake modo and lx modules: python tests/run_benchmark.py [arguments]
+# command count per cable or vertex above the stored baseline fails the benchmark
+
+import json
+import os
+import time
+from typing import Union
+
+import lx
+import modo
+import modo.constants as c
+
+from h3d_utilites.scripts.h3d_utils import replace_file_ext
+
+import h3d_cable_setup.scripts.cable_setup as cable_setup
+import h3d_cable_setup.scripts.ik_setup_by_selected_vertices as ik_setup
+
+
+BENCH_BASENAME = 'h3d_bench'
+BENCH_PARAMETERS = 'd5:s24:p6'
+
+CMD_CABLES = 'cables'
+CMD_IK = 'ik'
+CMD_BASELINE = 'baseline'
+CMD_LATENCY = 'latency:'
+
+CABLE_COUNTS = (1, 10, 100, 300)
+IK_VERTEX_COUNTS = (10, 20, 50, 100, 200, 500, 1000)
+IK_SEGMENT_LENGTH = 0.01
+# filler locators added to the scene to measure scene size impact
+SCENE_SIZES = (0, 1000, 10000)
+
+BASELINE_FILE_EXT = '.benchmark.json'
+# allowed command count growth per cable or vertex before the benchmark fails
+BASELINE_TOLERANCE = 0.01
+
+
+class EvalCounter:
+    """Counts lx.eval calls issued while active"""
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.count = 0
+        self.latency = latency
+        self._eval = lx.eval
+
+    def __enter__(self) -> 'EvalCounter':
+        lx.eval = self.eval
+        return self
+
+    def __exit__(self, *_) -> None:
+        lx.eval = self._eval
+
+    def eval(self, command: str):
+        self.count += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return self._eval(command)
+
+
+class BenchResult:
+    def __init__(self, operation: str, count: int, scene_size: int) -> None:
+        self.operation = operation
+        self.count = count
+        self.scene_size = scene_size
+        self.seconds = 0.0
+        self.evals = 0
+        self.selection_events = 0
+
+    @property
+    def key(self) -> str:
+        return f'{self.operation}:{self.count}:{self.scene_size}'
+
+    @property
+    def evals_per_item(self) -> float:
+        return self.evals / max(self.count, 1)
+
+    def __str__(self) -> str:
+        count = max(self.count, 1)
+        return (f'{self.operation}: {self.count} items, scene size {self.scene_size}, {self.seconds:.3f} s, '
+                f'{self.seconds / count * 1000:.2f} ms per item, {self.evals} lx.eval calls, '
+                f'{self.evals_per_item:.1f} lx.eval per item, '
+                f'{self.selection_events / count:.1f} selection events per item')
+
+
+def new_scene_filler(count: int) -> list[modo.Item]:
+    return [modo.Scene().addItem(itype=c.LOCATOR_TYPE, name=f'{BENCH_BASENAME}_filler') for _ in range(count)]
+
+
+def new_bench_curves(curve: modo.Item, count: int) -> list[modo.Item]:
+    curves: list[modo.Item] = []
+    for i in range(count):
+        duplicate = modo.Scene().duplicateItem(curve)
+        duplicate.name = f'{BENCH_BASENAME}_{i}[{BENCH_PARAMETERS}]'
+        curves.append(duplicate)
+    return curves
+
+
+def bench_cables(curves: list[modo.Item], is_batch: bool, scene_size: int, latency: float) -> BenchResult:
+    result = BenchResult('batch cables' if is_batch else 'serial cables', len(curves), scene_size)
+    batch_min_cables = cable_setup.BATCH_MIN_CABLES
+    if not is_batch:
+        cable_setup.BATCH_MIN_CABLES = len(curves) + 1
+    selection_events = cable_setup.lxq.selection_events
+    start = time.perf_counter()
+    with EvalCounter(latency) as counter:
+        cables = cable_setup.build_cables(curves, is_profile_independent=False)
+        cable_setup.lxq.flush()
+    result.seconds = time.perf_counter() - start
+    cable_setup.BATCH_MIN_CABLES = batch_min_cables
+    result.evals = counter.count
+    result.selection_events = cable_setup.lxq.selection_events - selection_events
+
+    for cable in cables:
+        cable.remove_cable_setup()
+    return result
+
+
+def new_bench_chain(count: int) -> modo.Item:
+    mesh = modo.Scene().addMesh(f'{BENCH_BASENAME}_chain_{count}')
+    with mesh.geometry as geometry:  # type: ignore
+        for i in range(count):
+            geometry.vertices.new((0.0, i * IK_SEGMENT_LENGTH, 0.0))
+    mesh.geometry.vertices.select(list(mesh.geometry.vertices), replace=True)  # type: ignore
+    return mesh
+
+
+def bench_ik_setup(count: int, scene_size: int, latency: float) -> BenchResult:
+    result = BenchResult('ik setup', count, scene_size)
+    mesh = new_bench_chain(count)
+    selection_events = ik_setup.lxq.selection_events
+    start = time.perf_counter()
+    with EvalCounter(latency) as counter:
+        group = ik_setup.make_ik_setup(mesh)
+        ik_setup.lxq.flush()
+    result.seconds = time.perf_counter() - start
+    result.evals = counter.count
+    result.selection_events = ik_setup.lxq.selection_events - selection_events
+
+    # influences are linked to the weight containers, not parented to the group
+    if group:
+        ik_setup.IkSet(group, mesh).remove()
+    modo.Scene().removeItems(mesh)
+    return result
+
+
+def run_suite(curve: Union[modo.Item, None], is_cables: bool, is_ik: bool, latency: float) -> list[BenchResult]:
+    results: list[BenchResult] = []
+    for scene_size in SCENE_SIZES:
+        filler = new_scene_filler(scene_size)
+        if is_cables and curve:
+            for count in CABLE_COUNTS:
+                curves = new_bench_curves(curve, count)
+                results.append(bench_cables(curves, False, scene_size, latency))
+                results.append(bench_cables(curves, True, scene_size, latency))
+                for item in curves:
+                    modo.Scene().removeItems(item)
+        if is_ik:
+            for count in IK_VERTEX_COUNTS:
+                results.append(bench_ik_setup(count, scene_size, latency))
+        for item in filler:
+            modo.Scene().removeItems(item)
+    return results
+
+
+def get_regressions(results: list[BenchResult], baseline: dict[str, float]) -> list[str]:
+    regressions: list[str] = []
+    for result in results:
+        if result.key not in baseline:
+            continue
+        if result.evals_per_item > baseline[result.key] * (1 + BASELINE_TOLERANCE):
+            regressions.append(
+                f'{result.key}: {result.evals_per_item:.1f} lx.eval per item, baseline {baseline[result.key]:.1f}'
+            )
+    return regressions
+
+
+def main():
+    args = lx.args() or []
+    is_cables = CMD_IK not in args
+    is_ik = CMD_CABLES not in args
+    latency = 0.0
+    for arg in args:
+        if arg.startswith(CMD_LATENCY):
+            latency = float(arg[len(CMD_LATENCY):])
+
+    curve = None
+    selected = modo.Scene().selectedByType(itype=c.MESH_TYPE)
+    if selected:
+        curve = selected[0]
+    elif is_cables:
+        print('Select curve mesh to benchmark cable setup')
+
+    results = run_suite(curve, is_cables, is_ik, latency)
+    for result in results:
+        print(result)
+
+    baseline_filename = replace_file_ext(modo.Scene().filename, BASELINE_FILE_EXT)
+    if CMD_BASELINE in args or not os.path.exists(baseline_filename):
+        with open(baseline_filename, 'w') as file:
+            json.dump({result.key: result.evals_per_item for result in results}, file, indent=4)
+        print(f'Baseline stored: <{baseline_filename}>')
+        return
+
+    with open(baseline_filename) as file:
+        regressions = get_regressions(results, json.load(file))
+    if regressions:
+        raise RuntimeError('lx.eval count per item increased:\n' + '\n'.join(regressions))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/python
+# ================================
+# (C)2024 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# python
+# benchmark cable name parser, runs without modo
+# usage:
+# - from the folder containing the kit: python -m h3d_cable_setup.scripts.benchmark_parser [name count] [seed]
+# fuzz and property checks of the parser are in tests/test_cable_params.py
+
+import random
+import sys
+import time
+
+from h3d_cable_setup.scripts.cable_params import parse_cable_name, parse_cable_name_cached
+
+
+DEFAULT_NAME_COUNT = 100_000
+DEFAULT_SEED = 0
+
+# share of names following one of a few common patterns
+SHARED_PATTERN_RATIO = 0.9
+SHARED_PATTERNS = (
+    'wire[5:s32]',
+    'wire[d5:s24:f1:t1:p6:mat]',
+    'harness[0.5cm:f:copper]',
+    'tube[d12mm:s48:f0:t2:p8]',
+)
+
+
+def new_names(count: int, rnd: random.Random) -> list[str]:
+    names = []
+    for i in range(count):
+        if rnd.random() < SHARED_PATTERN_RATIO:
+            names.append(rnd.choice(SHARED_PATTERNS))
+        else:
+            names.append(f'cable_{i}[d{rnd.randint(1, 50)}:s{rnd.randint(2, 64)}:p{rnd.randint(3, 12)}]')
+    return names
+
+
+def bench_parser(names: list[str]) -> None:
+    parse_cable_name_cached.cache_clear()
+    start = time.perf_counter()
+    for name in names:
+        parse_cable_name(name)
+    elapsed = time.perf_counter() - start
+    info = parse_cable_name_cached.cache_info()
+    print(f'parse: {len(names)} names, {elapsed:.3f} s, {elapsed / len(names) * 1e6:.2f} us per name, '
+          f'{info.hits} cache hits, {info.misses} cache misses')
+
+
+def main() -> None:
+    name_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_NAME_COUNT
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_SEED
+
+    bench_parser(new_names(name_count, random.Random(seed)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/python
+# ================================
+# (C)2024 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# python
+# benchmark vertex chain ordering against selection size, runs without modo
+# usage:
+# - from the kits folder: python -m h3d_cable_setup.scripts.benchmark_vertex_order [max vertex count] [seed]
+
+import math
+import random
+import sys
+import time
+
+from h3d_cable_setup.scripts.vertex_order import ORDER_LOOP, ORDER_NEAREST, ORDER_PATH, get_chain_order
+
+
+DEFAULT_MAX_VERTEX_COUNT = 100_000
+DEFAULT_SEED = 0
+VERTEX_COUNTS = (10, 100, 1000, 10_000, 100_000)
+
+HELIX_RADIUS = 1.0
+HELIX_TURNS = 10
+HELIX_HEIGHT = 5.0
+
+
+def new_helix(count: int) -> list[tuple[float, float, float]]:
+    positions = []
+    for i in range(count):
+        angle = i / count * HELIX_TURNS * 2 * math.pi
+        positions.append((HELIX_RADIUS * math.cos(angle), i / count * HELIX_HEIGHT, HELIX_RADIUS * math.sin(angle)))
+    return positions
+
+
+def new_selection(count: int, is_loop: bool, is_connected: bool, rnd: random.Random):
+    # shuffled helix vertices as clicked in random order, with or without edges between them
+    positions = new_helix(count)
+    shuffled = list(range(count))
+    rnd.shuffle(shuffled)
+    selection_index = {vertex: i for i, vertex in enumerate(shuffled)}
+    neighbors: list[list[int]] = [[] for _ in range(count)]
+    if is_connected:
+        edges = [(vertex, vertex + 1) for vertex in range(count - 1)]
+        if is_loop:
+            edges.append((count - 1, 0))
+        for first, second in edges:
+            neighbors[selection_index[first]].append(selection_index[second])
+    return [positions[vertex] for vertex in shuffled], neighbors, shuffled
+
+
+def is_chain(order: list[int], shuffled: list[int], is_loop: bool) -> bool:
+    chain = [shuffled[i] for i in order]
+    count = len(chain)
+    steps = [(chain[i + 1] - chain[i]) % count for i in range(count - 1)]
+    if is_loop:
+        return all(step == steps[0] for step in steps) and steps[0] in (1, count - 1)
+    return steps in ([1] * (count - 1), [count - 1] * (count - 1))
+
+
+def bench_order(count: int, is_loop: bool, is_connected: bool, rnd: random.Random) -> bool:
+    positions, neighbors, shuffled = new_selection(count, is_loop, is_connected, rnd)
+    start = time.perf_counter()
+    order, method = get_chain_order(positions, neighbors)
+    elapsed = time.perf_counter() - start
+    is_valid = is_chain(order, shuffled, is_loop)
+    print(f'{method:<8}: {count} vertices, {elapsed:.4f} s, {elapsed / count * 1e6:.2f} us per vertex, '
+          f'{"valid" if is_valid else "invalid"} chain')
+    return is_valid
+
+
+def main() -> int:
+    max_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_MAX_VERTEX_COUNT
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_SEED
+    rnd = random.Random(seed)
+
+    failures = 0
+    for count in VERTEX_COUNTS:
+        if count > max_count:
+            break
+        for is_loop, is_connected, method in ((False, True, ORDER_PATH), (True, True, ORDER_LOOP), (False, False, ORDER_NEAREST)):
+            if not bench_order(count, is_loop, is_connected, rnd) and method != ORDER_NEAREST:
+                failures += 1
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,182 @@
+#!/usr/bin/python
+# ================================
+# (C)2024 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# python
+# cable parameters parser for curve names
+# <basename>[<token>:<token>:...], e.g. wire[d5:s24:f1:t1:p6:mat]
+# tokens are read from the last bracket group, a[b][d5] is basename a[b] with tokens d5
+# material names start with a letter, digit-leading tokens like 3m_tape are rejected as unknown tokens
+# no modo dependencies
+
+import copy
+import re
+from functools import lru_cache
+
+
+DELIMITER = ':'
+
+DEFAULT_CABLE_BASENAME = ''
+DEFAULT_DIAMETER = 0.01
+DEFAULT_COMPENSATION = 1.2308
+DEFAULT_MATERIAL_TAG = ''
+DEFAULT_PATH_STEPS = 24
+DEFAULT_POLYGON_TYPE = 1
+DEFAULT_FLIP = True
+DEFAULT_SIDES = 6
+
+ID_DIAMETER = 'd'
+ID_STEPS = 's'
+ID_FLIP = 'f'
+ID_POLYGON_TYPE = 't'
+ID_SIDES = 'p'
+
+POLYGON_TYPES = range(3)
+# a swept path needs a segment, a profile needs a face
+MIN_STEPS = 1
+MIN_SIDES = 3
+
+# diameter unit factors to meters, millimeters when no unit given
+UNITS = {
+    '': 0.001,
+    'mm': 0.001,
+    'cm': 0.01,
+    'm': 1.0,
+}
+
+PARSE_CACHE_SIZE = 4096
+
+NAME_PATTERN = re.compile(r'(?P<basename>.*)\[(?P<tokens>[^\[\]]*)\]')
+PARAMETER_PATTERN = re.compile(
+    rf'(?P<id>[{ID_DIAMETER}{ID_STEPS}{ID_FLIP}{ID_POLYGON_TYPE}{ID_SIDES}]?)'
+    r'(?P<value>\d+(?:\.\d*)?|\.\d+)(?P<unit>[a-z]*)'
+)
+FLIP_PATTERN = re.compile(ID_FLIP)
+MATERIAL_PATTERN = re.compile(r'[^\d.\s][^\s]*')
+
+
+class CableParams:
+    diameter: float = DEFAULT_DIAMETER
+    compensation: float = DEFAULT_COMPENSATION
+    polygon_type: int = DEFAULT_POLYGON_TYPE
+    steps: float = DEFAULT_PATH_STEPS
+    sides = DEFAULT_SIDES
+    flip: bool = True
+    material_name: str = DEFAULT_MATERIAL_TAG
+    basename = DEFAULT_CABLE_BASENAME
+
+    def as_dict(self) -> dict:
+        return {
+            'basename': self.basename,
+            'diameter': self.diameter,
+            'compensation': self.compensation,
+            'polygon_type': self.polygon_type,
+            'steps': self.steps,
+            'sides': self.sides,
+            'flip': self.flip,
+            'material_name': self.material_name,
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> 'CableParams':
+        params = CableParams()
+        names = params.as_dict()
+        for name, value in data.items():
+            if name not in names:
+                raise ValueError(f'{name=}')
+            setattr(params, name, value)
+        return params
+
+
+class CableNameError(ValueError):
+    """Curve name token that can't be decoded into cable parameters"""
+
+    def __init__(self, name: str, position: int, token: str, reason: str) -> None:
+        self.name = name
+        self.position = position
+        self.token = token
+        self.reason = reason
+        super().__init__(f'{reason}: <{token}> at position {position} in <{name}>')
+
+
+def parse_cable_name(name: str) -> CableParams:
+    # parsed parameters are cached, every caller gets its own copy
+    return copy.copy(parse_cable_name_cached(name))
+
+
+def get_basename(name: str) -> str:
+    # basename is kept when the tokens can't be decoded
+    match = NAME_PATTERN.search(name)
+    if not match:
+        return DEFAULT_CABLE_BASENAME
+    return match['basename'].strip()
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_cable_name_cached(name: str) -> CableParams:
+    params = CableParams()
+    match = NAME_PATTERN.search(name)
+    if not match:
+        return params
+
+    params.basename = match['basename'].strip()
+    if not match['tokens'].strip():
+        return params
+
+    is_material_set = False
+    position = match.start('tokens')
+    for token in match['tokens'].split(DELIMITER):
+        token_position = position + len(token) - len(token.lstrip())
+        position += len(token) + len(DELIMITER)
+        token_stripped = token.lower().strip()
+        if not token_stripped:
+            raise CableNameError(name, token_position, token, 'empty token')
+
+        if parameter := PARAMETER_PATTERN.fullmatch(token_stripped):
+            set_parameter(params, parameter, name, token_position, token_stripped)
+        elif FLIP_PATTERN.fullmatch(token_stripped):
+            params.flip = True
+        elif MATERIAL_PATTERN.fullmatch(token_stripped):
+            if is_material_set:
+                raise CableNameError(name, token_position, token_stripped, 'duplicate material name')
+            params.material_name = token_stripped
+            is_material_set = True
+        else:
+            raise CableNameError(name, token_position, token_stripped, 'unknown token')
+
+    return params
+
+
+def set_parameter(params: CableParams, parameter: re.Match, name: str, position: int, token: str) -> None:
+    parameter_id = parameter['id']
+    value = parameter['value']
+    unit = parameter['unit']
+
+    if parameter_id in ('', ID_DIAMETER):
+        if unit not in UNITS:
+            raise CableNameError(name, position + parameter.start('unit'), token, 'unknown unit')
+        if not float(value):
+            raise CableNameError(name, position + parameter.start('value'), token, 'diameter out of range')
+        params.diameter = float(value) * UNITS[unit]
+        return
+
+    if unit:
+        raise CableNameError(name, position + parameter.start('unit'), token, 'unit not supported')
+    if not value.isdigit():
+        raise CableNameError(name, position + parameter.start('value'), token, 'integer value expected')
+
+    if parameter_id == ID_STEPS:
+        if int(value) < MIN_STEPS:
+            raise CableNameError(name, position + parameter.start('value'), token, 'steps out of range')
+        params.steps = int(value)
+    elif parameter_id == ID_FLIP:
+        params.flip = int(value) != 0
+    elif parameter_id == ID_POLYGON_TYPE:
+        if int(value) not in POLYGON_TYPES:
+            raise CableNameError(name, position + parameter.start('value'), token, 'polygon type out of range')
+        params.polygon_type = int(value)
+    elif parameter_id == ID_SIDES:
+        if int(value) < MIN_SIDES:
+            raise CableNameError(name, position + parameter.start('value'), token, 'sides out of range')
+        params.sides = int(value)
@@ -0,0 +1,289 @@
+#!/usr/bin/python
+# ================================
+# (C)2024 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# python
+# cable build planning: curve summaries in, serializable build plan out
+# no modo dependencies, the plan is applied to the scene by cable_setup
+
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Iterable, Iterator, Union
+
+from h3d_cable_setup.scripts.cable_params import CableParams, CableNameError, get_basename, parse_cable_name
+
+
+CABLE_SHAREABLE_PROFILE_NAME = 'h3d_cable_shareable_profile'
+# pooled shareable profiles are named <shareable profile name>_p<sides>
+PROFILE_POOL_SIDES_PREFIX = '_p'
+CABLE_BASENAME_SUFFIX = '_cable'
+PROFILE_BASENAME_SUFFIX = '_profile'
+
+CH_DIAMETER = 'ctrldiameter'
+CH_DIAMETER_USERNAME = 'Diameter'
+CH_COMP = 'ctrlcompensation'
+CH_COMPENSATION_USERNAME = 'Diameter Compensation'
+CH_STEPS = 'ctrlsteps'
+CH_STEPS_USERNAME = 'Steps'
+CH_SIDES = 'ctrlsides'
+CH_SIDES_USERNAME = 'Sides'
+CH_PTAG = 'ctrlmaterialtag'
+CH_MATERIAL_TAG_USERNAME = 'Material Name'
+CH_FLIP = 'ctrlflip'
+CH_FLIP_USERNAME = 'Flip'
+CH_POLYGON_TYPE = 'ctrlpolytype'
+CH_POLYGON_TYPE_USERNAME = 'Polygon Type (0-2)'
+CH_STEPS_VIEWPORT = 'ctrlstepsviewport'
+CH_STEPS_VIEWPORT_USERNAME = 'Viewport Steps'
+CH_SIDES_VIEWPORT = 'ctrlsidesviewport'
+CH_SIDES_VIEWPORT_USERNAME = 'Viewport Sides'
+CH_LOD = 'ctrllod'
+CH_LOD_USERNAME = 'Level of Detail'
+
+# level of detail blends viewport density at 0 and render density at 1
+DEFAULT_LOD = 1.0
+VIEWPORT_DENSITY_RATIO = 0.25
+MIN_VIEWPORT_STEPS = 2
+MIN_VIEWPORT_SIDES = 3
+
+ACTION_CREATE = 'create'
+ACTION_REBUILD = 'rebuild'
+ACTION_UPDATE = 'update'
+ACTION_SKIP = 'skip'
+ACTIONS = (ACTION_CREATE, ACTION_REBUILD, ACTION_UPDATE, ACTION_SKIP)
+
+PLAN_VERSION = 1
+MANIFEST_FORMAT = 'h3d_cable_manifest'
+MANIFEST_VERSION = 1
+# parsing is cheap, worker processes pay off for very large selections only
+PARALLEL_PLAN_MIN_CURVES = 10000
+PARALLEL_PLAN_CHUNKS_PER_WORKER = 4
+
+
+class CurveSummary:
+    """Scene facts about a selected curve needed for planning"""
+
+    def __init__(self, curve_id: str, name: str, is_curve: bool, is_setup_complete: bool, has_cable: bool) -> None:
+        self.curve_id = curve_id
+        self.name = name
+        self.is_curve = is_curve
+        self.is_setup_complete = is_setup_complete
+        self.has_cable = has_cable
+
+    def as_dict(self) -> dict:
+        return {
+            'curve_id': self.curve_id,
+            'name': self.name,
+            'is_curve': self.is_curve,
+            'is_setup_complete': self.is_setup_complete,
+            'has_cable': self.has_cable,
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> 'CurveSummary':
+        return CurveSummary(
+            data['curve_id'], data['name'], data['is_curve'], data['is_setup_complete'], data['has_cable']
+        )
+
+
+class CablePlan:
+    """Items, profile assignment and control channel values planned for one curve
+
+    the rig topology linking the planned items is fixed, see CableLive.link_cable_channels
+    """
+
+    def __init__(self, curve_id: str, curve_name: str) -> None:
+        self.curve_id = curve_id
+        self.curve_name = curve_name
+        self.action = ACTION_SKIP
+        self.params = CableParams()
+        self.cable_name = ''
+        self.profile_name = ''
+        self.is_profile_shared = True
+        self.channels: dict = {}
+        self.message = ''
+
+    def as_dict(self) -> dict:
+        return {
+            'curve_id': self.curve_id,
+            'curve_name': self.curve_name,
+            'action': self.action,
+            'params': self.params.as_dict(),
+            'cable_name': self.cable_name,
+            'profile_name': self.profile_name,
+            'is_profile_shared': self.is_profile_shared,
+            'channels': self.channels,
+            'message': self.message,
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> 'CablePlan':
+        if data['action'] not in ACTIONS:
+            raise ValueError(f'{data["action"]=}')
+        plan = CablePlan(data['curve_id'], data['curve_name'])
+        plan.action = data['action']
+        plan.params = CableParams.from_dict(data['params'])
+        plan.cable_name = data['cable_name']
+        plan.profile_name = data['profile_name']
+        plan.is_profile_shared = data['is_profile_shared']
+        plan.channels = data['channels']
+        plan.message = data.get('message', '')
+        return plan
+
+
+class BuildPlan:
+    def __init__(self, cables: list[CablePlan], is_profile_independent: bool) -> None:
+        self.cables = cables
+        self.is_profile_independent = is_profile_independent
+
+    def get_cables(self, *actions: str) -> list[CablePlan]:
+        return [cable for cable in self.cables if cable.action in actions]
+
+    def get_shared_profiles(self) -> dict[str, int]:
+        # pooled profile name: sides
+        return {
+            cable.profile_name: cable.params.sides
+            for cable in self.get_cables(ACTION_CREATE, ACTION_REBUILD)
+            if cable.is_profile_shared
+        }
+
+    def get_report(self) -> str:
+        counts = ', '.join(f'{len(self.get_cables(action))} {action}' for action in ACTIONS)
+        return f'{len(self.cables)} curves planned: {counts}, {len(self.get_shared_profiles())} shared profiles'
+
+    def as_dict(self) -> dict:
+        return {
+            'version': PLAN_VERSION,
+            'is_profile_independent': self.is_profile_independent,
+            'cables': [cable.as_dict() for cable in self.cables],
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> 'BuildPlan':
+        if data.get('version') != PLAN_VERSION:
+            raise ValueError(f'{data.get("version")=}')
+        return BuildPlan(
+            [CablePlan.from_dict(cable) for cable in data['cables']],
+            data['is_profile_independent'],
+        )
+
+    def write(self, filename: str) -> None:
+        with open(filename, 'w') as file:
+            json.dump(self.as_dict(), file, indent=4)
+
+    @staticmethod
+    def read(filename: str) -> 'BuildPlan':
+        with open(filename) as file:
+            return BuildPlan.from_dict(json.load(file))
+
+
+def get_pooled_profile_name(sides: int) -> str:
+    # cables with the same sides share one profile, diameter is driven by cable controls
+    return f'{CABLE_SHAREABLE_PROFILE_NAME}{PROFILE_POOL_SIDES_PREFIX}{sides}'
+
+
+def get_viewport_density(value: int, minimum: int) -> int:
+    return min(value, max(minimum, round(value * VIEWPORT_DENSITY_RATIO)))
+
+
+def get_camera_lod(distance: float, near: float, far: float) -> float:
+    # full density up to near distance, viewport density beyond far distance
+    if far <= near:
+        raise ValueError(f'{near=} {far=}')
+    return min(max((far - distance) / (far - near), 0.0), 1.0)
+
+
+def get_control_values(params: CableParams) -> dict:
+    # control channel values encoded in the curve name
+    return {
+        CH_DIAMETER: params.diameter,
+        CH_POLYGON_TYPE: params.polygon_type,
+        CH_STEPS: params.steps,
+        CH_STEPS_VIEWPORT: get_viewport_density(int(params.steps), MIN_VIEWPORT_STEPS),
+        CH_FLIP: params.flip,
+        CH_PTAG: params.material_name,
+    }
+
+
+def get_action(summary: CurveSummary) -> str:
+    if summary.is_setup_complete:
+        return ACTION_UPDATE
+    if not summary.is_curve:
+        return ACTION_SKIP
+    return ACTION_REBUILD if summary.has_cable else ACTION_CREATE
+
+
+def plan_cable(summary: CurveSummary, is_profile_independent: bool) -> CablePlan:
+    plan = CablePlan(summary.curve_id, summary.name)
+    plan.action = get_action(summary)
+    if plan.action == ACTION_SKIP:
+        plan.message = f'Cable creation skipped for mesh <{summary.name}>. No curve found.'
+        return plan
+
+    try:
+        plan.params = parse_cable_name(summary.name)
+    except CableNameError as error:
+        if summary.has_cable:
+            # existing cables keep their parameters until the name is fixed
+            plan.action = ACTION_SKIP
+            plan.message = f'Cable update skipped for mesh <{summary.name}>. {error}'
+            return plan
+        # default token parameters, the cable keeps the curve basename
+        plan.params.basename = get_basename(summary.name)
+        plan.message = f'Cable parameters ignored for mesh <{summary.name}>. {error}'
+
+    plan.cable_name = f'{plan.params.basename}{CABLE_BASENAME_SUFFIX}'
+    plan.is_profile_shared = not is_profile_independent
+    if plan.is_profile_shared:
+        plan.profile_name = get_pooled_profile_name(plan.params.sides)
+    else:
+        plan.profile_name = f'{plan.params.basename}{PROFILE_BASENAME_SUFFIX}'
+    plan.channels = get_control_values(plan.params)
+
+    return plan
+
+
+def get_plan_workers() -> int:
+    # embedded interpreters spawn their host application instead of python for worker processes
+    if not os.path.basename(sys.executable).lower().startswith('python'):
+        return 0
+    return os.cpu_count() or 0
+
+
+def plan_cables(summaries: list[CurveSummary], is_profile_independent: bool, workers: Union[int, None] = None) -> BuildPlan:
+    if workers is None:
+        workers = get_plan_workers()
+    if workers < 2 or len(summaries) < PARALLEL_PLAN_MIN_CURVES:
+        return BuildPlan([plan_cable(summary, is_profile_independent) for summary in summaries], is_profile_independent)
+
+    chunksize = math.ceil(len(summaries) / (workers * PARALLEL_PLAN_CHUNKS_PER_WORKER))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        cables = list(executor.map(plan_cable, summaries, repeat(is_profile_independent), chunksize=chunksize))
+    return BuildPlan(cables, is_profile_independent)
+
+
+def write_manifest(filename: str, cables: Iterable[CablePlan]) -> int:
+    # json lines, a header line followed by one cable per line
+    count = 0
+    with open(filename, 'w') as file:
+        file.write(json.dumps({'format': MANIFEST_FORMAT, 'version': MANIFEST_VERSION}) + '\n')
+        for cable in cables:
+            file.write(json.dumps(cable.as_dict(), separators=(',', ':')) + '\n')
+            count += 1
+    return count
+
+
+def read_manifest(filename: str) -> Iterator[CablePlan]:
+    # cables are read one line at a time
+    with open(filename) as file:
+        header = json.loads(file.readline() or '{}')
+        if header.get('format') != MANIFEST_FORMAT or header.get('version') != MANIFEST_VERSION:
+            raise ValueError(f'{filename=} {header=}')
+        for line in file:
+            if line.strip():
+                yield CablePlan.from_dict(json.loads(line))
@@ -8,71 +8,285 @@
 # usage:
 # - select curve mesh
 # - run command
+# - level of detail of every cable, 0 viewport to 1 render density: @cable_setup.py lod:0.5
 
 import lx
 import modo
 import modo.constants as c
-import re
+import math
 from typing import Union
-import inspect
-
-from h3d_utilites.scripts.h3d_utils import replace_file_ext, is_preset_browser_opened, display_preset_browser
-from h3d_utilites.scripts.h3d_debug import H3dDebug
-
-
-CABLE_SHAREABLE_PROFILE_NAME = 'h3d_cable_shareable_profile'
-CABLE_BASENAME_SUFFIX = '_cable'
-PROFILE_BASENAME_SUFFIX = '_profile'
-DELIMITER = ':'
-
-DEFAULT_CABLE_BASENAME = ''
-DEFAULT_DIAMETER = 0.01
-DEFAULT_COMPENSATION = 1.2308
-DEFAULT_MATERIAL_TAG = ''
-DEFAULT_PATH_STEPS = 24
-DEFAULT_POLYGON_TYPE = 1
-DEFAULT_FLIP = True
-DEFAULT_SIDES = 6
-
-ID_DIAMETER = 'd'
-ID_STEPS = 's'
-ID_FLIP = 'f'
-ID_POLYGON_TYPE = 't'
-ID_SIDES = 'p'
-
-CH_DIAMETER = 'ctrldiameter'
-CH_DIAMETER_USERNAME = 'Diameter'
-CH_COMP = 'ctrlcompensation'
-CH_COMPENSATION_USERNAME = 'Diameter Compensation'
-CH_STEPS = 'ctrlsteps'
-CH_STEPS_USERNAME = 'Steps'
-CH_SIDES = 'ctrlsides'
-CH_SIDES_USERNAME = 'Sides'
-CH_PTAG = 'ctrlmaterialtag'
-CH_MATERIAL_TAG_USERNAME = 'Material Name'
-CH_FLIP = 'ctrlflip'
-CH_FLIP_USERNAME = 'Flip'
-CH_POLYGON_TYPE = 'ctrlpolytype'
-CH_POLYGON_TYPE_USERNAME = 'Polygon Type (0-2)'
+
+from h3d_utilites.scripts.h3d_utils import replace_file_ext
+
+from h3d_cable_setup.scripts.command_queue import CommandQueue
+from h3d_cable_setup.scripts.cable_params import CableParams
+from h3d_cable_setup.scripts.cable_plan import (
+    CABLE_SHAREABLE_PROFILE_NAME,
+    PROFILE_POOL_SIDES_PREFIX,
+    CABLE_BASENAME_SUFFIX,
+    PROFILE_BASENAME_SUFFIX,
+    CH_DIAMETER,
+    CH_DIAMETER_USERNAME,
+    CH_COMP,
+    CH_COMPENSATION_USERNAME,
+    CH_STEPS,
+    CH_STEPS_USERNAME,
+    CH_SIDES,
+    CH_SIDES_USERNAME,
+    CH_PTAG,
+    CH_MATERIAL_TAG_USERNAME,
+    CH_FLIP,
+    CH_FLIP_USERNAME,
+    CH_POLYGON_TYPE,
+    CH_POLYGON_TYPE_USERNAME,
+    CH_STEPS_VIEWPORT,
+    CH_STEPS_VIEWPORT_USERNAME,
+    CH_SIDES_VIEWPORT,
+    CH_SIDES_VIEWPORT_USERNAME,
+    CH_LOD,
+    CH_LOD_USERNAME,
+    DEFAULT_LOD,
+    MIN_VIEWPORT_SIDES,
+    ACTION_CREATE,
+    ACTION_REBUILD,
+    ACTION_UPDATE,
+    ACTION_SKIP,
+    BuildPlan,
+    CablePlan,
+    CurveSummary,
+    get_action,
+    get_camera_lod,
+    get_viewport_density,
+    plan_cable,
+    plan_cables,
+    read_manifest,
+    write_manifest,
+)
+from h3d_cable_setup.scripts.preset_cache import PresetCache
+from h3d_cable_setup.scripts.tracing import start_tracing, tracer
+from h3d_cable_setup.scripts.profiling import profiler
+
+
+CABLE_TEMPLATE_NAME = 'h3d_cable_template'
 
 CMD_INDEPENDENT_PROFILE = 'independent'
+CMD_JOURNAL = 'journal'
+CMD_EVICT_PROFILES = 'evict'
+CMD_PROFILE = 'profile'
+CMD_PROFILE_JSON = 'json'
+CMD_PROFILE_CSV = 'csv'
+CMD_DRY_RUN = 'dryrun'
+CMD_CAMERA_LOD = 'cameralod'
+CMD_LOD = 'lod:'
+CMD_EXPORT = 'export'
+CMD_IMPORT = 'import'
+
+# build cables by cloning preset-instantiated template items starting from this selection size
+BATCH_MIN_CABLES = 2
 
 HIGHLIGHT_COLOR = 'orange'
 
+CHANNEL_VALUE_TOLERANCE = 1e-6
+
+# level of detail blend between viewport and render density channels
+LOD_BLEND_TYPE = 'cmLinearBlend'
+LOD_BLEND_VIEWPORT_INPUT = 'input1'
+LOD_BLEND_RENDER_INPUT = 'input2'
+LOD_BLEND_FACTOR = 'blend'
+LOD_BLEND_OUTPUT = 'output'
+# render camera distances of full and viewport density for the cameralod argument
+LOD_NEAR_DISTANCE = 2.0
+LOD_FAR_DISTANCE = 20.0
+# scene-level locator driving the level of detail control of every cable and profile
+LOD_CONTROL_NAME = 'h3d_cable_lod'
+
+PRESET_PRIM_CYLINDER = '[itemtypes]:MeshOperations/create/primitives/prim.cylinder.item.itemtype'
+PRESET_CURVE_SWEEP = '[itemtypes]:MeshOperations/curve/curve.sweep.itemtype'
+PRESET_SET_POLYGON_TYPE = '[itemtypes]:MeshOperations/polygon/poly.setType.meshop.item.itemtype'
+PRESET_MATERIAL_TAG = '[itemtypes]:MeshOperations/polygon/pmodel.materialTag.item.itemtype'
+PRESET_MATH_MULTIPLY = '[itemtypes]:ChannelModifiers/math/cmMathBasic(mul).itemtype'
+
+JOURNAL_FILE_EXT = '.journal'
+PROFILE_JSON_FILE_EXT = '.profile.json'
+PROFILE_CSV_FILE_EXT = '.profile.csv'
+PLAN_FILE_EXT = '.plan.json'
+MANIFEST_FILE_EXT = '.cables.jsonl'
+
+
+lxq = CommandQueue()
+presets = PresetCache(lxq)
+
+
+class CableSetup:
+    def __init__(self, curve_mesh: modo.Item) -> None:
+        self.curve_mesh: modo.Item = curve_mesh
+        self.cable_mesh: Union[modo.Item, None] = None
+        self.profile_mesh: Union[modo.Item, None] = None
+        self.curve_sweep_mop: Union[modo.Item, None] = None
+        self.set_polygon_type_mop: Union[modo.Item, None] = None
+        self.material_tag_mop: Union[modo.Item, None] = None
+        self.math_mult_chmod: Union[modo.Item, None] = None
+        self.lod_blend_chmod: Union[modo.Item, None] = None
+
+
+class CableSceneIndex:
+    """Existing cable setups and profiles of the scene, collected once per command run"""
+
+    def __init__(self) -> None:
+        self.meshes: dict[str, modo.Item] = {}
+        self.prim_cylinders: dict[str, modo.Item] = {}
+        self.setups: dict[str, CableSetup] = {}
+        self.cable_curves: dict[str, str] = {}
+        self.lod_control: Union[modo.Item, None] = None
+
+        self.build()
 
-class CableParams:
-    diameter: float = DEFAULT_DIAMETER
-    compensation: float = DEFAULT_COMPENSATION
-    polygon_type: int = DEFAULT_POLYGON_TYPE
-    steps: float = DEFAULT_PATH_STEPS
-    sides = DEFAULT_SIDES
-    flip: bool = True
-    material_name: str = DEFAULT_MATERIAL_TAG
-    basename = DEFAULT_CABLE_BASENAME
+    def build(self) -> None:
+        lxq.flush()
+        scene = modo.Scene()
+        for mesh in scene.meshes:
+            self.meshes.setdefault(mesh.name, mesh)
+
+        try:
+            lod_control = scene.item(LOD_CONTROL_NAME)
+        except LookupError:
+            lod_control = None
+        if lod_control and lod_control.type == c.LOCATOR_TYPE:
+            self.lod_control = lod_control
+
+        for prim in scene.items(itype='prim.cylinder.item'):
+            for profile in prim.itemGraph('deformers').forward():  # type: ignore
+                self.prim_cylinders[profile.id] = prim
+
+        multipliers: dict[str, modo.Item] = {}
+        for chmod in scene.items(itype='cmMathBasic'):
+            for channel in chmod.channel('input1').revLinked:  # type: ignore
+                multipliers[channel.item.id] = chmod
+
+        lod_blends: dict[str, modo.Item] = {}
+        for chmod in scene.items(itype=LOD_BLEND_TYPE):
+            for channel in chmod.channel(LOD_BLEND_FACTOR).revLinked:  # type: ignore
+                lod_blends[channel.item.id] = chmod
+
+        for sweep in scene.items(itype='curve.sweep'):
+            curves: list[modo.Item] = sweep.itemGraph('curve.sweep.path').reverse()  # type: ignore
+            cables: list[modo.Item] = sweep.itemGraph('deformers').forward()  # type: ignore
+            if not curves or not cables:
+                continue
+            setup = CableSetup(curves[0])
+            setup.cable_mesh = cables[0]
+            setup.curve_sweep_mop = sweep
+            profiles: list[modo.Item] = sweep.itemGraph('curve.sweep.prof').reverse()  # type: ignore
+            if profiles:
+                setup.profile_mesh = profiles[0]
+            deformers: list[modo.Item] = setup.cable_mesh.itemGraph('deformers').reverse()  # type: ignore
+            for deformer in deformers:
+                if deformer.type == 'pmodel.materialTag.item':
+                    setup.material_tag_mop = deformer
+                elif deformer.type == 'poly.setType.meshop.item':
+                    setup.set_polygon_type_mop = deformer
+            setup.math_mult_chmod = multipliers.get(setup.cable_mesh.id)
+            setup.lod_blend_chmod = lod_blends.get(setup.cable_mesh.id)
+            self.setups[setup.curve_mesh.id] = setup
+            self.cable_curves[setup.cable_mesh.id] = setup.curve_mesh.id
+
+    def get_cable_setup(self, mesh: modo.Item) -> Union[CableSetup, None]:
+        # mesh is either a curve mesh or a cable mesh
+        curve_id = self.cable_curves.get(mesh.id, mesh.id)
+        return self.setups.get(curve_id)
+
+    def remove_cable_setup(self, curve_mesh: modo.Item) -> None:
+        setup = self.setups.pop(curve_mesh.id, None)
+        if setup and setup.cable_mesh:
+            self.cable_curves.pop(setup.cable_mesh.id, None)
+
+    def get_profile(self, name: str) -> Union[modo.Item, None]:
+        return self.meshes.get(name)
+
+    def get_prim_cylinder_item(self, profile_mesh: modo.Item) -> Union[modo.Item, None]:
+        return self.prim_cylinders.get(profile_mesh.id)
+
+    def add_profile(self, profile_mesh: modo.Item, prim_cylinder_item: modo.Item) -> None:
+        self.meshes[profile_mesh.name] = profile_mesh
+        self.prim_cylinders[profile_mesh.id] = prim_cylinder_item
+
+    def add_cable_setup(self, setup: CableSetup) -> None:
+        self.setups[setup.curve_mesh.id] = setup
+        if setup.cable_mesh:
+            self.cable_curves[setup.cable_mesh.id] = setup.curve_mesh.id
+
+    def get_lod_control(self) -> modo.Item:
+        # created with the first cable or profile it drives
+        if self.lod_control:
+            return self.lod_control
+        self.lod_control = modo.Scene().addItem(itype=c.LOCATOR_TYPE, name=LOD_CONTROL_NAME)
+        lxq.select(self.lod_control)
+        lxq.eval(f'channel.create {CH_LOD} percent username:"{CH_LOD_USERNAME}"')
+        lxq.flush()
+        self.lod_control.channel(CH_LOD).set(DEFAULT_LOD)  # type: ignore
+        return self.lod_control
+
+    def is_lod_controlled(self, item: modo.Item) -> bool:
+        lxq.flush()
+        if not self.lod_control:
+            return False
+        return any(channel.item == self.lod_control for channel in item.channel(CH_LOD).revLinked)  # type: ignore
+
+    def get_pooled_profiles(self) -> list[modo.Item]:
+        return [
+            mesh for name, mesh in self.meshes.items()
+            if name == CABLE_SHAREABLE_PROFILE_NAME
+            or name.startswith(f'{CABLE_SHAREABLE_PROFILE_NAME}{PROFILE_POOL_SIDES_PREFIX}')
+        ]
+
+    def evict_unused_profiles(self) -> list[str]:
+        # remove pooled profiles not swept by any cable
+        lxq.flush()
+        evicted: list[str] = []
+        for profile in self.get_pooled_profiles():
+            if profile.itemGraph('curve.sweep.prof').forward():  # type: ignore
+                continue
+            evicted.append(profile.name)
+            self.remove_profile(profile)
+        return evicted
+
+    def remove_profile(self, profile: modo.Item) -> None:
+        if (indexed := self.meshes.get(profile.name)) and indexed.id == profile.id:
+            self.meshes.pop(profile.name)
+        prim_cylinder_item = self.prim_cylinders.pop(profile.id, None)
+        if not prim_cylinder_item:
+            # profiles created in this run are indexed on first use only
+            lxq.flush()
+            deformers: list[modo.Item] = profile.itemGraph('deformers').reverse()  # type: ignore
+            prim_cylinder_item = next((item for item in deformers if item.type == 'prim.cylinder.item'), None)
+        remove_profile_items(profile, prim_cylinder_item)
+
+    def remove_unused_profile(self, profile: modo.Item) -> bool:
+        # independent profiles left without a cable are removed, pooled ones are kept for eviction
+        if profile.id in {pooled.id for pooled in self.get_pooled_profiles()}:
+            return False
+        lxq.flush()
+        if profile.itemGraph('curve.sweep.prof').forward():  # type: ignore
+            return False
+        self.remove_profile(profile)
+        return True
+
+    def get_profile_report(self) -> str:
+        lxq.flush()
+        sides: set[int] = set()
+        profiles: set[str] = set()
+        for setup in self.setups.values():
+            if not setup.profile_mesh:
+                continue
+            profiles.add(setup.profile_mesh.id)
+            sides.add(setup.profile_mesh.channel(CH_SIDES).get())  # type: ignore
+        return (f'{len(self.setups)} cables use {len(profiles)} profiles, '
+                f'{len(sides)} unique profiles needed, {len(self.get_pooled_profiles())} pooled profiles')
 
 
 class CableLive:
-    def __init__(self, mesh: modo.Item) -> None:
+    def __init__(self, mesh: modo.Item, index: CableSceneIndex) -> None:
+        self.index = index
         self.params: CableParams = CableParams()
         self.curve_mesh: Union[modo.Item, None] = None
         self.cable_mesh: Union[modo.Item, None] = None
@@ -81,18 +295,80 @@ class CableLive:
         self.curve_sweep_mop: Union[modo.Item, None] = None
         self.set_polygon_type_mop: Union[modo.Item, None] = None
         self.material_tag_mop: Union[modo.Item, None] = None
-        self.shareable_profile_mesh: Union[modo.Item, None] = None
         self.math_mult_chmod: Union[modo.Item, None] = None
+        self.lod_blend_chmod: Union[modo.Item, None] = None
+        self.plan: Union[CablePlan, None] = None
+        self.selection_events = 0
 
         self.detect_mesh_setup(mesh)
-        self.remove_cable_setup()
 
     def detect_mesh_setup(self, mesh: modo.Item):
+        if setup := self.index.get_cable_setup(mesh):
+            self.curve_mesh = setup.curve_mesh
+            self.cable_mesh = setup.cable_mesh
+            self.profile_mesh = setup.profile_mesh
+            self.curve_sweep_mop = setup.curve_sweep_mop
+            self.set_polygon_type_mop = setup.set_polygon_type_mop
+            self.material_tag_mop = setup.material_tag_mop
+            self.math_mult_chmod = setup.math_mult_chmod
+            self.lod_blend_chmod = setup.lod_blend_chmod
+            return
         if CableLive.is_general_curve(mesh):
             self.curve_mesh = mesh
-        ...
+
+    @property
+    def trace_name(self) -> str:
+        return self.curve_mesh.name if self.curve_mesh else self.params.basename
+
+    def get_curve_summary(self) -> CurveSummary:
+        if not self.curve_mesh:
+            raise ValueError(f'{self.curve_mesh=}')
+        return CurveSummary(
+            curve_id=self.curve_mesh.id,
+            name=self.curve_mesh.name,
+            is_curve=CableLive.is_general_curve(self.curve_mesh),
+            is_setup_complete=self.is_cable_setup_complete(),
+            has_cable=self.cable_mesh is not None,
+        )
+
+    def get_manifest_plan(self) -> CablePlan:
+        # current rig state, control channels take precedence over the curve name
+        if not self.cable_mesh:
+            raise ValueError(f'{self.cable_mesh=}')
+        lxq.flush()
+        plan = plan_cable(self.get_curve_summary(), is_profile_independent=False)
+        plan.cable_name = self.cable_mesh.name
+        plan.channels = {name: self.cable_mesh.channel(name).get() for name in (*plan.channels, CH_COMP)}  # type: ignore
+        plan.params.diameter = plan.channels[CH_DIAMETER]
+        plan.params.polygon_type = plan.channels[CH_POLYGON_TYPE]
+        plan.params.steps = plan.channels[CH_STEPS]
+        plan.params.flip = bool(plan.channels[CH_FLIP])
+        plan.params.material_name = plan.channels[CH_PTAG]
+        plan.params.compensation = plan.channels[CH_COMP]
+        if self.profile_mesh:
+            plan.profile_name = self.profile_mesh.name
+            pooled_ids = {profile.id for profile in self.index.get_pooled_profiles()}
+            plan.is_profile_shared = self.profile_mesh.id in pooled_ids
+            plan.params.sides = self.profile_mesh.channel(CH_SIDES).get()  # type: ignore
+        plan.message = ''
+        return plan
+
+    def is_cable_setup_complete(self) -> bool:
+        return all((
+            self.curve_mesh,
+            self.cable_mesh,
+            self.profile_mesh,
+            self.curve_sweep_mop,
+            self.set_polygon_type_mop,
+            self.material_tag_mop,
+            self.math_mult_chmod,
+            self.lod_blend_chmod,
+        ))
 
     def remove_cable_setup(self):
+        lxq.flush()
+        if self.curve_mesh:
+            self.index.remove_cable_setup(self.curve_mesh)
         modo.Scene().removeItems(self.cable_mesh)
         self.cable_mesh = None
         modo.Scene().removeItems(self.curve_sweep_mop)
@@ -101,206 +377,212 @@ class CableLive:
         self.set_polygon_type_mop = None
         modo.Scene().removeItems(self.material_tag_mop)
         self.material_tag_mop = None
-        modo.Scene().removeItems(self.shareable_profile_mesh)
-        self.shareable_profile_mesh = None
         modo.Scene().removeItems(self.math_mult_chmod)
         self.math_mult_chmod = None
+        modo.Scene().removeItems(self.lod_blend_chmod)
+        self.lod_blend_chmod = None
+        # the profile of the removed sweep, with its primitive and level of detail blend
+        if self.profile_mesh:
+            self.index.remove_unused_profile(self.profile_mesh)
+        self.profile_mesh = None
 
     @staticmethod
     def is_general_curve(mesh: modo.Item) -> bool:
-        curves = mesh.geometry.polygons.iterByType('CURV')
-        beziers = mesh.geometry.polygons.iterByType('BEZR')
-        bsplines = mesh.geometry.polygons.iterByType('BSPL')
-
-        return any((curves, beziers, bsplines))
+        # iterByType returns generators, a polygon is read to tell whether any exists
+        polygons = mesh.geometry.polygons
+        return any(next(iter(polygons.iterByType(ptype)), None) is not None for ptype in ('CURV', 'BEZR', 'BSPL'))
 
     def create_prim_cylinder_item(self) -> modo.Item:
-        h3dd.print_debug(f'{inspect.currentframe()}')
-        is_preset_browser = is_preset_browser_opened()
-        if not is_preset_browser:
-            display_preset_browser(True)
-        lx.eval('select.preset "[itemtypes]:MeshOperations/create/primitives/prim.cylinder.item.itemtype" mode:set')
-        lx.eval('select.filepath "[itemtypes]:MeshOperations/create/primitives/prim.cylinder.item.itemtype" set')
-        lx.eval('preset.do')
-        lx.eval('item.channel prim.cylinder.item$cenX 0.0')
-        lx.eval('item.channel prim.cylinder.item$cenY 0.0')
-        lx.eval('item.channel prim.cylinder.item$cenZ 0.0')
-        lx.eval(f'item.channel prim.cylinder.item$sizeX {self.params.diameter / 2}')
-        lx.eval('item.channel prim.cylinder.item$sizeY 0.0')
-        lx.eval(f'item.channel prim.cylinder.item$sizeZ {self.params.diameter / 2}')
-        lx.eval('item.channel prim.cylinder.item$segments 1')
-        lx.eval(f'item.channel prim.cylinder.item$sides {self.params.sides}')
-        lx.eval('item.channel prim.cylinder.item$polType face')
-        display_preset_browser(is_preset_browser)
-
-        return modo.Scene().selectedByType('prim.cylinder.item')[0]
+        tracer.debug('start')
+        presets.do(PRESET_PRIM_CYLINDER)
+        lxq.flush()
+        prim_cylinder_item = modo.Scene().selectedByType('prim.cylinder.item')[0]
+        CableLive.set_channels(prim_cylinder_item, {
+            'cenX': 0.0,
+            'cenY': 0.0,
+            'cenZ': 0.0,
+            'sizeX': self.params.diameter / 2,
+            'sizeY': 0.0,
+            'sizeZ': self.params.diameter / 2,
+            'segments': 1,
+            'sides': self.params.sides,
+            'polType': 'face',
+        })
+
+        return prim_cylinder_item
+
+    @staticmethod
+    def set_channels(item: modo.Item, values: dict) -> None:
+        # write channel values by item reference, without selecting the item
+        lxq.flush()
+        for name, value in values.items():
+            item.channel(name).set(value)  # type: ignore
+
+    @staticmethod
+    def get_mesh_operation(mesh: modo.Item, itype: str) -> Union[modo.Item, None]:
+        lxq.flush()
+        deformers: list[modo.Item] = mesh.itemGraph('deformers').reverse()  # type: ignore
+        for deformer in deformers:
+            if deformer.type == itype:
+                return deformer
+        return None
 
     def get_prim_cylinder_item(self, profile_mesh: modo.Item) -> modo.Item:
-        h3dd.print_debug(f'{inspect.currentframe()}')
-        h3dd.print_debug(f'{profile_mesh.name=} {profile_mesh.id=}', 1)
+        tracer.debug('start')
+        tracer.debug('profile_mesh: %s %s', profile_mesh.name, profile_mesh.id)
+        if prim_cylinder_item := self.index.get_prim_cylinder_item(profile_mesh):
+            tracer.debug('indexed primitive found: %s', prim_cylinder_item.id)
+            return prim_cylinder_item
+        lxq.flush()
         deformers: list[modo.Item] = profile_mesh.itemGraph('deformers').reverse()  # type: ignore
-        h3dd.print_items(deformers, 'deformers', 1)
+        tracer.items(deformers, 'deformers:')
         for deformer in deformers:
             if deformer.type == 'prim.cylinder.item':
-                h3dd.print_debug(f'connected primitive found: {deformer=}', 1)
+                tracer.debug('connected primitive found: %s', deformer.id)
                 return deformer
 
-        h3dd.print_debug('no connected primitive found', 1)
+        tracer.debug('no connected primitive found')
         connected_prim = self.create_prim_cylinder_item()
-        h3dd.print_debug(f'new primitive created: {connected_prim.name=} {connected_prim.id=}', 1)
+        tracer.debug('new primitive created: %s %s', connected_prim.name, connected_prim.id)
         self.link_mesh_to_prim(profile_mesh, connected_prim)
         self.create_sides_control(profile_mesh, connected_prim)
 
         return connected_prim
 
     def create_sides_control(self, profile_mesh: modo.Item, connected_prim: modo.Item):
-        h3dd.print_debug(f'{inspect.currentframe()}')
-        profile_mesh.select(replace=True)
-        h3dd.print_debug(f'profile_mesh selected: {profile_mesh.name=} {profile_mesh.id=}', 1)
-        lx.eval(f'channel.create {CH_SIDES} integer username:"{CH_SIDES_USERNAME}"')
-        h3dd.print_debug(f'channel created {CH_SIDES=} {CH_SIDES_USERNAME=}', 1)
-        lx.eval(f'item.channel {CH_SIDES} "{self.params.sides}"')
-        h3dd.print_debug(f'value set {CH_SIDES=} {self.params.sides=}', 1)
-        lx.eval(f'channel.link add {{{profile_mesh.id}:{CH_SIDES}}} {{{connected_prim.id}:sides}}')
-        h3dd.print_debug(f'channel linked {profile_mesh.id=}:{CH_SIDES=} {connected_prim.id=}:sides', 1)
+        tracer.debug('start')
+        lxq.select(profile_mesh)
+        tracer.debug('profile_mesh selected: %s %s', profile_mesh.name, profile_mesh.id)
+        lxq.eval(f'channel.create {CH_SIDES} integer username:"{CH_SIDES_USERNAME}"')
+        lxq.eval(f'channel.create {CH_SIDES_VIEWPORT} integer username:"{CH_SIDES_VIEWPORT_USERNAME}"')
+        lxq.eval(f'channel.create {CH_LOD} percent username:"{CH_LOD_USERNAME}"')
+        tracer.debug('channels created %s %s %s', CH_SIDES, CH_SIDES_VIEWPORT, CH_LOD)
+        CableLive.set_channels(profile_mesh, {
+            CH_SIDES: self.params.sides,
+            CH_SIDES_VIEWPORT: get_viewport_density(self.params.sides, MIN_VIEWPORT_SIDES),
+            CH_LOD: DEFAULT_LOD,
+        })
+        tracer.debug('value set %s %s', CH_SIDES, self.params.sides)
+        CableLive.link_lod_blend(
+            modo.Scene().addItem(itype=LOD_BLEND_TYPE), profile_mesh, CH_SIDES, CH_SIDES_VIEWPORT, connected_prim, 'sides'
+        )
+        self.link_lod_control(profile_mesh)
+        tracer.debug('sides linked %s %s', profile_mesh.id, connected_prim.id)
+
+    @staticmethod
+    def link_lod_blend(
+            lod_blend: modo.Item,
+            control: modo.Item,
+            render_channel: str,
+            viewport_channel: str,
+            target: modo.Item,
+            target_channel: str) -> None:
+        # level of detail 0 gives viewport density, 1 gives render density
+        lxq.eval(f'channel.link add {{{control.id}:{viewport_channel}}} {{{lod_blend.id}:{LOD_BLEND_VIEWPORT_INPUT}}}')
+        lxq.eval(f'channel.link add {{{control.id}:{render_channel}}} {{{lod_blend.id}:{LOD_BLEND_RENDER_INPUT}}}')
+        lxq.eval(f'channel.link add {{{control.id}:{CH_LOD}}} {{{lod_blend.id}:{LOD_BLEND_FACTOR}}}')
+        lxq.eval(f'channel.link replace {{{lod_blend.id}:{LOD_BLEND_OUTPUT}}} {{{target.id}:{target_channel}}}')
+
+    def link_lod_control(self, control: modo.Item) -> None:
+        lod_control = self.index.get_lod_control()
+        lxq.eval(f'channel.link replace {{{lod_control.id}:{CH_LOD}}} {{{control.id}:{CH_LOD}}}')
 
     def link_mesh_to_prim(self, profile_mesh: modo.Item, connected_prim: modo.Item):
-        h3dd.print_debug(f'{inspect.currentframe()}')
-        lx.eval(f'item.link genInfluence {profile_mesh.id} {connected_prim.id} posT:0 replace:false')
-        h3dd.print_debug(f'new primitive linked {profile_mesh.id=} {connected_prim.id=}', 1)
+        tracer.debug('start')
+        lxq.eval(f'item.link genInfluence {profile_mesh.id} {connected_prim.id} posT:0 replace:false')
+        tracer.debug('new primitive linked %s %s', profile_mesh.id, connected_prim.id)
 
+    @profiler.stage('new_shareable_profile')
     def new_shareable_profile(self, name: str) -> modo.Item:
-        h3dd.print_debug(f'{inspect.currentframe()}')
-        lx.eval('layer.new')
-        lx.eval(f'item.editorColor {HIGHLIGHT_COLOR}')
+        tracer.debug('start')
+        lxq.eval('layer.new')
+        lxq.eval(f'item.editorColor {HIGHLIGHT_COLOR}')
+        lxq.flush()
         profile = modo.Scene().selectedByType(c.MESH_TYPE)[0]
         if not profile:
             raise RuntimeError('Error creating profile mesh')
 
         self.prim_cylinder_item = self.create_prim_cylinder_item()
-        h3dd.print_debug(f'prim_cylinder created: {self.prim_cylinder_item.name=} {self.prim_cylinder_item.id=}')
+        tracer.debug('prim_cylinder created: %s %s', self.prim_cylinder_item.name, self.prim_cylinder_item.id)
         self.link_mesh_to_prim(profile, self.prim_cylinder_item)
         self.create_sides_control(profile, self.prim_cylinder_item)
         profile.name = name
 
         return profile
 
+    @profiler.stage('get_shareable_profile')
     def get_shareable_profile(self, name: str) -> modo.Item:
-        h3dd.print_debug(f'{inspect.currentframe()}')
-        try:
-            h3dd.print_debug('try block', 1)
-            shareable_profile_mesh = modo.Scene().item(name)
-            self.prim_cylinder_item = self.get_prim_cylinder_item(shareable_profile_mesh)
-            return shareable_profile_mesh
-        except LookupError:
-            h3dd.print_debug('except block', 1)
+        tracer.debug('start')
+        shareable_profile_mesh = self.index.get_profile(name)
+        if not shareable_profile_mesh:
+            tracer.debug('no shareable profile found')
             shareable_profile_mesh = self.new_shareable_profile(name)
-            self.prim_cylinder_item = self.get_prim_cylinder_item(shareable_profile_mesh)
-            return shareable_profile_mesh
+        self.prim_cylinder_item = self.get_prim_cylinder_item(shareable_profile_mesh)
+        self.index.add_profile(shareable_profile_mesh, self.prim_cylinder_item)
+        return shareable_profile_mesh
 
-    @staticmethod
-    def meters(mm: Union[str, float, int]) -> float:
-        return float(mm) / 1000
-
-    def decode_parameters(self) -> None:
-        if not self.curve_mesh:
-            raise ValueError(f'{self.curve_mesh=}')
-        # get basename and a string between square brackets <basename>[<parameters>]
-        pattern = r'(.*)\[(.*)\]'
-        matches = re.findall(pattern, self.curve_mesh.name)
-        if not matches:
-            tokens = []
-        else:
-            self.params.basename = matches[0][0].strip()
-            tokens = matches[0][1].split(DELIMITER)
-
-        for token in tokens:
-            token_stripped = token.lower().strip()
-            if token_stripped.isdigit():
-                self.params.diameter = self.meters(token_stripped)
-            elif token_stripped.startswith(ID_DIAMETER):
-                self.params.diameter = self.meters(token_stripped[len(ID_DIAMETER):])
-            elif token_stripped.startswith(ID_STEPS):
-                self.params.steps = int(token_stripped[len(ID_STEPS):])
-            elif token_stripped.startswith(ID_FLIP):
-                if token_arg := token_stripped[len(ID_FLIP):]:
-                    self.params.flip = int(token_arg) != 0
-                else:
-                    self.params.flip = True
-            elif token_stripped.startswith(ID_POLYGON_TYPE):
-                self.params.polygon_type = int(token_stripped[len(ID_POLYGON_TYPE):])
-            elif token_stripped.startswith(ID_SIDES):
-                self.params.sides = int(token_stripped[len(ID_SIDES):])
-            else:
-                self.params.material_name = token_stripped
+    def apply_plan(self, plan: CablePlan) -> None:
+        # parameters are decoded by the planning stage
+        self.plan = plan
+        self.params = plan.params
+        if plan.message:
+            print(plan.message)
 
-    def create_cable_mesh(self) -> None:
-        cable_name = f'{self.params.basename}{CABLE_BASENAME_SUFFIX}'
-        self.cable_mesh = modo.Scene().addMesh(cable_name)
+    @profiler.stage('create_cable_mesh')
+    def create_cable_mesh(self, name: str) -> None:
+        self.cable_mesh = modo.Scene().addMesh(name)
 
+    @profiler.stage('create_curve_sweep_mop')
     def create_curve_sweep_mop(self) -> None:
         if not self.cable_mesh:
             raise ValueError(f'{self.cable_mesh=}')
-        is_preset_browser = is_preset_browser_opened()
-        if not is_preset_browser:
-            display_preset_browser(True)
-        self.cable_mesh.select(replace=True)
-        lx.eval('select.filepath "[itemtypes]:MeshOperations/curve/curve.sweep.itemtype" set')
-        lx.eval('select.preset "[itemtypes]:MeshOperations/curve/curve.sweep.itemtype" mode:set')
-        lx.eval('preset.do')
-        self.curve_sweep_mop = modo.Scene().selectedByType(itype='curve.sweep')[0]
-        display_preset_browser(is_preset_browser)
+        lxq.select(self.cable_mesh)
+        presets.do(PRESET_CURVE_SWEEP)
+        self.curve_sweep_mop = CableLive.get_mesh_operation(self.cable_mesh, 'curve.sweep')
         if not self.curve_sweep_mop:
             raise ValueError(f'{self.curve_sweep_mop=}')
-        self.curve_sweep_mop.select(replace=True)
-        lx.eval('item.channel (anySweeper)$extrudeShape linked')
-        lx.eval('item.channel (anySweeper)$useSize false')
+        CableLive.set_channels(self.curve_sweep_mop, {'extrudeShape': 'linked', 'useSize': False})
 
+    @profiler.stage('create_set_polygon_type_mop')
     def create_set_polygon_type_mop(self) -> None:
-        is_preset_browser = is_preset_browser_opened()
-        if not is_preset_browser:
-            display_preset_browser(True)
-        lx.eval('select.filepath "[itemtypes]:MeshOperations/polygon/poly.setType.meshop.item.itemtype" set')
-        lx.eval('select.preset "[itemtypes]:MeshOperations/polygon/poly.setType.meshop.item.itemtype" mode:set')
-        lx.eval('preset.do')
-        self.set_polygon_type_mop = modo.Scene().selectedByType(itype='poly.setType.meshop.item')[0]
-        display_preset_browser(is_preset_browser)
+        if not self.cable_mesh:
+            raise ValueError(f'{self.cable_mesh=}')
+        presets.do(PRESET_SET_POLYGON_TYPE)
+        self.set_polygon_type_mop = CableLive.get_mesh_operation(self.cable_mesh, 'poly.setType.meshop.item')
 
+    @profiler.stage('create_material_tag_mop')
     def create_material_tag_mop(self) -> None:
         if not self.cable_mesh:
             raise ValueError(f'{__name__}: {self.cable_mesh=}')
-        self.cable_mesh.select(replace=True)
-        self.cable_mesh.select(replace=True)
-        is_preset_browser = is_preset_browser_opened()
-        if not is_preset_browser:
-            display_preset_browser(True)
-        lx.eval('select.filepath "[itemtypes]:MeshOperations/polygon/pmodel.materialTag.item.itemtype" set')
-        lx.eval('select.preset "[itemtypes]:MeshOperations/polygon/pmodel.materialTag.item.itemtype" mode:set')
-        lx.eval('preset.do')
-        self.material_tag_mop = modo.Scene().selectedByType(itype='pmodel.materialTag.item')[0]
-        display_preset_browser(is_preset_browser)
+        lxq.select(self.cable_mesh)
+        presets.do(PRESET_MATERIAL_TAG)
+        self.material_tag_mop = CableLive.get_mesh_operation(self.cable_mesh, 'pmodel.materialTag.item')
 
+    @profiler.stage('create_math_multiply_channel_mod')
     def create_math_multiply_channel_mod(self) -> None:
-        is_preset_browser = is_preset_browser_opened()
-        if not is_preset_browser:
-            display_preset_browser(True)
-        lx.eval('select.filepath "[itemtypes]:ChannelModifiers/math/cmMathBasic(mul).itemtype" set')
-        lx.eval('select.preset "[itemtypes]:ChannelModifiers/math/cmMathBasic(mul).itemtype" mode:set')
-        lx.eval('preset.do')
-        self.math_mult_chmod = modo.Scene().selectedByType(itype='cmMathBasic')[0]
-        display_preset_browser(is_preset_browser)
+        # channel modifiers are standalone items, cloned from the session template
+        self.math_mult_chmod = presets.new_item(PRESET_MATH_MULTIPLY, 'cmMathBasic')
+
+    @profiler.stage('create_lod_blend_channel_mod')
+    def create_lod_blend_channel_mod(self) -> None:
+        # added by item type, no preset needed
+        self.lod_blend_chmod = modo.Scene().addItem(itype=LOD_BLEND_TYPE)
 
+    @profiler.stage('create_cable_controls')
     def create_cable_controls(self) -> None:
         if not self.cable_mesh:
             raise ValueError(f'{self.cable_mesh=}')
-        self.cable_mesh.select(replace=True)
-        lx.eval(f'channel.create {CH_DIAMETER} distance username:"{CH_DIAMETER_USERNAME}"')
-        lx.eval(f'channel.create {CH_COMP} percent username:"{CH_COMPENSATION_USERNAME}"')
-        lx.eval(f'channel.create {CH_POLYGON_TYPE} integer username:"{CH_POLYGON_TYPE_USERNAME}"')
-        lx.eval(f'channel.create {CH_STEPS} integer username:"{CH_STEPS_USERNAME}"')
-        lx.eval(f'channel.create {CH_FLIP} boolean username:"{CH_FLIP_USERNAME}"')
-        lx.eval(f'channel.create {CH_PTAG} string username:"{CH_MATERIAL_TAG_USERNAME}"')
+        lxq.select(self.cable_mesh)
+        lxq.eval(f'channel.create {CH_DIAMETER} distance username:"{CH_DIAMETER_USERNAME}"')
+        lxq.eval(f'channel.create {CH_COMP} percent username:"{CH_COMPENSATION_USERNAME}"')
+        lxq.eval(f'channel.create {CH_POLYGON_TYPE} integer username:"{CH_POLYGON_TYPE_USERNAME}"')
+        lxq.eval(f'channel.create {CH_STEPS} integer username:"{CH_STEPS_USERNAME}"')
+        lxq.eval(f'channel.create {CH_STEPS_VIEWPORT} integer username:"{CH_STEPS_VIEWPORT_USERNAME}"')
+        lxq.eval(f'channel.create {CH_LOD} percent username:"{CH_LOD_USERNAME}"')
+        lxq.eval(f'channel.create {CH_FLIP} boolean username:"{CH_FLIP_USERNAME}"')
+        lxq.eval(f'channel.create {CH_PTAG} string username:"{CH_MATERIAL_TAG_USERNAME}"')
 
+    @profiler.stage('link_cable_channels')
     def link_cable_channels(self) -> None:
         if not self.curve_sweep_mop:
             raise ValueError(f'{self.curve_sweep_mop=}')
@@ -316,91 +598,561 @@ class CableLive:
             raise ValueError(f'{self.material_tag_mop=}')
         if not self.set_polygon_type_mop:
             raise ValueError(f'{self.set_polygon_type_mop=}')
+        if not self.lod_blend_chmod:
+            raise ValueError(f'{self.lod_blend_chmod=}')
+
+        lxq.eval(f'channel.link add {{{self.cable_mesh.id}:{CH_DIAMETER}}} {{{self.math_mult_chmod.id}:input1}}')
+        lxq.eval(f'channel.link add {{{self.cable_mesh.id}:{CH_COMP}}} {{{self.math_mult_chmod.id}:input2}}')
+        lxq.eval(f'channel.link replace {{{self.math_mult_chmod.id}:output}} {{{self.curve_sweep_mop.id}:size}}')
+        lxq.eval(f'item.link curve.sweep.path {self.curve_mesh.id} {self.curve_sweep_mop.id} posT:0 replace:false')
+        lxq.eval(f'item.link curve.sweep.prof {self.profile_mesh.id} {self.curve_sweep_mop.id} posT:0 replace:false')
+        CableLive.link_lod_blend(
+            self.lod_blend_chmod, self.cable_mesh, CH_STEPS, CH_STEPS_VIEWPORT, self.curve_sweep_mop, 'steps'
+        )
+        self.link_lod_control(self.cable_mesh)
+        lxq.eval(f'channel.link add {{{self.cable_mesh.id}:{CH_FLIP}}} {{{self.curve_sweep_mop.id}:flip}}')
+        lxq.eval(f'channel.link add {{{self.cable_mesh.id}:{CH_POLYGON_TYPE}}} {{{self.set_polygon_type_mop.id}:type}}')
+        lxq.eval(f'channel.link add {{{self.cable_mesh.id}:{CH_PTAG}}} {{{self.material_tag_mop.id}:materialName}}')
+        self.index.add_cable_setup(self.get_cable_setup())
+
+    def get_cable_setup(self) -> CableSetup:
+        if not self.curve_mesh:
+            raise ValueError(f'{self.curve_mesh=}')
+        setup = CableSetup(self.curve_mesh)
+        setup.cable_mesh = self.cable_mesh
+        setup.profile_mesh = self.profile_mesh
+        setup.curve_sweep_mop = self.curve_sweep_mop
+        setup.set_polygon_type_mop = self.set_polygon_type_mop
+        setup.material_tag_mop = self.material_tag_mop
+        setup.math_mult_chmod = self.math_mult_chmod
+        setup.lod_blend_chmod = self.lod_blend_chmod
+        return setup
 
-        lx.eval(f'channel.link add {{{self.cable_mesh.id}:{CH_DIAMETER}}} {{{self.math_mult_chmod.id}:input1}}')
-        lx.eval(f'channel.link add {{{self.cable_mesh.id}:{CH_COMP}}} {{{self.math_mult_chmod.id}:input2}}')
-        lx.eval(f'channel.link replace {{{self.math_mult_chmod.id}:output}} {{{self.curve_sweep_mop.id}:size}}')
-        lx.eval(f'item.link curve.sweep.path {self.curve_mesh.id} {self.curve_sweep_mop.id} posT:0 replace:false')
-        lx.eval(f'item.link curve.sweep.prof {self.profile_mesh.id} {self.curve_sweep_mop.id} posT:0 replace:false')
-        lx.eval(f'channel.link add {{{self.cable_mesh.id}:{CH_STEPS}}} {{{self.curve_sweep_mop.id}:steps}}')
-        lx.eval(f'channel.link add {{{self.cable_mesh.id}:{CH_FLIP}}} {{{self.curve_sweep_mop.id}:flip}}')
-        lx.eval(f'channel.link add {{{self.cable_mesh.id}:{CH_POLYGON_TYPE}}} {{{self.set_polygon_type_mop.id}:type}}')
-        lx.eval(f'channel.link add {{{self.cable_mesh.id}:{CH_PTAG}}} {{{self.material_tag_mop.id}:materialName}}')
+    def get_decoded_control_values(self) -> dict:
+        if not self.plan:
+            raise ValueError(f'{self.plan=}')
+        return self.plan.channels
 
+    @profiler.stage('set_cable_control_channels')
     def set_cable_control_channels(self) -> None:
-        lx.eval(f'item.channel {CH_DIAMETER} "{self.params.diameter}"')
-        lx.eval(f'item.channel {CH_COMP} "{self.params.compensation}"')
-        lx.eval(f'item.channel {CH_POLYGON_TYPE} "{self.params.polygon_type}"')
-        lx.eval(f'item.channel {CH_STEPS} "{self.params.steps}"')
-        lx.eval(f'item.channel {CH_FLIP} "{self.params.flip}"')
-        lx.eval(f'item.channel {CH_PTAG} "{self.params.material_name}"')
-
-    def create_live_cable(self, is_profile_independent: bool) -> None:
-        h3dd.print_debug(f'{inspect.currentframe()}')
+        if not self.cable_mesh:
+            raise ValueError(f'{self.cable_mesh=}')
+        CableLive.set_channels(self.cable_mesh, {
+            CH_COMP: self.params.compensation,
+            CH_LOD: DEFAULT_LOD,
+            **self.get_decoded_control_values(),
+        })
+
+    @staticmethod
+    def is_same_value(current, value) -> bool:
+        if isinstance(value, str):
+            return str(current) == value
+        try:
+            return math.isclose(float(current), float(value), rel_tol=CHANNEL_VALUE_TOLERANCE)
+        except (TypeError, ValueError):
+            return False
+
+    def get_changed_control_values(self) -> dict:
+        if not self.cable_mesh:
+            raise ValueError(f'{self.cable_mesh=}')
+        lxq.flush()
+        changed = {}
+        for name, value in self.get_decoded_control_values().items():
+            current = self.cable_mesh.channel(name).get()  # type: ignore
+            if not CableLive.is_same_value(current, value):
+                changed[name] = value
+        return changed
+
+    def count_selection_events(self, start: int) -> None:
+        lxq.flush()
+        self.selection_events += lxq.selection_events - start
+
+    def create_live_cable_from_template(self, template: 'CableTemplate') -> None:
+        tracer.debug('start')
+        selection_events = lxq.selection_events
+        if not self.plan:
+            raise ValueError(f'{self.plan=}')
+        if self.cable_mesh:
+            self.remove_cable_setup()
+
+        if self.plan.is_profile_shared:
+            self.profile_mesh = self.get_shareable_profile(self.plan.profile_name)
+        else:
+            self.profile_mesh = template.clone_profile(self)
+
+        template.clone_cable(self)
+        self.count_selection_events(selection_events)
+
+    def link_cloned_cable(self) -> None:
+        selection_events = lxq.selection_events
+        self.link_cable_channels()
+        self.set_cable_control_channels()
+        self.count_selection_events(selection_events)
+
+    def update_live_cable(self) -> None:
+        if not self.cable_mesh:
+            raise ValueError(f'{self.cable_mesh=}')
+        if not self.plan:
+            raise ValueError(f'{self.plan=}')
+        selection_events = lxq.selection_events
+        if self.cable_mesh.name != self.plan.cable_name:
+            self.cable_mesh.name = self.plan.cable_name
+        # write only channels whose decoded parameters changed
+        if changed := self.get_changed_control_values():
+            CableLive.set_channels(self.cable_mesh, changed)
+        self.update_profile()
+        # cables and profiles built before the scene control, or overridden by cameralod, are linked again
+        for control in (self.cable_mesh, self.profile_mesh):
+            if control and control.channel(CH_LOD) and not self.index.is_lod_controlled(control):
+                self.link_lod_control(control)
+        tracer.debug('cable updated: %s %s', self.cable_mesh.name, changed)
+        self.count_selection_events(selection_events)
+
+    def is_new_profile_needed(self) -> bool:
+        # mirrors update_profile(), new profiles are built from presets
+        if not self.plan:
+            raise ValueError(f'{self.plan=}')
+        current = self.profile_mesh
+        if self.plan.is_profile_shared:
+            if current and current.name == self.plan.profile_name:
+                return False
+            return not self.index.get_profile(self.plan.profile_name)
+        pooled_ids = {profile.id for profile in self.index.get_pooled_profiles()}
+        return current is None or current.id in pooled_ids
+
+    def update_profile(self) -> None:
+        # the sweep follows the planned profile, pooled profiles are named by their sides
+        if not self.curve_sweep_mop:
+            raise ValueError(f'{self.curve_sweep_mop=}')
+        if not self.plan:
+            raise ValueError(f'{self.plan=}')
+        current = self.profile_mesh
+        pooled_ids = {profile.id for profile in self.index.get_pooled_profiles()}
+        is_current_pooled = current is not None and current.id in pooled_ids
+        if self.plan.is_profile_shared:
+            if current and current.name == self.plan.profile_name:
+                return
+            profile = self.get_shareable_profile(self.plan.profile_name)
+        elif current and not is_current_pooled:
+            # independent profiles are kept and resized
+            if current.name != self.plan.profile_name:
+                current.name = self.plan.profile_name
+            self.update_profile_sides(current)
+            return
+        else:
+            profile = self.new_shareable_profile(self.plan.profile_name)
+            self.index.add_profile(profile, self.prim_cylinder_item)  # type: ignore
+
+        lxq.eval(f'item.link curve.sweep.prof {profile.id} {self.curve_sweep_mop.id} posT:0 replace:true')
+        self.profile_mesh = profile
+        self.index.add_cable_setup(self.get_cable_setup())
+        tracer.debug('profile relinked: %s', profile.name)
+        if current:
+            self.index.remove_unused_profile(current)
+
+    def update_profile_sides(self, profile: modo.Item) -> None:
+        lxq.flush()
+        values = {
+            CH_SIDES: self.params.sides,
+            CH_SIDES_VIEWPORT: get_viewport_density(self.params.sides, MIN_VIEWPORT_SIDES),
+        }
+        changed = {
+            name: value for name, value in values.items()
+            if not CableLive.is_same_value(profile.channel(name).get(), value)  # type: ignore
+        }
+        if changed:
+            CableLive.set_channels(profile, changed)
+
+    def create_live_cable(self) -> None:
+        tracer.debug('start')
+        selection_events = lxq.selection_events
         if not self.curve_mesh:
             raise ValueError(f'{self.curve_mesh=}')
-        if not CableLive.is_general_curve(self.curve_mesh):
-            print(f'Cable creation skipped for mesh <{self.curve_mesh.name}>. No curve found.')
+        if not self.plan:
+            raise ValueError(f'{self.plan=}')
+        if self.is_cable_setup_complete():
+            self.update_live_cable()
             return
+        # incomplete setups are rebuilt
+        if self.cable_mesh:
+            self.remove_cable_setup()
 
-        # store preset browser status
-        preset_browser_opened = is_preset_browser_opened()
+        # preset browser is opened once for the whole command when called within a preset session
+        with presets:
+            if self.plan.is_profile_shared:
+                tracer.debug('shared profile')
+                self.profile_mesh = self.get_shareable_profile(self.plan.profile_name)
+            else:
+                tracer.debug('independent profile')
+                self.profile_mesh = self.new_shareable_profile(self.plan.profile_name)
 
-        # open preset browser if not opened
-        if not preset_browser_opened:
-            display_preset_browser(True)
+            self.create_cable_mesh(self.plan.cable_name)
+            self.create_curve_sweep_mop()
+            self.create_material_tag_mop()
+            self.create_set_polygon_type_mop()
+            self.create_math_multiply_channel_mod()
+            self.create_lod_blend_channel_mod()
+            self.create_cable_controls()
+            self.link_cable_channels()
+            self.set_cable_control_channels()
 
-        self.decode_parameters()
+        self.count_selection_events(selection_events)
 
-        if not is_profile_independent:
-            h3dd.print_debug('not is_profile_independent', 1)
-            self.profile_mesh = self.get_shareable_profile(CABLE_SHAREABLE_PROFILE_NAME)
-        else:
-            h3dd.print_debug('is_profile_independent', 1)
-            self.profile_mesh = self.new_shareable_profile(f'{self.params.basename}{PROFILE_BASENAME_SUFFIX}')
 
-        self.create_cable_mesh()
+class CableTemplate(CableLive):
+    """Preset-instantiated cable items, cloned for every cable of a batch build"""
+
+    def __init__(self, index: CableSceneIndex) -> None:
+        super().__init__(None, index)
+        self.params.basename = CABLE_TEMPLATE_NAME
+        self.profile_template: Union[modo.Item, None] = None
+
+    def detect_mesh_setup(self, mesh: modo.Item):
+        ...
+
+    def build(self) -> None:
+        self.create_cable_mesh(f'{CABLE_TEMPLATE_NAME}{CABLE_BASENAME_SUFFIX}')
         self.create_curve_sweep_mop()
         self.create_material_tag_mop()
         self.create_set_polygon_type_mop()
         self.create_math_multiply_channel_mod()
         self.create_cable_controls()
-        self.link_cable_channels()
-        self.set_cable_control_channels()
 
-        # restore preset browser status
-        display_preset_browser(preset_browser_opened)
+    @staticmethod
+    def duplicate_mesh(mesh: modo.Item) -> modo.Item:
+        # duplicate mesh with its mesh operations stack
+        lxq.select(mesh)
+        lxq.eval('item.duplicate false mesh false true')
+        lxq.flush()
+        return modo.Scene().selectedByType(c.MESH_TYPE)[0]
+
+    def clone_cable(self, cable: CableLive) -> None:
+        if not self.cable_mesh:
+            raise ValueError(f'{self.cable_mesh=}')
+        if not self.math_mult_chmod:
+            raise ValueError(f'{self.math_mult_chmod=}')
+        if not cable.plan:
+            raise ValueError(f'{cable.plan=}')
+        cable.cable_mesh = self.duplicate_mesh(self.cable_mesh)
+        cable.cable_mesh.name = cable.plan.cable_name
+        cable.curve_sweep_mop = CableLive.get_mesh_operation(cable.cable_mesh, 'curve.sweep')
+        cable.material_tag_mop = CableLive.get_mesh_operation(cable.cable_mesh, 'pmodel.materialTag.item')
+        cable.set_polygon_type_mop = CableLive.get_mesh_operation(cable.cable_mesh, 'poly.setType.meshop.item')
+        cable.math_mult_chmod = modo.Scene().duplicateItem(self.math_mult_chmod)
+        cable.create_lod_blend_channel_mod()
+
+    def clone_profile(self, cable: CableLive) -> modo.Item:
+        if not cable.plan:
+            raise ValueError(f'{cable.plan=}')
+        if not self.profile_template:
+            self.profile_template = self.new_shareable_profile(f'{CABLE_TEMPLATE_NAME}{PROFILE_BASENAME_SUFFIX}')
+        profile = self.duplicate_mesh(self.profile_template)
+        profile.name = cable.plan.profile_name
+        cable.prim_cylinder_item = cable.get_prim_cylinder_item(profile)
+        CableLive.set_channels(cable.prim_cylinder_item, {
+            'sizeX': cable.params.diameter / 2,
+            'sizeZ': cable.params.diameter / 2,
+        })
+        CableLive.set_channels(profile, {
+            CH_SIDES: cable.params.sides,
+            CH_SIDES_VIEWPORT: get_viewport_density(cable.params.sides, MIN_VIEWPORT_SIDES),
+        })
+        CableLive.link_lod_blend(
+            modo.Scene().addItem(itype=LOD_BLEND_TYPE), profile, CH_SIDES, CH_SIDES_VIEWPORT, cable.prim_cylinder_item, 'sides'
+        )
+        cable.link_lod_control(profile)
+
+        return profile
+
+    def remove(self) -> None:
+        self.remove_cable_setup()
+        if self.profile_template:
+            remove_profile_items(self.profile_template, self.prim_cylinder_item)
+        self.prim_cylinder_item = None
+        self.profile_template = None
+
+
+def remove_profile_items(profile: modo.Item, prim_cylinder_item: Union[modo.Item, None]) -> None:
+    # level of detail blends are linked from the profile control, not parented
+    lxq.flush()
+    if lod_channel := profile.channel(CH_LOD):
+        for channel in lod_channel.fwdLinked:  # type: ignore
+            modo.Scene().removeItems(channel.item)
+    modo.Scene().removeItems(prim_cylinder_item)
+    modo.Scene().removeItems(profile)
+
+
+def get_unique_cables(meshes: list[modo.Item], index: CableSceneIndex) -> list[CableLive]:
+    # curve and its cable mesh selected together refer to the same setup
+    unique_cables: dict[str, CableLive] = {}
+    for mesh in meshes:
+        cable = CableLive(mesh, index)
+        if not cable.curve_mesh:
+            print(f'Cable creation skipped for mesh <{mesh.name}>. No curve found.')
+            continue
+        unique_cables.setdefault(cable.curve_mesh.id, cable)
+    return list(unique_cables.values())
+
+
+@profiler.stage('plan_cables')
+def plan_build(cables: list[CableLive], is_profile_independent: bool) -> BuildPlan:
+    # scene reads only, parsing and naming run on plain data
+    lxq.flush()
+    return plan_cables([cable.get_curve_summary() for cable in cables], is_profile_independent)
+
+
+def execute_plan(plan: BuildPlan, cables: list[CableLive], index: CableSceneIndex) -> list[CableLive]:
+    cables_by_curve = {cable.curve_mesh.id: cable for cable in cables if cable.curve_mesh}
+    planned_cables: list[CableLive] = []
+    for cable_plan in plan.cables:
+        cable = cables_by_curve.get(cable_plan.curve_id)
+        if not cable:
+            raise ValueError(f'{cable_plan.curve_id=}')
+        cable.apply_plan(cable_plan)
+        planned_cables.append(cable)
+
+    updated_cables = [cable for cable in planned_cables if cable.plan and cable.plan.action == ACTION_UPDATE]
+    new_cables = [
+        cable for cable in planned_cables
+        if cable.plan and cable.plan.action in (ACTION_CREATE, ACTION_REBUILD)
+    ]
+    # one preset browser session for the whole plan, opened only when presets are instantiated
+    if new_cables or any(cable.is_new_profile_needed() for cable in updated_cables):
+        with presets:
+            build_planned_cables(updated_cables, new_cables, index)
+    else:
+        build_planned_cables(updated_cables, new_cables, index)
+    return planned_cables
+
+
+def build_planned_cables(updated_cables: list[CableLive], new_cables: list[CableLive], index: CableSceneIndex) -> None:
+    for cable in updated_cables:
+        with tracer.span(cable.trace_name, 'update'):
+            cable.update_live_cable()
+
+    if len(new_cables) < BATCH_MIN_CABLES:
+        for cable in new_cables:
+            with tracer.span(cable.trace_name, 'create'):
+                cable.create_live_cable()
+        return
+
+    # instantiate each preset once
+    template = CableTemplate(index)
+    with tracer.span(template.trace_name, 'build'):
+        template.build()
+
+    # clone template items for every cable
+    for cable in new_cables:
+        with tracer.span(cable.trace_name, 'clone'):
+            cable.create_live_cable_from_template(template)
+
+    # link cloned items
+    for cable in new_cables:
+        with tracer.span(cable.trace_name, 'link'):
+            cable.link_cloned_cable()
+
+    template.remove()
+
+
+def export_manifest(filename: str, index: CableSceneIndex) -> int:
+    # every complete cable setup of the scene
+    cables = (CableLive(setup.curve_mesh, index) for setup in list(index.setups.values()))
+    return write_manifest(filename, (cable.get_manifest_plan() for cable in cables if cable.is_cable_setup_complete()))
+
+
+def get_manifest_curve(cable_plan: CablePlan, index: CableSceneIndex) -> Union[modo.Item, None]:
+    # curves are matched by id, by name when the id is gone or reused by another item
+    try:
+        item = modo.Scene().item(cable_plan.curve_id)
+    except LookupError:
+        item = None
+    if item and item.type == c.MESH_TYPE and item.name == cable_plan.curve_name:
+        return item
+    return index.meshes.get(cable_plan.curve_name)
+
+
+def import_manifest(filename: str, index: CableSceneIndex) -> list[CableLive]:
+    # stored parameters and profile assignments are applied without decoding curve names
+    lxq.flush()
+    cables: dict[str, CableLive] = {}
+    cable_plans: list[CablePlan] = []
+    for cable_plan in read_manifest(filename):
+        curve = get_manifest_curve(cable_plan, index)
+        cable = CableLive(curve, index) if curve else None
+        if not cable or not cable.curve_mesh or cable.curve_mesh.id in cables:
+            print(f'Cable import skipped for curve <{cable_plan.curve_name}>')
+            continue
+        cable_plan.curve_id = cable.curve_mesh.id
+        # manifests written before compensation was stored as a channel
+        cable_plan.channels.setdefault(CH_COMP, cable_plan.params.compensation)
+        cable_plan.action = get_action(cable.get_curve_summary())
+        if cable_plan.action == ACTION_SKIP:
+            print(f'Cable import skipped for curve <{cable_plan.curve_name}>. No curve found.')
+        cables[cable.curve_mesh.id] = cable
+        cable_plans.append(cable_plan)
+    is_profile_independent = any(not cable_plan.is_profile_shared for cable_plan in cable_plans)
+    return execute_plan(BuildPlan(cable_plans, is_profile_independent), list(cables.values()), index)
+
+
+def build_cables(
+        meshes: list[modo.Item],
+        is_profile_independent: bool,
+        index: Union[CableSceneIndex, None] = None) -> list[CableLive]:
+    if not index:
+        index = CableSceneIndex()
+    cables = get_unique_cables(meshes, index)
+    plan = plan_build(cables, is_profile_independent)
+    return execute_plan(plan, cables, index)
+
+
+def get_curve_center(mesh: modo.Item) -> tuple[float, float, float]:
+    # bounding box center offset by item position, rotation and scale are ignored
+    bounds_min, bounds_max = mesh.geometry.internalMesh.BoundingBox(lx.symbol.iMARK_ANY)  # type: ignore
+    position = modo.Matrix4(mesh.channel('worldMatrix').get()).position  # type: ignore
+    return tuple(origin + (low + high) / 2 for origin, low, high in zip(position, bounds_min, bounds_max))
+
+
+def set_lod(value: float, index: CableSceneIndex) -> None:
+    # single scene-level value for every cable and profile linked to the control
+    if not 0.0 <= value <= 1.0:
+        raise ValueError(f'{value=}')
+    lod_control = index.get_lod_control()
+    lxq.flush()
+    lod_control.channel(CH_LOD).set(value)  # type: ignore
+
+
+def unlink_lod_control(control: modo.Item, index: CableSceneIndex) -> None:
+    if index.lod_control and index.is_lod_controlled(control):
+        lxq.eval(f'channel.link remove {{{index.lod_control.id}:{CH_LOD}}} {{{control.id}:{CH_LOD}}}')
+
+
+def set_camera_lod(cables: list[CableLive], index: CableSceneIndex) -> None:
+    # level of detail by render camera distance at command time, overrides the scene control
+    lxq.flush()
+    camera = modo.Scene().renderCamera
+    if not camera:
+        print('No render camera found, level of detail unchanged')
+        return
+    camera_position = modo.Matrix4(camera.channel('worldMatrix').get()).position  # type: ignore
+    # shared profiles keep the level of detail of their closest cable
+    profile_lods: dict[str, float] = {}
+    profiles: dict[str, modo.Item] = {}
+    for cable in cables:
+        if not cable.cable_mesh or not cable.curve_mesh:
+            continue
+        distance = math.dist(camera_position, get_curve_center(cable.curve_mesh))
+        lod = get_camera_lod(distance, LOD_NEAR_DISTANCE, LOD_FAR_DISTANCE)
+        unlink_lod_control(cable.cable_mesh, index)
+        CableLive.set_channels(cable.cable_mesh, {CH_LOD: lod})
+        if cable.profile_mesh:
+            profiles[cable.profile_mesh.id] = cable.profile_mesh
+            profile_lods[cable.profile_mesh.id] = max(profile_lods.get(cable.profile_mesh.id, 0.0), lod)
+    for profile_id, lod in profile_lods.items():
+        # profiles created before level of detail support have no control
+        if profiles[profile_id].channel(CH_LOD):
+            unlink_lod_control(profiles[profile_id], index)
+            CableLive.set_channels(profiles[profile_id], {CH_LOD: lod})
 
 
 def main():
     is_profile_independent: bool = False
+    is_journal: bool = False
+    is_evict_profiles: bool = False
+    is_dry_run: bool = False
+    is_camera_lod: bool = False
+    lod: Union[float, None] = None
     selected_meshes = modo.Scene().selectedByType(itype=c.MESH_TYPE)
     args = lx.args()
     if args:
         if CMD_INDEPENDENT_PROFILE in args:
             is_profile_independent = True
-    # cable_shape = CableLive.get_shareable_cable_shape()
-    # visible_channel = cable_shape.channel('visible')
-    # if visible_channel:
-    #     visible_channel.set('allOff')
-    cables: list[CableLive] = []
-    for mesh in selected_meshes:
-        cable = CableLive(mesh)
-        cable.create_live_cable(is_profile_independent)
-        cables.append(cable)
-
-    modo.Scene().deselect()
-    if not cables:
-        for item in selected_meshes:
-            item.select()
-        return
+        if CMD_JOURNAL in args:
+            is_journal = True
+        if CMD_EVICT_PROFILES in args:
+            is_evict_profiles = True
+        if CMD_DRY_RUN in args:
+            is_dry_run = True
+        if CMD_CAMERA_LOD in args:
+            is_camera_lod = True
+        for arg in args:
+            if arg.startswith(CMD_LOD):
+                lod = float(arg[len(CMD_LOD):])
+        if CMD_PROFILE in args:
+            profiler.start(lxq)
+    # the profile is reported by every branch, export and dry run included
+    try:
+        # cable_shape = CableLive.get_shareable_cable_shape()
+        # visible_channel = cable_shape.channel('visible')
+        # if visible_channel:
+        #     visible_channel.set('allOff')
+        index = CableSceneIndex()
+        manifest_filename = replace_file_ext(modo.Scene().filename, MANIFEST_FILE_EXT)
+        if args and CMD_EXPORT in args:
+            count = export_manifest(manifest_filename, index)
+            print(f'{count} cables exported: <{manifest_filename}>')
+            return
 
-    for cable in cables:
-        if cable.cable_mesh:
-            cable.cable_mesh.select()
-        lx.eval(f'item.editorColor {HIGHLIGHT_COLOR}')
+        if is_dry_run:
+            plan = plan_build(get_unique_cables(selected_meshes, index), is_profile_independent)
+            plan_filename = replace_file_ext(modo.Scene().filename, PLAN_FILE_EXT)
+            plan.write(plan_filename)
+            print(plan.get_report())
+            print(f'Build plan stored: <{plan_filename}>')
+            return
+
+        if args and CMD_IMPORT in args:
+            cables = import_manifest(manifest_filename, index)
+            print(f'{len(cables)} cables imported: <{manifest_filename}>')
+        else:
+            cables = build_cables(selected_meshes, is_profile_independent, index)
+        if lod is not None:
+            set_lod(lod, index)
+        if is_camera_lod:
+            set_camera_lod(cables, index)
+        for cable in cables:
+            if cable.curve_mesh:
+                tracer.debug('%s: %s selection events', cable.curve_mesh.name, cable.selection_events)
+
+        lxq.eval('select.drop item')
+        if not cables:
+            for item in selected_meshes:
+                lxq.select(item, replace=False)
+        else:
+            for cable in cables:
+                if cable.cable_mesh:
+                    lxq.select(cable.cable_mesh, replace=False)
+                lxq.eval(f'item.editorColor {HIGHLIGHT_COLOR}')
+        lxq.flush()
+
+        if is_evict_profiles:
+            for name in index.evict_unused_profiles():
+                print(f'Unused profile removed: <{name}>')
+        print(index.get_profile_report())
+
+        if tracer.is_timing:
+            print(tracer.get_span_report())
+            print(presets.get_report())
+
+        if is_journal:
+            lxq.dump(replace_file_ext(modo.Scene().filename, JOURNAL_FILE_EXT))
+    finally:
+        if profiler.is_enabled:
+            report_profile(args)  # type: ignore
+
+
+def report_profile(args: list[str]) -> None:
+    profiler.stop()
+    print(profiler.get_report())
+    scene_filename = modo.Scene().filename
+    if CMD_PROFILE_JSON in args:
+        profiler.write_json(replace_file_ext(scene_filename, PROFILE_JSON_FILE_EXT), scene_filename)
+    if CMD_PROFILE_CSV in args:
+        profiler.write_csv(replace_file_ext(scene_filename, PROFILE_CSV_FILE_EXT), scene_filename)
 
 
 if __name__ == '__main__':
-    h3dd = H3dDebug(enable=True, file=replace_file_ext(modo.Scene().filename, ".log"))
-    main()
+    start_tracing(lx.args(), modo.Scene().filename)
+    try:
+        main()
+    finally:
+        tracer.stop()
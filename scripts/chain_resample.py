@@ -0,0 +1,116 @@
+#!/usr/bin/python
+# ================================
+# (C)2024 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# python
+# evenly spaced joints along a vertex chain with vertex weights blended between neighboring joints
+# no modo dependencies, numpy is used when available
+
+import bisect
+import math
+from typing import Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+MIN_JOINT_COUNT = 2
+
+
+class ChainResampling:
+    """Target joint count or maximum segment length, resampling is off when both are zero"""
+
+    def __init__(self, joint_count: int = 0, max_segment_length: float = 0.0) -> None:
+        if joint_count < 0:
+            raise ValueError(f'{joint_count=}')
+        if max_segment_length < 0:
+            raise ValueError(f'{max_segment_length=}')
+        self.joint_count = joint_count
+        self.max_segment_length = max_segment_length
+
+    @property
+    def is_enabled(self) -> bool:
+        return bool(self.joint_count or self.max_segment_length)
+
+    def get_joint_count(self, chain_length: float, vertex_count: int) -> int:
+        # never more joints than vertices, the chain is used as is in that case
+        if vertex_count < MIN_JOINT_COUNT:
+            raise ValueError(f'{vertex_count=}')
+        if self.joint_count:
+            count = self.joint_count
+        else:
+            count = math.ceil(chain_length / self.max_segment_length) + 1
+        return max(MIN_JOINT_COUNT, min(count, vertex_count))
+
+
+class ChainWeights:
+    """Per vertex weights of the two joints around it along the chain"""
+
+    def __init__(self, joints: list[int], weights: list[float]) -> None:
+        # vertex i gets weights[i] from joint joints[i] and 1 - weights[i] from joint joints[i] + 1
+        self.joints = joints
+        self.weights = weights
+
+    def get_weight_maps(self, joint_count: int) -> list[dict[int, float]]:
+        # vertex index: weight, one map per joint
+        weight_maps: list[dict[int, float]] = [{} for _ in range(joint_count)]
+        for vertex, (joint, weight) in enumerate(zip(self.joints, self.weights)):
+            if weight > 0.0:
+                weight_maps[joint][vertex] = weight
+            if weight < 1.0:
+                weight_maps[joint + 1][vertex] = 1.0 - weight
+        return weight_maps
+
+
+def get_arc_lengths(positions) -> list[float]:
+    if np is not None:
+        points = np.asarray(positions, dtype=float).reshape(-1, 3)
+        segments = np.linalg.norm(np.diff(points, axis=0), axis=1)
+        return np.concatenate(([0.0], np.cumsum(segments))).tolist()
+    arc_lengths = [0.0]
+    for previous, current in zip(positions, positions[1:]):
+        arc_lengths.append(arc_lengths[-1] + math.dist(previous, current))
+    return arc_lengths
+
+
+def get_joint_arc_lengths(chain_length: float, joint_count: int) -> list[float]:
+    return [chain_length * joint / (joint_count - 1) for joint in range(joint_count)]
+
+
+def resample_chain(positions, arc_lengths: Sequence[float], joint_arc_lengths: Sequence[float]):
+    # joint positions interpolated along the vertex polyline at the given arc lengths
+    if np is not None:
+        points = np.asarray(positions, dtype=float).reshape(-1, 3)
+        return np.stack([np.interp(joint_arc_lengths, arc_lengths, points[:, axis]) for axis in range(3)], axis=1)
+    joint_positions = []
+    for arc_length in joint_arc_lengths:
+        segment = min(max(bisect.bisect_right(arc_lengths, arc_length) - 1, 0), len(arc_lengths) - 2)
+        start, end = arc_lengths[segment], arc_lengths[segment + 1]
+        t = (arc_length - start) / (end - start) if end > start else 0.0
+        joint_positions.append(tuple(
+            first + (second - first) * t for first, second in zip(positions[segment], positions[segment + 1])
+        ))
+    return joint_positions
+
+
+def get_chain_weights(arc_lengths: Sequence[float], joint_arc_lengths: Sequence[float]) -> ChainWeights:
+    last_segment = len(joint_arc_lengths) - 2
+    if np is not None:
+        joint_lengths = np.asarray(joint_arc_lengths, dtype=float)
+        joints = np.clip(np.searchsorted(joint_lengths, arc_lengths, side='right') - 1, 0, last_segment)
+        spans = joint_lengths[joints + 1] - joint_lengths[joints]
+        offsets = np.asarray(arc_lengths, dtype=float) - joint_lengths[joints]
+        weights = 1.0 - np.divide(offsets, spans, out=np.zeros_like(offsets), where=spans > 0)
+        return ChainWeights(joints.tolist(), np.clip(weights, 0.0, 1.0).tolist())
+    joints = []
+    weights = []
+    for arc_length in arc_lengths:
+        joint = min(max(bisect.bisect_right(joint_arc_lengths, arc_length) - 1, 0), last_segment)
+        span = joint_arc_lengths[joint + 1] - joint_arc_lengths[joint]
+        offset = arc_length - joint_arc_lengths[joint]
+        joints.append(joint)
+        weights.append(min(max(1.0 - offset / span if span > 0 else 1.0, 0.0), 1.0))
+    return ChainWeights(joints, weights)
@@ -0,0 +1,141 @@
+#!/usr/bin/python
+# ================================
+# (C)2024 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# modo python
+# lx.eval command queue with recorded command journal
+
+from typing import Callable, Union
+
+import lx
+import modo
+
+from h3d_utilites.scripts.h3d_utils import is_preset_browser_opened, display_preset_browser
+
+
+PRESET_BROWSER_COMMAND = 'h3d.presetBrowser'
+SELECT_PREFIX = 'select.'
+SELECT_ITEM_PREFIX = 'select.item '
+SELECT_SET_SUFFIX = ' set'
+
+# commands changing selection, each one fires viewport and event system updates
+SELECTION_COMMANDS = (
+    SELECT_PREFIX,
+    'preset.do',
+    'layer.new',
+    'layer.groupSelected',
+    'item.duplicate',
+    'weightCont.create',
+)
+
+# commands cancelling each other out when queued one right after another
+CANCELLING_PAIRS = {
+    ('anim.setup off', 'anim.setup on'),
+    ('anim.setup on', 'anim.setup off'),
+}
+
+
+class CommandQueue:
+    """Collects lx.eval commands, collapses redundant ones and flushes them in one batch"""
+
+    def __init__(self) -> None:
+        self.commands: list[str] = []
+        self.journal: list[str] = []
+        self.issued = 0
+        self.executed = 0
+        self.selection_events = 0
+        self.preset_browser_opened: Union[bool, None] = None
+        self.headless: Union[bool, None] = None
+
+    def eval(self, command: str) -> None:
+        self.issued += 1
+        if self.is_redundant(command):
+            return
+        self.commands.append(command)
+
+    def is_redundant(self, command: str) -> bool:
+        if not self.commands:
+            return False
+        last = self.commands[-1]
+        if command == last and command.startswith(SELECT_PREFIX):
+            return True
+        if (last, command) in CANCELLING_PAIRS:
+            self.commands.pop()
+            return True
+        if command.startswith(SELECT_ITEM_PREFIX) and command.endswith(SELECT_SET_SUFFIX):
+            # item selection in set mode overrides preceding item selections
+            while self.commands and self.commands[-1].startswith(SELECT_ITEM_PREFIX):
+                self.commands.pop()
+        return False
+
+    def select(self, item: modo.Item, replace: bool = True) -> None:
+        mode = 'set' if replace else 'add'
+        self.eval(f'{SELECT_ITEM_PREFIX}{item.id} {mode}')
+
+    def select_vertex(self, vertex: modo.meshgeometry.MeshVertex, replace: bool = True) -> None:
+        # mesh API selection runs right away, queued commands go first
+        self.flush()
+        self.selection_events += 1
+        vertex.select(replace=replace)
+
+    def is_headless(self) -> bool:
+        if self.headless is None:
+            self.headless = bool(lx.service.Platform().IsHeadless())
+        return self.headless
+
+    def is_preset_browser_opened(self) -> bool:
+        if self.preset_browser_opened is None:
+            self.preset_browser_opened = is_preset_browser_opened()
+        return self.preset_browser_opened
+
+    def preset_browser(self, opened: bool) -> None:
+        # modo_cl sessions have no layout, presets are applied by path without the browser panel
+        self.issued += 1
+        if self.is_headless():
+            return
+        if opened == self.is_preset_browser_opened():
+            return
+        self.preset_browser_opened = opened
+        if self.commands and self.commands[-1].startswith(PRESET_BROWSER_COMMAND):
+            # consecutive toggles cancel out
+            self.commands.pop()
+            return
+        self.commands.append(f'{PRESET_BROWSER_COMMAND} {opened}')
+
+    def flush(self) -> None:
+        commands = self.commands
+        self.commands = []
+        for command in commands:
+            self.execute(command)
+
+    def execute(self, command: str):
+        self.executed += 1
+        if command.startswith(SELECTION_COMMANDS):
+            self.selection_events += 1
+        self.journal.append(command)
+        return execute_command(command)
+
+    def dump(self, filename: str) -> None:
+        self.flush()
+        with open(filename, 'w') as file:
+            file.writelines(f'{command}\n' for command in self.journal)
+
+
+def execute_command(command: str, evaluate: Union[Callable[[str], object], None] = None):
+    if command.startswith(PRESET_BROWSER_COMMAND):
+        display_preset_browser(command.split()[-1] == str(True))
+        return None
+    if not evaluate:
+        evaluate = lx.eval
+    return evaluate(command)
+
+
+def replay(filename: str, evaluate: Union[Callable[[str], object], None] = None) -> int:
+    count = 0
+    with open(filename) as file:
+        for line in file:
+            if command := line.strip():
+                execute_command(command, evaluate)
+                count += 1
+    return count
@@ -5,104 +5,603 @@
 # --------------------------------
 # modo python
 # setup IK by selected vertices
+# usage:
+# - select vertices
+# - run command
+# - fewer, evenly spaced joints: @ik_setup_by_selected_vertices.py joints:8 or segment:0.05
 
+import time
 from typing import Union
 
 import modo
 import modo.constants as c
 import lx
 
-from h3d_utilites.scripts.h3d_utils import parent_items_to, replace_file_ext
-from h3d_utilites.scripts.h3d_debug import H3dDebug
+from h3d_utilites.scripts.h3d_utils import replace_file_ext
 
+from h3d_cable_setup.scripts.command_queue import CommandQueue
+from h3d_cable_setup.scripts.tracing import start_tracing, tracer
+from h3d_cable_setup.scripts.spatial import KdTree
+from h3d_cable_setup.scripts.vertex_order import get_chain_order
+from h3d_cable_setup.scripts.chain_resample import (
+    ChainResampling,
+    get_arc_lengths,
+    get_chain_weights,
+    get_joint_arc_lengths,
+    resample_chain,
+)
 
-def new_loc_at_vert(vertex: modo.meshgeometry.MeshVertex, parent: Union[modo.Item, None]) -> modo.Item:
-    locator = modo.Scene().addItem(itype=c.LOCATOR_TYPE)
-    locator.select(replace=True)
-    lx.eval('item.channel locator$size 0.0')
-    locator.position.set(vertex.position)
-    if not parent:
-        return locator
-    parent_items_to(items=[locator], parent=parent)
-    return locator
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
-def make_ik_setup(mesh):
-    # Create locators
-    locator = None
-    locators = []
-    weight_containers = []
-    vertices = mesh.geometry.vertices.selected
-    h3dd.print_items(vertices, 'vertices:')
-    if not vertices:
-        h3dd.print_debug(f'no vertices selected in mesh:<{mesh.name}>')
+CMD_JOURNAL = 'journal'
+CMD_JOINT_COUNT = 'joints:'
+CMD_MAX_SEGMENT_LENGTH = 'segment:'
+JOURNAL_FILE_EXT = '.journal'
+
+JOINT_NAME_SUFFIX = '_joint'
+IK_SET_NAME_SUFFIX = '_IK_set'
+# resampled chains use a weight map and an influence per joint instead of a weight container per vertex
+WEIGHT_MAP_NAME_SUFFIX = '_IK_weight_'
+INFLUENCE_NAME_SUFFIX = '_IK_influence'
+# items created by ikfb.assign and ikfb.goal are renamed to be found again on update and removal
+IK_SOLVER_NAME_SUFFIX = '_IK_solver'
+IK_GOAL_NAME_SUFFIX = '_IK_goal'
+# root and tip joints for the IK solver
+MIN_CHAIN_VERTICES = 2
+# joints closer than this to a selected vertex are kept as they are
+JOINT_MATCH_TOLERANCE = 1e-5
+
+STATUS_CREATED = 'created'
+STATUS_UPDATED = 'updated'
+STATUS_UNCHANGED = 'unchanged'
+STATUS_SKIPPED = 'skipped'
+
+lxq = CommandQueue()
+
+
+class SetupMode:
+    """Keeps setup mode on for the outermost block, nested blocks don't toggle it"""
+
+    def __init__(self) -> None:
+        self.depth = 0
+
+    def __enter__(self) -> 'SetupMode':
+        if not self.depth:
+            lxq.eval('anim.setup on')
+            # API edits inside the block run right away, the mode has to be on before them
+            lxq.flush()
+        self.depth += 1
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.depth -= 1
+        if not self.depth:
+            lxq.eval('anim.setup off')
+
+
+setup_mode = SetupMode()
+
+
+class IkResult:
+    def __init__(self, mesh: modo.Item) -> None:
+        self.mesh_name = mesh.name
+        self.status = STATUS_SKIPPED
+        self.group: Union[modo.Item, None] = None
+        self.joints = 0
+        self.seconds = 0.0
+
+    def __str__(self) -> str:
+        return f'{self.mesh_name}: {self.status}, {self.joints} joints, {self.seconds:.3f} s'
+
+
+def get_vertex_positions(vertices: list[modo.meshgeometry.MeshVertex]):
+    positions = [vertex.position for vertex in vertices]
+    if np is None:
+        return positions
+    return np.array(positions, dtype=float).reshape(-1, 3)
+
+
+def order_vertices(vertices: list[modo.meshgeometry.MeshVertex]) -> list[modo.meshgeometry.MeshVertex]:
+    # chain order follows edges between selected vertices, not the order they were clicked in
+    selection_indices = {vertex.index: i for i, vertex in enumerate(vertices)}
+    neighbors = [
+        [selection_indices[neighbor.index] for neighbor in vertex.vertices if neighbor.index in selection_indices]
+        for vertex in vertices
+    ]
+    order, method = get_chain_order([vertex.position for vertex in vertices], neighbors)
+    tracer.debug('%s vertices ordered by %s', len(vertices), method)
+    return [vertices[i] for i in order]
+
+
+def get_local_offsets(positions) -> list[tuple[float, float, float]]:
+    # every joint is parented to the previous one, so its local position is an offset from the parent
+    if np is not None:
+        offsets = np.diff(positions, axis=0, prepend=np.zeros((1, 3)))
+        return [tuple(offset) for offset in offsets.tolist()]
+    offsets = []
+    previous = (0.0, 0.0, 0.0)
+    for position in positions:
+        offsets.append(tuple(current - prev for current, prev in zip(position, previous)))
+        previous = position
+    return offsets
+
+
+def new_joint(name: str) -> modo.Item:
+    joint = modo.Scene().addItem(itype=c.LOCATOR_TYPE, name=name)
+    joint.channel('size').set(0.0)  # type: ignore
+    return joint
+
+
+def new_joints(name: str, positions) -> list[modo.Item]:
+    joints: list[modo.Item] = []
+    parent: Union[modo.Item, None] = None
+    for offset in get_local_offsets(positions):
+        joint = new_joint(name)
+        if parent:
+            joint.setParent(parent)
+        joint.position.set(offset)
+        joints.append(joint)
+        parent = joint
+    return joints
+
+
+def new_weight_containers(vertices: list[modo.meshgeometry.MeshVertex]) -> list[modo.Item]:
+    # expects setup mode to be on
+    weight_containers: list[modo.Item] = []
+    lxq.eval('select.typeFrom vertex')
+    lxq.flush()
+    selection = save_vertex_selection()
     for vertex in vertices:
-        locator = new_loc_at_vert(vertex=vertex, parent=locator)
-        locators.append(locator)
-        h3dd.print_debug(f'locator:{locator.name}')
-        h3dd.print_items(locators, 'locators:')
-        locator.name = f'{mesh.name}_joint'
-        h3dd.print_debug(f'joint:{locator.name}')
-        lx.eval('select.typeFrom vertex')
-        vertex.select(replace=True)
-        lx.eval('anim.setup on')
-        lx.eval('weightCont.create')
+        lxq.select_vertex(vertex)
+        lxq.eval('weightCont.create')
+        lxq.flush()
         weight_cont, = modo.Scene().selectedByType(itype=c.WEIGHTCONTAINER_TYPE)
         weight_containers.append(weight_cont)
+    restore_vertex_selection(selection)
+    return weight_containers
+
+
+def save_vertex_selection() -> list[modo.meshgeometry.MeshVertex]:
+    # selected vertices of every mesh, in selection order
+    selection: list[modo.meshgeometry.MeshVertex] = []
+    for mesh in get_vertex_selection_meshes():
+        selection.extend(mesh.geometry.vertices.selected)
+    return selection
+
+
+def restore_vertex_selection(selection: list[modo.meshgeometry.MeshVertex]) -> None:
+    # the first vertex replaces the selection left by new_weight_containers()
+    for i, vertex in enumerate(selection):
+        lxq.select_vertex(vertex, replace=i == 0)
+
+
+def link_influences(weight_containers: list[modo.Item], joints: list[modo.Item]) -> None:
+    for weight_cont, joint in zip(weight_containers, joints):
         gen_influence = modo.Scene().addItem(itype=c.GENINFLUENCE_TYPE)
-        lx.eval(f'item.link genInfluence {weight_cont.id} {gen_influence.id} replace:true')
-        lx.eval(f'item.link $infeff {locator.id} {gen_influence.id} posT:0 replace:false')
-        # lx.eval('')
-        lx.eval('anim.setup off')
+        lxq.eval(f'item.link genInfluence {weight_cont.id} {gen_influence.id} replace:true')
+        lxq.eval(f'item.link $infeff {joint.id} {gen_influence.id} posT:0 replace:false')
+
+
+def remove_weight_maps(mesh: modo.Item) -> None:
+    lxq.flush()
+    name = f'{mesh.name}{WEIGHT_MAP_NAME_SUFFIX}'
+    with mesh.geometry as geometry:  # type: ignore
+        if weight_maps := [weight_map for weight_map in geometry.vmaps.weightMaps if weight_map.name.startswith(name)]:
+            geometry.vmaps.removeMaps(weight_maps)
+
+
+def set_weight_maps(
+        mesh: modo.Item,
+        vertices: list[modo.meshgeometry.MeshVertex],
+        weight_maps: list[dict[int, float]]) -> list[str]:
+    # weight maps left by an earlier resampled setup are replaced, writes are proportional to the weighted vertices
+    remove_weight_maps(mesh)
+    names: list[str] = []
+    with mesh.geometry as geometry:  # type: ignore
+        for joint, joint_weights in enumerate(weight_maps):
+            name = f'{mesh.name}{WEIGHT_MAP_NAME_SUFFIX}{joint}'
+            weight_map = geometry.vmaps.addWeightMap(name)
+            for vertex, weight in joint_weights.items():
+                weight_map[vertices[vertex].index] = weight
+            names.append(name)
+    return names
+
+
+def link_map_influences(mesh: modo.Item, weight_map_names: list[str], joints: list[modo.Item]) -> None:
+    for weight_map_name, joint in zip(weight_map_names, joints):
+        gen_influence = modo.Scene().addItem(itype=c.GENINFLUENCE_TYPE, name=f'{mesh.name}{INFLUENCE_NAME_SUFFIX}')
+        gen_influence.channel('mapName').set(weight_map_name)  # type: ignore
+        lxq.eval(f'item.link genInfluence {mesh.id} {gen_influence.id} replace:true')
+        lxq.eval(f'item.link $infeff {joint.id} {gen_influence.id} posT:0 replace:false')
+
+
+def new_vertex_chain(
+        mesh: modo.Item,
+        vertices: list[modo.meshgeometry.MeshVertex]) -> tuple[list[modo.Item], list[modo.Item]]:
+    # a joint and a weight container per vertex, expects setup mode to be on
+    with tracer.span(mesh.name, 'joints'):
+        joints = new_joints(f'{mesh.name}{JOINT_NAME_SUFFIX}', get_vertex_positions(vertices))
+    with tracer.span(mesh.name, 'weights'):
+        weight_containers = new_weight_containers(vertices)
+        link_influences(weight_containers, joints)
+    return joints, weight_containers
+
+
+def new_resampled_chain(
+        mesh: modo.Item,
+        vertices: list[modo.meshgeometry.MeshVertex],
+        resampling: ChainResampling) -> list[modo.Item]:
+    # evenly spaced joints along the vertex chain, expects setup mode to be on
+    positions = get_vertex_positions(vertices)
+    arc_lengths = get_arc_lengths(positions)
+    joint_count = resampling.get_joint_count(arc_lengths[-1], len(vertices))
+    joint_arc_lengths = get_joint_arc_lengths(arc_lengths[-1], joint_count)
+    with tracer.span(mesh.name, 'joints'):
+        joints = new_joints(f'{mesh.name}{JOINT_NAME_SUFFIX}', resample_chain(positions, arc_lengths, joint_arc_lengths))
+    with tracer.span(mesh.name, 'weights'):
+        weight_maps = get_chain_weights(arc_lengths, joint_arc_lengths).get_weight_maps(joint_count)
+        link_map_influences(mesh, set_weight_maps(mesh, vertices, weight_maps), joints)
+    return joints
+
+
+class IkSet:
+    """Joints and weight containers of an existing IK set group in chain order
+
+    weight containers are grouped in the order of the joints they influence
+    """
+
+    def __init__(self, group: modo.Item, mesh: modo.Item) -> None:
+        self.group = group
+        self.mesh = mesh
+        self.joints: list[modo.Item] = []
+        self.weight_containers: list[modo.Item] = []
+
+        lxq.flush()
+        for child in group.children():
+            if child.type == c.WEIGHTCONTAINER_TYPE:
+                self.weight_containers.append(child)
+            elif child.type == c.LOCATOR_TYPE and not self.joints:
+                self.joints = IkSet.get_chain(child)
+
+    @staticmethod
+    def find(mesh: modo.Item) -> Union['IkSet', None]:
+        lxq.flush()
+        try:
+            group = modo.Scene().item(f'{mesh.name}{IK_SET_NAME_SUFFIX}')
+        except LookupError:
+            return None
+        if group.type != c.GROUPLOCATOR_TYPE:
+            return None
+        return IkSet(group, mesh)
+
+    @staticmethod
+    def get_chain(root: modo.Item) -> list[modo.Item]:
+        joints = [root]
+        while children := [child for child in joints[-1].children() if child.type == c.LOCATOR_TYPE]:
+            joints.append(children[0])
+        return joints
+
+    def is_consistent(self) -> bool:
+        return bool(self.joints) and len(self.joints) == len(self.weight_containers)
+
+    def get_map_influences(self) -> list[modo.Item]:
+        name = f'{self.mesh.name}{INFLUENCE_NAME_SUFFIX}'
+        return [item for item in modo.Scene().items(itype=c.GENINFLUENCE_TYPE) if item.name.startswith(name)]
 
-    lx.eval('anim.setup on')
-    # Align locators
-    modo.Scene().deselect()
-    for loc_sel in locators:
-        loc_sel.select()
-    lx.eval('!item.align orient:xyz')
+    def get_ik_items(self) -> list[modo.Item]:
+        # solver and goal of the chain, items left by a previous assignment are included
+        names = (f'{self.mesh.name}{IK_SOLVER_NAME_SUFFIX}', f'{self.mesh.name}{IK_GOAL_NAME_SUFFIX}')
+        return [item for item in modo.Scene().items() if item.name.startswith(names)]
 
-    # Apply IK
-    joint_first = locators[0]
-    joint_last = locators[-1]
+    def remove_ik(self) -> None:
+        lxq.flush()
+        for item in self.get_ik_items():
+            modo.Scene().removeItems(item)
 
-    joint_first.select(replace=True)
-    joint_last.select()
-    lx.eval('ikfb.assign')
-    lx.eval('ikfb.goal')
+    def get_joint_positions(self) -> list[tuple[float, float, float]]:
+        return [get_world_position(joint) for joint in self.joints]
 
-    lx.eval('anim.setup off')
+    def remove(self) -> None:
+        self.remove_ik()
+        for weight_cont in self.weight_containers:
+            remove_weight_container(weight_cont)
+        if not self.weight_containers:
+            for influence in self.get_map_influences():
+                modo.Scene().removeItems(influence)
+            remove_weight_maps(self.mesh)
+        for joint in self.joints:
+            modo.Scene().removeItems(joint)
+        modo.Scene().removeItems(self.group)
+
+
+class JointMatch:
+    """Existing joints reused for the selected vertices"""
+
+    def __init__(self, vertex_count: int) -> None:
+        # existing joint index per vertex, -1 for a new joint
+        self.joints: list[int] = [-1] * vertex_count
+        self.moved: list[int] = []
+        self.deleted: list[int] = []
+
+    @property
+    def created(self) -> list[int]:
+        return [vertex for vertex, joint in enumerate(self.joints) if joint < 0]
+
+    def is_unchanged(self, joint_count: int) -> bool:
+        return not self.moved and self.joints == list(range(joint_count))
+
+
+def match_joints(positions, joint_positions: list[tuple[float, float, float]]) -> JointMatch:
+    match = JointMatch(len(positions))
+    tree = KdTree(joint_positions)
+    unmatched: list[int] = []
+    for vertex, position in enumerate(positions):
+        joint, _ = tree.nearest(tuple(position), JOINT_MATCH_TOLERANCE)
+        if joint < 0:
+            unmatched.append(vertex)
+            continue
+        match.joints[vertex] = joint
+        tree.remove(joint)
+
+    # joints left over are moved to unmatched vertices in chain order
+    free = [joint for joint in range(len(joint_positions)) if not tree.removed[joint]]
+    for vertex, joint in zip(unmatched, free):
+        match.joints[vertex] = joint
+        match.moved.append(vertex)
+    match.deleted = free[len(unmatched):]
+    return match
+
+
+def remove_weight_container(weight_cont: modo.Item) -> None:
+    influences: list[modo.Item] = weight_cont.itemGraph('deformers').reverse()  # type: ignore
+    for influence in influences:
+        modo.Scene().removeItems(influence)
+    modo.Scene().removeItems(weight_cont)
+
+
+def remove_joint(joint: modo.Item, weight_cont: modo.Item) -> None:
+    remove_weight_container(weight_cont)
+    modo.Scene().removeItems(joint)
+
+
+def get_world_position(item: modo.Item) -> tuple[float, float, float]:
+    return tuple(modo.Matrix4(item.channel('worldMatrix').get()).position)  # type: ignore
+
+
+def set_chain(joints: list[modo.Item], positions, group: modo.Item) -> None:
+    # rebuild parenting and reset transforms before alignment
+    group_position = get_world_position(group)
+    parent = group
+    for i, (joint, offset) in enumerate(zip(joints, get_local_offsets(positions))):
+        if i == 0:
+            offset = tuple(value - origin for value, origin in zip(offset, group_position))
+        joint.setParent(parent)
+        joint.rotation.set((0.0, 0.0, 0.0))
+        joint.position.set(offset)
+        parent = joint
+
+
+def align_joints(joints: list[modo.Item]) -> None:
+    lxq.eval('select.drop item')
+    for joint in joints:
+        lxq.select(joint, replace=False)
+    lxq.eval('!item.align orient:xyz')
+
+
+def get_new_items(known_ids: set[str]) -> list[modo.Item]:
+    lxq.flush()
+    return [item for item in modo.Scene().items() if item.id not in known_ids]
+
+
+def assign_ik(mesh: modo.Item, joints: list[modo.Item]) -> None:
+    lxq.select(joints[0])
+    lxq.select(joints[-1], replace=False)
+    lxq.flush()
+    known_ids = {item.id for item in modo.Scene().items()}
+    lxq.eval('ikfb.assign')
+    solver_items = get_new_items(known_ids)
+    known_ids.update(item.id for item in solver_items)
+    lxq.eval('ikfb.goal')
+    goal_items = get_new_items(known_ids)
+    for item in solver_items:
+        item.name = f'{mesh.name}{IK_SOLVER_NAME_SUFFIX}'
+    for item in goal_items:
+        item.name = f'{mesh.name}{IK_GOAL_NAME_SUFFIX}'
+
+
+def update_ik_setup(mesh: modo.Item, vertices: list[modo.meshgeometry.MeshVertex], ik_set: IkSet) -> bool:
+    # returns False when the IK set already matches the selected vertices
+    positions = get_vertex_positions(vertices)
+    match = match_joints(positions, ik_set.get_joint_positions())
+    if match.is_unchanged(len(ik_set.joints)):
+        tracer.debug('%s: %s joints unchanged', mesh.name, len(ik_set.joints))
+        return False
+
+    with setup_mode:
+        for joint in match.deleted:
+            remove_joint(ik_set.joints[joint], ik_set.weight_containers[joint])
+        # moved joints get weight containers for their new vertices
+        moved = set(match.moved)
+        for vertex in moved:
+            remove_weight_container(ik_set.weight_containers[match.joints[vertex]])
+
+        joints: list[modo.Item] = []
+        weight_containers: list[Union[modo.Item, None]] = []
+        for vertex, joint in enumerate(match.joints):
+            if joint < 0:
+                joints.append(new_joint(f'{mesh.name}{JOINT_NAME_SUFFIX}'))
+                weight_containers.append(None)
+            else:
+                joints.append(ik_set.joints[joint])
+                weight_containers.append(None if vertex in moved else ik_set.weight_containers[joint])
+        set_chain(joints, positions, ik_set.group)
+
+        rebuilt = [i for i, weight_cont in enumerate(weight_containers) if not weight_cont]
+        if rebuilt:
+            new_weights = new_weight_containers([vertices[i] for i in rebuilt])
+            link_influences(new_weights, [joints[i] for i in rebuilt])
+            for i, weight_cont in zip(rebuilt, new_weights):
+                weight_containers[i] = weight_cont
+        align_joints(joints)
+        # joints added to or removed from the chain, or a new root or tip, need IK to be assigned again
+        # without stacking solvers
+        is_chain_end_changed = joints[0].id != ik_set.joints[0].id or joints[-1].id != ik_set.joints[-1].id
+        if match.created or match.deleted or is_chain_end_changed:
+            ik_set.remove_ik()
+            assign_ik(mesh, joints)
+
+    lxq.flush()
+    for i, weight_cont in enumerate(weight_containers):
+        weight_cont.setParent(ik_set.group, i)  # type: ignore
+    tracer.debug('%s: %s joints moved, %s created, %s deleted',
+                 mesh.name, len(match.moved), len(match.created), len(match.deleted))
+    return True
+
+
+def prepare_ik_setup(
+        mesh: modo.Item,
+        resampling: ChainResampling) -> tuple[list[modo.meshgeometry.MeshVertex], Union[IkSet, None]]:
+    vertices = mesh.geometry.vertices.selected
+    tracer.items(vertices, 'vertices:')
+    if not vertices:
+        tracer.debug('no vertices selected in mesh:<%s>', mesh.name)
+        return [], None
+    # checked before an existing IK set is changed
+    if len(vertices) < MIN_CHAIN_VERTICES:
+        print(f'IK setup skipped for mesh <{mesh.name}>. Select at least {MIN_CHAIN_VERTICES} vertices.')
+        return [], None
+    vertices = order_vertices(vertices)
+
+    # resampled and inconsistent IK sets are rebuilt
+    ik_set = IkSet.find(mesh)
+    if ik_set and (resampling.is_enabled or not ik_set.is_consistent()):
+        ik_set.remove()
+        ik_set = None
+    return vertices, ik_set
+
+
+def apply_ik_setup(
+        mesh: modo.Item,
+        vertices: list[modo.meshgeometry.MeshVertex],
+        ik_set: Union[IkSet, None],
+        resampling: ChainResampling) -> IkResult:
+    result = IkResult(mesh)
+    if not vertices:
+        return result
+    start = time.perf_counter()
+    result.joints = len(vertices)
+
+    # re-running on a mesh updates its IK set in place
+    if ik_set:
+        with tracer.span(mesh.name, 'update'):
+            result.status = STATUS_UPDATED if update_ik_setup(mesh, vertices, ik_set) else STATUS_UNCHANGED
+        result.group = ik_set.group
+        result.seconds = time.perf_counter() - start
+        return result
+
+    with setup_mode:
+        # Create locators
+        if resampling.is_enabled:
+            locators = new_resampled_chain(mesh, vertices, resampling)
+            weight_containers: list[modo.Item] = []
+        else:
+            locators, weight_containers = new_vertex_chain(mesh, vertices)
+        tracer.items(locators, 'locators:')
+        result.joints = len(locators)
+
+        # Align locators
+        align_joints(locators)
+
+        # Apply IK
+        assign_ik(mesh, locators)
 
     # group IK set
-    modo.Scene().deselect()
+    lxq.eval('select.drop item')
     for item in weight_containers:
-        item.select()
-    locators[0].select()
-    lx.eval('layer.groupSelected')
+        lxq.select(item, replace=False)
+    lxq.select(locators[0], replace=False)
+    lxq.eval('layer.groupSelected')
+    with tracer.span(mesh.name, 'ik'):
+        lxq.flush()
     group, = modo.Scene().selectedByType(itype=c.GROUPLOCATOR_TYPE)
-    group.name = f'{mesh.name}_IK_set'
+    group.name = f'{mesh.name}{IK_SET_NAME_SUFFIX}'
+    tracer.debug('%s: %s joints', mesh.name, len(locators))
+
+    result.status = STATUS_CREATED
+    result.group = group
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def make_ik_setup(mesh, resampling: Union[ChainResampling, None] = None) -> Union[modo.Item, None]:
+    resampling = resampling or ChainResampling()
+    vertices, ik_set = prepare_ik_setup(mesh, resampling)
+    return apply_ik_setup(mesh, vertices, ik_set, resampling).group
+
+
+def build_ik_setups(meshes: list[modo.Item], resampling: Union[ChainResampling, None] = None) -> list[IkResult]:
+    resampling = resampling or ChainResampling()
+    # read selections and existing IK sets before any chain is built
+    prepared = [(mesh, *prepare_ik_setup(mesh, resampling)) for mesh in meshes]
+    with setup_mode:
+        return [apply_ik_setup(mesh, vertices, ik_set, resampling) for mesh, vertices, ik_set in prepared]
+
+
+def get_resampling(args: Union[list[str], None]) -> ChainResampling:
+    joint_count = 0
+    max_segment_length = 0.0
+    for arg in args or []:
+        if arg.startswith(CMD_JOINT_COUNT):
+            joint_count = int(arg[len(CMD_JOINT_COUNT):])
+        elif arg.startswith(CMD_MAX_SEGMENT_LENGTH):
+            max_segment_length = float(arg[len(CMD_MAX_SEGMENT_LENGTH):])
+    return ChainResampling(joint_count, max_segment_length)
+
+
+def get_vertex_selection_meshes() -> list[modo.Item]:
+    # meshes owning selected vertices, read from the selection packets instead of testing every scene mesh
+    lxq.flush()
+    selection_service = lx.service.Selection()
+    vertex_type = selection_service.LookupType(lx.symbol.sSELTYP_VERTEX)
+    translation = lx.object.VertexPacketTranslation(selection_service.Allocate(lx.symbol.sSELTYP_VERTEX))
+    meshes: dict[str, modo.Item] = {}
+    for i in range(selection_service.Count(vertex_type)):
+        item = lx.object.Item(translation.Item(selection_service.ByIndex(vertex_type, i)))
+        if item.Ident() not in meshes:
+            meshes[item.Ident()] = modo.Mesh(item)
+    return list(meshes.values())
 
 
 def main():
     meshes = []
     meshes = modo.Scene().selectedByType(itype=c.MESH_TYPE)
-    h3dd.print_items(meshes, 'selected meshes:')
+    tracer.items(meshes, 'selected meshes:')
     if not meshes:
-        for mesh in modo.Scene().meshes:
-            if mesh.geometry.vertices.selected:  # type: ignore
-                meshes.append(mesh)
-        h3dd.print_items(meshes, 'selected vertices in meshes:')
+        meshes = get_vertex_selection_meshes()
+        tracer.items(meshes, 'selected vertices in meshes:')
 
     if not meshes:
         print('Please select any vertices to proceed')
         return
 
-    for mesh in meshes:
-        make_ik_setup(mesh)
+    args = lx.args()
+    for result in build_ik_setups(meshes, get_resampling(args)):
+        print(result)
+
+    if tracer.is_timing:
+        print(tracer.get_span_report())
+
+    if args and CMD_JOURNAL in args:
+        lxq.dump(replace_file_ext(modo.Scene().filename, JOURNAL_FILE_EXT))
 
 
 if __name__ == '__main__':
-    h3dd = H3dDebug(
-        enable=False, file=replace_file_ext(modo.Scene().filename, ".log")
-    )
-    main()
+    start_tracing(lx.args(), modo.Scene().filename)
+    try:
+        main()
+    finally:
+        tracer.stop()
@@ -0,0 +1,79 @@
+#!/usr/bin/python
+# ================================
+# (C)2024 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# modo python
+# session-scoped preset instantiation
+# the preset browser is opened once per session, presets are resolved once and item presets are cloned from templates
+
+from typing import Union
+
+import modo
+
+from h3d_cable_setup.scripts.command_queue import CommandQueue
+
+
+class PresetCache:
+    """Preset browser state and preset templates of one command run, sessions can be nested"""
+
+    def __init__(self, command_queue: CommandQueue) -> None:
+        self.command_queue = command_queue
+        self.depth = 0
+        self.preset_browser_opened = False
+        self.selected_path = ''
+        self.templates: dict[str, modo.Item] = {}
+        self.sessions = 0
+        self.resolved = 0
+        self.instantiated = 0
+        self.cloned = 0
+
+    def __enter__(self) -> 'PresetCache':
+        if not self.depth:
+            self.sessions += 1
+            self.preset_browser_opened = self.command_queue.is_preset_browser_opened()
+            if not self.preset_browser_opened:
+                self.command_queue.preset_browser(True)
+        self.depth += 1
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.depth -= 1
+        if self.depth:
+            return
+        # queued before the flush, a session without presets cancels its own browser toggle
+        self.command_queue.preset_browser(self.preset_browser_opened)
+        self.command_queue.flush()
+        for template in self.templates.values():
+            modo.Scene().removeItems(template)
+        self.templates = {}
+        self.selected_path = ''
+
+    def do(self, path: str) -> None:
+        # applies the preset to the current selection, mesh operations are added to the selected mesh
+        with self:
+            if path != self.selected_path:
+                self.command_queue.eval(f'select.filepath "{path}" set')
+                self.command_queue.eval(f'select.preset "{path}" mode:set')
+                self.selected_path = path
+                self.resolved += 1
+            self.command_queue.eval('preset.do')
+            self.instantiated += 1
+
+    def new_item(self, path: str, itype: str) -> modo.Item:
+        # standalone items are cloned from an unlinked template instantiated once per session
+        with self:
+            template: Union[modo.Item, None] = self.templates.get(path)
+            if not template:
+                self.do(path)
+                self.command_queue.flush()
+                template = modo.Scene().selectedByType(itype)[0]
+                self.templates[path] = template
+            self.cloned += 1
+            return modo.Scene().duplicateItem(template)
+
+    def get_report(self) -> str:
+        return (
+            f'presets: {self.sessions} preset browser sessions, {self.resolved} presets resolved, '
+            f'{self.instantiated} presets instantiated, {self.cloned} items cloned from templates'
+        )
@@ -0,0 +1,112 @@
+#!/usr/bin/python
+# ================================
+# (C)2024 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# python
+# per-stage call count, wall time and command count profiling
+
+import csv
+import functools
+import json
+import os
+import time
+from typing import Callable
+
+
+class StageStats:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.calls = 0
+        self.seconds = 0.0
+        self.commands = 0
+        self.evals = 0
+
+    def as_dict(self) -> dict:
+        return {
+            'stage': self.name,
+            'calls': self.calls,
+            'seconds': self.seconds,
+            'commands': self.commands,
+            'evals': self.evals,
+        }
+
+
+class StageProfiler:
+    """Collects stage statistics while enabled, stage calls pass through untouched otherwise"""
+
+    def __init__(self) -> None:
+        self.is_enabled = False
+        self.command_queue = None
+        self.stages: dict[str, StageStats] = {}
+
+    def start(self, command_queue) -> None:
+        # command_queue provides issued and executed command counters and flush()
+        self.command_queue = command_queue
+        self.stages = {}
+        self.is_enabled = True
+
+    def stop(self) -> None:
+        self.is_enabled = False
+
+    def stage(self, name: str) -> Callable:
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.is_enabled:
+                    return func(*args, **kwargs)
+                stats = self.stages.setdefault(name, StageStats(name))
+                # queued commands are executed at the stage boundaries and charged to the stage queuing them
+                self.flush()
+                issued, executed = self.get_command_counts()
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.flush()
+                    stats.seconds += time.perf_counter() - start
+                    stats.calls += 1
+                    issued_after, executed_after = self.get_command_counts()
+                    stats.commands += issued_after - issued
+                    stats.evals += executed_after - executed
+            return wrapper
+        return decorator
+
+    def flush(self) -> None:
+        if self.command_queue:
+            self.command_queue.flush()
+
+    def get_command_counts(self) -> tuple[int, int]:
+        if not self.command_queue:
+            return 0, 0
+        return self.command_queue.issued, self.command_queue.executed
+
+    def get_report(self) -> str:
+        lines = [f'{"stage":<36}{"calls":>8}{"seconds":>12}{"commands":>10}{"lx.eval":>10}']
+        for stats in self.stages.values():
+            lines.append(
+                f'{stats.name:<36}{stats.calls:>8}{stats.seconds:>12.4f}{stats.commands:>10}{stats.evals:>10}'
+            )
+        return '\n'.join(lines)
+
+    def write_json(self, filename: str, scene: str) -> None:
+        with open(filename, 'w') as file:
+            json.dump({
+                'scene': scene,
+                'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'stages': [stats.as_dict() for stats in self.stages.values()],
+            }, file, indent=4)
+
+    def write_csv(self, filename: str, scene: str) -> None:
+        # rows are appended to track trends across runs and scene versions
+        is_new_file = not os.path.exists(filename)
+        timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
+        with open(filename, 'a', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=['time', 'scene', 'stage', 'calls', 'seconds', 'commands', 'evals'])
+            if is_new_file:
+                writer.writeheader()
+            for stats in self.stages.values():
+                writer.writerow({'time': timestamp, 'scene': scene, **stats.as_dict()})
+
+
+profiler = StageProfiler()
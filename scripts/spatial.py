@@ -0,0 +1,85 @@
+#!/usr/bin/python
+# ================================
+# (C)2024 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# python
+# k-d tree for nearest point queries
+# no modo dependencies
+
+import math
+from typing import Sequence
+
+
+class KdTree:
+    """Balanced 3d k-d tree, points can be removed to exclude them from later queries"""
+
+    def __init__(self, points: Sequence[Sequence[float]]) -> None:
+        self.points: list[tuple[float, float, float]] = [tuple(float(value) for value in point) for point in points]
+        self.removed: list[bool] = [False] * len(self.points)
+        # node arrays, one node per point
+        self.indices: list[int] = []
+        self.axes: list[int] = []
+        self.lefts: list[int] = []
+        self.rights: list[int] = []
+        self.parents: list[int] = []
+        # points left in the node subtree
+        self.counts: list[int] = []
+        self.point_nodes: list[int] = [-1] * len(self.points)
+        self.root = self.build(list(range(len(self.points))), 0, -1)
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def build(self, indices: list[int], depth: int, parent: int) -> int:
+        if not indices:
+            return -1
+        axis = depth % 3
+        indices.sort(key=lambda index: self.points[index][axis])
+        median = len(indices) // 2
+        node = len(self.indices)
+        self.indices.append(indices[median])
+        self.axes.append(axis)
+        self.lefts.append(-1)
+        self.rights.append(-1)
+        self.parents.append(parent)
+        self.counts.append(len(indices))
+        self.point_nodes[indices[median]] = node
+        self.lefts[node] = self.build(indices[:median], depth + 1, node)
+        self.rights[node] = self.build(indices[median + 1:], depth + 1, node)
+        return node
+
+    def remove(self, index: int) -> None:
+        if self.removed[index]:
+            return
+        self.removed[index] = True
+        node = self.point_nodes[index]
+        while node >= 0:
+            self.counts[node] -= 1
+            node = self.parents[node]
+
+    def nearest(self, point: Sequence[float], max_distance: float = math.inf) -> tuple[int, float]:
+        # returns point index and distance, -1 when no point found within max_distance
+        best_index = -1
+        best = max_distance * max_distance
+        x, y, z = point
+        stack: list[tuple[int, float]] = [(self.root, 0.0)] if self.root >= 0 else []
+        while stack:
+            node, plane_distance = stack.pop()
+            if node < 0 or self.counts[node] == 0 or plane_distance > best:
+                continue
+            index = self.indices[node]
+            px, py, pz = self.points[index]
+            if not self.removed[index]:
+                distance = (px - x) ** 2 + (py - y) ** 2 + (pz - z) ** 2
+                if distance <= best:
+                    best = distance
+                    best_index = index
+            axis = self.axes[node]
+            delta = point[axis] - self.points[index][axis]
+            near, far = (self.lefts[node], self.rights[node]) if delta < 0 else (self.rights[node], self.lefts[node])
+            stack.append((far, delta * delta))
+            stack.append((near, 0.0))
+        if best_index < 0:
+            return -1, math.inf
+        return best_index, math.sqrt(best)
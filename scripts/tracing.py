@@ -0,0 +1,115 @@
+#!/usr/bin/python
+# ================================
+# (C)2024 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# python
+# level-gated tracing with lazy formatting and background file writer
+
+import logging
+import logging.handlers
+import queue
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Union
+
+from h3d_utilites.scripts.h3d_utils import replace_file_ext
+
+
+LOGGER_NAME = 'h3d_cable_setup'
+LOG_FORMAT = '%(asctime)s %(levelname)s %(module)s.%(funcName)s: %(message)s'
+LOG_FILE_EXT = '.log'
+
+CMD_DEBUG = 'debug'
+CMD_TIMING = 'timing'
+
+
+class ItemNames:
+    """Formats item names only when the record is actually written"""
+
+    def __init__(self, items: Iterable) -> None:
+        self.items = items
+
+    def __str__(self) -> str:
+        return ', '.join(str(getattr(item, 'name', item)) for item in self.items)
+
+
+class Tracer:
+    def __init__(self, name: str) -> None:
+        self.logger = logging.getLogger(name)
+        self.logger.setLevel(logging.WARNING)
+        self.logger.propagate = False
+        self.listener: Union[logging.handlers.QueueListener, None] = None
+        self.is_timing = False
+        self.spans: dict[str, dict[str, float]] = {}
+
+    def start(self, file: str, level: int = logging.DEBUG, is_timing: bool = False) -> None:
+        # records are queued by the caller and written to file by a background thread
+        self.stop()
+        records: queue.SimpleQueue = queue.SimpleQueue()
+        file_handler = logging.FileHandler(file, delay=True)
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        self.listener = logging.handlers.QueueListener(records, file_handler)
+        self.logger.addHandler(logging.handlers.QueueHandler(records))
+        self.logger.setLevel(level)
+        self.is_timing = is_timing
+        self.listener.start()
+
+    def stop(self) -> None:
+        for handler in list(self.logger.handlers):
+            self.logger.removeHandler(handler)
+        if self.listener:
+            self.listener.stop()
+            for handler in self.listener.handlers:
+                handler.close()
+            self.listener = None
+        self.logger.setLevel(logging.WARNING)
+        self.is_timing = False
+        self.spans = {}
+
+    @property
+    def is_debug(self) -> bool:
+        return self.logger.isEnabledFor(logging.DEBUG)
+
+    def debug(self, message: str, *args) -> None:
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(message, *args, stacklevel=2)
+
+    def items(self, items: Iterable, title: str) -> None:
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug('%s %s', title, ItemNames(items), stacklevel=2)
+
+    @contextmanager
+    def span(self, owner: str, phase: str) -> Iterator[None]:
+        # records phase duration per owner, e.g. per cable or chain
+        if not self.is_timing:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            phases = self.spans.setdefault(owner, {})
+            phases[phase] = phases.get(phase, 0.0) + duration
+            self.logger.info('%s %s: %.6f s', owner, phase, duration)
+
+    def get_span_report(self) -> str:
+        return '\n'.join(
+            f'{owner}: ' + ', '.join(f'{phase} {duration:.3f} s' for phase, duration in phases.items())
+            for owner, phases in self.spans.items()
+        )
+
+
+tracer = Tracer(LOGGER_NAME)
+
+
+def start_tracing(args: Union[list[str], None], scene_filename: str) -> None:
+    # the log is written next to the scene file
+    if not args or (CMD_DEBUG not in args and CMD_TIMING not in args):
+        return
+    tracer.start(
+        file=replace_file_ext(scene_filename, LOG_FILE_EXT),
+        level=logging.DEBUG if CMD_DEBUG in args else logging.INFO,
+        is_timing=CMD_TIMING in args,
+    )
@@ -0,0 +1,85 @@
+#!/usr/bin/python
+# ================================
+# (C)2024 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# python
+# chain order of selected vertices
+# walks the edges between selected vertices, nearest neighbor order when they don't form a single path
+# no modo dependencies
+
+from typing import Sequence
+
+from h3d_cable_setup.scripts.spatial import KdTree
+
+
+ORDER_SELECTION = 'selection'
+ORDER_PATH = 'path'
+ORDER_LOOP = 'loop'
+ORDER_NEAREST = 'nearest'
+
+
+def get_adjacency(neighbors: Sequence[Sequence[int]]) -> list[list[int]]:
+    # symmetric, sorted and without self references
+    adjacency: list[set[int]] = [set() for _ in neighbors]
+    for vertex, vertex_neighbors in enumerate(neighbors):
+        for neighbor in vertex_neighbors:
+            if neighbor != vertex:
+                adjacency[vertex].add(neighbor)
+                adjacency[neighbor].add(vertex)
+    return [sorted(vertex_neighbors) for vertex_neighbors in adjacency]
+
+
+def walk_path(adjacency: list[list[int]], start: int) -> list[int]:
+    # expects every vertex to have at most two neighbors
+    order = [start]
+    previous = -1
+    current = start
+    while True:
+        following = [neighbor for neighbor in adjacency[current] if neighbor != previous]
+        if not following or following[0] == start:
+            return order
+        previous, current = current, following[0]
+        order.append(current)
+
+
+def get_path_order(adjacency: list[list[int]]) -> tuple[list[int], str]:
+    # returns an empty order when selected vertices don't form a single open or closed path
+    if any(len(vertex_neighbors) > 2 for vertex_neighbors in adjacency):
+        return [], ''
+    ends = [vertex for vertex, vertex_neighbors in enumerate(adjacency) if len(vertex_neighbors) == 1]
+    if ends:
+        order, method = walk_path(adjacency, ends[0]), ORDER_PATH
+    else:
+        order, method = walk_path(adjacency, 0), ORDER_LOOP
+    if len(order) != len(adjacency):
+        return [], ''
+    return order, method
+
+
+def get_nearest_order(positions: Sequence[Sequence[float]]) -> list[int]:
+    # starts from the vertex farthest from the centroid, a chain end for elongated selections
+    count = len(positions)
+    center = [sum(position[axis] for position in positions) / count for axis in range(3)]
+    start = max(range(count), key=lambda vertex: sum((positions[vertex][axis] - center[axis]) ** 2 for axis in range(3)))
+    tree = KdTree(positions)
+    tree.remove(start)
+    order = [start]
+    for _ in range(count - 1):
+        vertex, _ = tree.nearest(positions[order[-1]])
+        tree.remove(vertex)
+        order.append(vertex)
+    return order
+
+
+def get_chain_order(positions: Sequence[Sequence[float]], neighbors: Sequence[Sequence[int]]) -> tuple[list[int], str]:
+    # positions and neighbors are indexed by selection order, neighbors refer to selected vertices only
+    if len(positions) != len(neighbors):
+        raise ValueError(f'{len(positions)=} {len(neighbors)=}')
+    if len(positions) < 3:
+        return list(range(len(positions))), ORDER_SELECTION
+
+    order, method = get_path_order(get_adjacency(neighbors))
+    if order:
+        return order, method
+    return get_nearest_order(positions), ORDER_NEAREST
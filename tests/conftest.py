@@ -0,0 +1,20 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'fakes'))
+
+import fake_kit  # noqa: E402
+
+fake_kit.install()
+
+
+@pytest.fixture
+def scene():
+    # empty fake scene with cleared command queues for every modo dependent test
+    import modo
+
+    fake_kit.reset()
+    yield modo.Scene()
+    fake_kit.reset()
@@ -0,0 +1,69 @@
+#!/usr/bin/python
+# ================================
+# (C)2024 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# python
+# runs the kit outside modo with the fake lx, modo and h3d_utilites modules
+# usage:
+# - import fake_kit; fake_kit.install() before importing h3d_cable_setup.scripts modules
+
+import os
+import sys
+import types
+
+
+KIT_NAME = 'h3d_cable_setup'
+FAKES_FOLDER = os.path.dirname(os.path.abspath(__file__))
+KIT_FOLDER = os.path.dirname(os.path.dirname(FAKES_FOLDER))
+
+
+def install() -> None:
+    # the kit folder is imported as the h3d_cable_setup package, the way modo imports installed kits
+    if FAKES_FOLDER not in sys.path:
+        sys.path.insert(0, FAKES_FOLDER)
+    if KIT_NAME not in sys.modules:
+        kit = types.ModuleType(KIT_NAME)
+        kit.__path__ = [KIT_FOLDER]
+        sys.modules[KIT_NAME] = kit
+
+
+def reset() -> None:
+    # empty scene, cleared command queues and preset browser state
+    import lx
+    import modo
+    from h3d_utilites.scripts import h3d_utils
+
+    lx.reset()
+    h3d_utils.reset()
+    modo.new_scene()
+    for name in ('cable_setup', 'ik_setup_by_selected_vertices'):
+        module = sys.modules.get(f'{KIT_NAME}.scripts.{name}')
+        if not module:
+            continue
+        module.lxq.__init__()
+        if presets := getattr(module, 'presets', None):
+            presets.__init__(module.lxq)
+
+
+def new_curve(scene, name: str, points: int = 8, step: float = 0.1, offset=(0.0, 0.0, 0.0)):
+    # mesh with a single open curve polygon along z
+    curve = scene.addMesh(name)
+    with curve.geometry as geometry:
+        vertices = [
+            geometry.vertices.new((offset[0], offset[1], offset[2] + i * step)) for i in range(points)
+        ]
+        geometry.polygons.new(vertices, ptype='CURV')
+    return curve
+
+
+def new_chain(scene, name: str, count: int, step: float = 0.1, is_selected: bool = True):
+    # vertices along y joined by edges, selected in reverse order
+    mesh = scene.addMesh(name)
+    with mesh.geometry as geometry:
+        vertices = [geometry.vertices.new((0.0, i * step, 0.0)) for i in range(count)]
+        for first, second in zip(vertices, vertices[1:]):
+            geometry.polygons.new((first, second), ptype='LINE')
+    if is_selected:
+        mesh.geometry.vertices.select(list(reversed(list(mesh.geometry.vertices))), replace=False)
+    return mesh
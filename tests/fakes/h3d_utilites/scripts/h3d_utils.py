@@ -0,0 +1,35 @@
+#!/usr/bin/python
+# ================================
+# (C)2024 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# python
+# fake h3d_utilites.scripts.h3d_utils, the helpers used by the kit scripts
+
+import os
+
+
+# preset browser panel state and the number of times it was shown or hidden
+preset_browser_opened = False
+preset_browser_toggles = 0
+
+
+def replace_file_ext(filename: str, ext: str) -> str:
+    return os.path.splitext(filename)[0] + ext
+
+
+def is_preset_browser_opened() -> bool:
+    return preset_browser_opened
+
+
+def display_preset_browser(opened: bool) -> None:
+    global preset_browser_opened, preset_browser_toggles
+    if opened != preset_browser_opened:
+        preset_browser_toggles += 1
+    preset_browser_opened = opened
+
+
+def reset() -> None:
+    global preset_browser_opened, preset_browser_toggles
+    preset_browser_opened = False
+    preset_browser_toggles = 0
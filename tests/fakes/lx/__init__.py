@@ -0,0 +1,93 @@
+#!/usr/bin/python
+# ================================
+# (C)2024 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# python
+# fake lx module, lx.eval runs kit commands against the current fake modo scene
+# every command string is recorded, latency emulates the cost of a real lx.eval call
+# usage:
+# - tests/fakes on sys.path, see tests/fakes/fake_kit.py
+
+import time
+from typing import Union
+
+from lx import commands
+
+
+# seconds added to every lx.eval call
+latency = 0.0
+# command strings in call order
+history: list[str] = []
+# script arguments returned by lx.args()
+arguments: list[str] = []
+# modo_cl sessions run headless
+headless = False
+
+
+def eval(command: str):
+    history.append(command)
+    if latency:
+        time.sleep(latency)
+    return commands.execute(command)
+
+
+def args() -> Union[list[str], None]:
+    return list(arguments) or None
+
+
+def reset() -> None:
+    global latency, headless
+    latency = 0.0
+    headless = False
+    history.clear()
+    arguments.clear()
+
+
+class symbol:
+    i_VMAP_PICK = 'PICK'
+    i_VMAP_WEIGHT = 'WGHT'
+    iMARK_ANY = 0
+    sSELTYP_VERTEX = 'vertex'
+
+
+class service:
+    class Selection:
+        def LookupType(self, name: str) -> str:
+            return name
+
+        def Allocate(self, name: str) -> str:
+            return name
+
+        def Count(self, selection_type: str) -> int:
+            return len(self.get_packets(selection_type))
+
+        def ByIndex(self, selection_type: str, index: int):
+            return self.get_packets(selection_type)[index]
+
+        @staticmethod
+        def get_packets(selection_type: str) -> list:
+            import modo
+            if selection_type != symbol.sSELTYP_VERTEX:
+                return []
+            return modo.Scene().get_selected_vertices()
+
+    class Platform:
+        def IsHeadless(self) -> bool:
+            return headless
+
+
+class object:
+    class Item:
+        def __init__(self, item) -> None:
+            self.item = item
+
+        def Ident(self) -> str:
+            return self.item.id
+
+    class VertexPacketTranslation:
+        def __init__(self, selection_type) -> None:
+            self.selection_type = selection_type
+
+        def Item(self, packet):
+            return packet.geometry.mesh
@@ -0,0 +1,263 @@
+#!/usr/bin/python
+# ================================
+# (C)2024 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# python
+# command interpreter of the fake lx.eval, covers the commands issued by the kit scripts
+
+import shlex
+from typing import Callable
+
+import modo
+from modo.constants import GROUPLOCATOR_TYPE, LOCATOR_TYPE, MESH_TYPE, WEIGHTCONTAINER_TYPE
+
+
+PRESET_FILE_EXT = '.itemtype'
+# item presets attached to the selected mesh
+MESH_OPERATIONS_FOLDER = 'MeshOperations'
+DEFORMERS_GRAPH = 'deformers'
+# item.link genInfluence links the second item into the deformers of the first
+GEN_INFLUENCE_LINK = 'genInfluence'
+IK_SOLVER_TYPE = 'ikFullBody'
+IK_GRAPH = 'ikfb'
+
+CHANNEL_DEFAULTS = {
+    'integer': 0,
+    'percent': 0.0,
+    'distance': 0.0,
+    'float': 0.0,
+    'boolean': False,
+    'string': '',
+}
+
+
+class CommandArgs:
+    """Positional and name:value arguments of a command string"""
+
+    def __init__(self, tokens: list[str]) -> None:
+        self.positional: list[str] = []
+        self.named: dict[str, str] = {}
+        for token in tokens:
+            name, separator, value = token.partition(':')
+            # {item:channel} references and file paths are positional
+            if separator and name.isidentifier() and not value.startswith(('/', '\\')):
+                self.named[name] = value
+            else:
+                self.positional.append(token)
+
+    def __getitem__(self, index: int) -> str:
+        return self.positional[index]
+
+    def get(self, index: int, default: str = '') -> str:
+        return self.positional[index] if index < len(self.positional) else default
+
+    def is_true(self, name: str, default: bool = False) -> bool:
+        if name not in self.named:
+            return default
+        return self.named[name].lower() in ('true', '1', 'on')
+
+
+def get_channel(scene: modo.Scene, reference: str) -> modo.Channel:
+    # {item id:channel name}
+    item_id, _, name = reference.strip('{}').rpartition(':')
+    channel = scene.item(item_id).channel(name)
+    if not channel:
+        raise RuntimeError(f'no channel {reference}')
+    return channel
+
+
+def select_new_item(scene: modo.Scene, item: modo.Item) -> None:
+    # a new item replaces selected items of its type, other selected items stay selected
+    scene.deselect([selected for selected in scene.selected if selected.type == item.type])
+    scene.select(item, add=True)
+
+
+def select_item(scene: modo.Scene, args: CommandArgs) -> None:
+    scene.select(scene.item(args[0]), add=args.get(1, 'set') == 'add')
+
+
+def select_drop(scene: modo.Scene, args: CommandArgs) -> None:
+    if args[0] == 'item':
+        scene.deselect()
+    elif args[0] == 'vertex':
+        scene.drop_vertex_selection()
+
+
+def select_type(scene: modo.Scene, args: CommandArgs) -> None:
+    scene.selection_type = args[0]
+
+
+def select_use_set(scene: modo.Scene, args: CommandArgs) -> None:
+    # vertices of the selection set in the selected meshes
+    for mesh in scene.selectedByType(MESH_TYPE):
+        for pick_map in mesh.geometry.vmaps.getMapsByName(args[0]):
+            scene.select_vertices(mesh.geometry, list(pick_map.values), replace=False)
+
+
+def select_preset(scene: modo.Scene, args: CommandArgs) -> None:
+    scene.preset_path = args[0]
+
+
+def preset_do(scene: modo.Scene, args: CommandArgs) -> None:
+    # [itemtypes]:MeshOperations/curve/curve.sweep.itemtype, [itemtypes]:.../cmMathBasic(mul).itemtype
+    if not scene.preset_path.endswith(PRESET_FILE_EXT):
+        raise RuntimeError(f'no item preset selected: {scene.preset_path}')
+    itype = scene.preset_path.rsplit('/', 1)[-1][:-len(PRESET_FILE_EXT)]
+    itype, _, variant = itype.partition('(')
+    meshes = scene.selectedByType(MESH_TYPE)
+    item = scene.new_item(itype)
+    if variant:
+        item.channel_values['operation'] = variant.rstrip(')')
+    if MESH_OPERATIONS_FOLDER in scene.preset_path and meshes:
+        scene.link_items(DEFORMERS_GRAPH, item, meshes[0])
+    select_new_item(scene, item)
+
+
+def layer_new(scene: modo.Scene, args: CommandArgs) -> None:
+    scene.select(scene.new_item(MESH_TYPE, 'Mesh'))
+
+
+def item_editor_color(scene: modo.Scene, args: CommandArgs) -> None:
+    for item in scene.selected:
+        item.editor_color = args[0]
+
+
+def channel_create(scene: modo.Scene, args: CommandArgs) -> None:
+    if not scene.selected:
+        raise RuntimeError('channel.create: no item selected')
+    if args[1] not in CHANNEL_DEFAULTS:
+        raise RuntimeError(f'channel.create: unknown channel type {args[1]}')
+    for item in scene.selected:
+        item.channel_values.setdefault(args[0], CHANNEL_DEFAULTS[args[1]])
+
+
+def channel_link(scene: modo.Scene, args: CommandArgs) -> None:
+    source = get_channel(scene, args[1])
+    target = get_channel(scene, args[2])
+    if args[0] == 'add':
+        scene.link_channels(source, target)
+    elif args[0] == 'replace':
+        scene.link_channels(source, target, replace=True)
+    elif args[0] == 'remove':
+        scene.unlink_channels(source, target)
+    else:
+        raise RuntimeError(f'channel.link: unknown mode {args[0]}')
+
+
+def item_link(scene: modo.Scene, args: CommandArgs) -> None:
+    # replace drops the existing links of the second item
+    first = scene.item(args[1])
+    second = scene.item(args[2])
+    is_replace = args.is_true('replace')
+    if args[0] == GEN_INFLUENCE_LINK:
+        if is_replace:
+            for linked in second.itemGraph(DEFORMERS_GRAPH).forward():
+                scene.unlink_items(DEFORMERS_GRAPH, second, linked)
+        scene.link_items(DEFORMERS_GRAPH, second, first)
+        return
+    scene.link_items(args[0].lstrip('$'), first, second, replace=is_replace)
+
+
+def item_duplicate(scene: modo.Scene, args: CommandArgs) -> None:
+    # item.duplicate instance type copyChildren copyMeshOperations, mesh operations are duplicated with the mesh
+    is_mesh_operations = args.get(3, 'false') == 'true'
+    duplicates = []
+    for item in scene.selected:
+        duplicate = scene.duplicateItem(item)
+        if is_mesh_operations:
+            for deformer in item.itemGraph(DEFORMERS_GRAPH).reverse():
+                scene.link_items(DEFORMERS_GRAPH, scene.duplicateItem(deformer), duplicate)
+        duplicates.append(duplicate)
+    scene.select(duplicates)
+
+
+def anim_setup(scene: modo.Scene, args: CommandArgs) -> None:
+    scene.is_setup_mode = args[0] == 'on'
+
+
+def weight_container_create(scene: modo.Scene, args: CommandArgs) -> None:
+    vertices = scene.get_selected_vertices()
+    if not vertices:
+        raise RuntimeError('weightCont.create: no vertices selected')
+    weight_container = scene.new_item(WEIGHTCONTAINER_TYPE, 'Weight Container')
+    weight_container.position.set(
+        [sum(vertex.position[axis] for vertex in vertices) / len(vertices) for axis in range(3)]
+    )
+    select_new_item(scene, weight_container)
+
+
+def item_align(scene: modo.Scene, args: CommandArgs) -> None:
+    # orientation is not evaluated by the fake scene
+    ...
+
+
+def layer_group_selected(scene: modo.Scene, args: CommandArgs) -> None:
+    group = scene.new_item(GROUPLOCATOR_TYPE, 'Group')
+    for item in scene.selected:
+        item.setParent(group)
+    scene.select(group)
+
+
+def ik_assign(scene: modo.Scene, args: CommandArgs) -> None:
+    joints = scene.selectedByType(LOCATOR_TYPE)
+    if len(joints) < 2:
+        raise RuntimeError('ikfb.assign: select root and tip joints')
+    solver = scene.new_item(IK_SOLVER_TYPE, 'Full-Body IK')
+    scene.link_items(IK_GRAPH, solver, joints[0])
+    scene.link_items(IK_GRAPH, solver, joints[-1])
+
+
+def ik_goal(scene: modo.Scene, args: CommandArgs) -> None:
+    joints = scene.selectedByType(LOCATOR_TYPE)
+    if not joints:
+        raise RuntimeError('ikfb.goal: select tip joint')
+    goal = scene.new_item(LOCATOR_TYPE, f'{joints[-1].name} Goal')
+    scene.link_items(IK_GRAPH, goal, joints[-1])
+
+
+def scene_open(scene: modo.Scene, args: CommandArgs) -> None:
+    modo.open_scene(args[0])
+
+
+def scene_save(scene: modo.Scene, args: CommandArgs) -> None:
+    scene.save(args.get(0) or None)
+
+
+def scene_close(scene: modo.Scene, args: CommandArgs) -> None:
+    modo.new_scene()
+
+
+COMMANDS: dict[str, Callable[[modo.Scene, CommandArgs], None]] = {
+    'select.item': select_item,
+    'select.drop': select_drop,
+    'select.type': select_type,
+    'select.typeFrom': select_type,
+    'select.useSet': select_use_set,
+    'select.filepath': lambda scene, args: None,
+    'select.preset': select_preset,
+    'preset.do': preset_do,
+    'layer.new': layer_new,
+    'item.editorColor': item_editor_color,
+    'channel.create': channel_create,
+    'channel.link': channel_link,
+    'item.link': item_link,
+    'item.duplicate': item_duplicate,
+    'anim.setup': anim_setup,
+    'weightCont.create': weight_container_create,
+    'item.align': item_align,
+    'layer.groupSelected': layer_group_selected,
+    'ikfb.assign': ik_assign,
+    'ikfb.goal': ik_goal,
+    'scene.open': scene_open,
+    'scene.save': scene_save,
+    'scene.close': scene_close,
+}
+
+
+def execute(command: str) -> None:
+    name, *tokens = shlex.split(command)
+    handler = COMMANDS.get(name.lstrip('!'))
+    if not handler:
+        raise RuntimeError(f'unknown command: {command}')
+    handler(modo.Scene(), CommandArgs(tokens))
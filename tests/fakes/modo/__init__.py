@@ -0,0 +1,511 @@
+#!/usr/bin/python
+# ================================
+# (C)2024 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# python
+# fake modo module, runs the kit scripts without modo
+# items, item graphs, channels, channel links and selection live in memory
+# lx.eval commands used by the kit are executed against the current scene by lx.commands
+# usage:
+# - tests/fakes on sys.path, see tests/fakes/fake_kit.py
+
+import json
+import os
+from typing import Iterable, Union
+
+from modo import constants, meshgeometry
+from modo.constants import CAMERA_TYPE, MESH_TYPE
+
+
+# built-in channels and their default values per item type
+ITEM_CHANNELS: dict[str, dict] = {
+    'locator': {'size': 1.0},
+    'curve.sweep': {'extrudeShape': 'profile', 'useSize': True, 'size': 1.0, 'steps': 24, 'flip': False},
+    'prim.cylinder.item': {
+        'cenX': 0.0, 'cenY': 0.0, 'cenZ': 0.0, 'sizeX': 0.5, 'sizeY': 0.5, 'sizeZ': 0.5,
+        'segments': 1, 'sides': 24, 'polType': 'face',
+    },
+    'poly.setType.meshop.item': {'type': 0},
+    'pmodel.materialTag.item': {'materialName': ''},
+    'cmMathBasic': {'operation': 'add', 'input1': 0.0, 'input2': 0.0, 'output': 0.0},
+    'cmLinearBlend': {'input1': 0.0, 'input2': 0.0, 'blend': 0.0, 'output': 0.0},
+    'genInfluence': {'mapName': '', 'enable': True},
+}
+WORLD_MATRIX_CHANNEL = 'worldMatrix'
+
+
+class Matrix4:
+    def __init__(self, matrix=None) -> None:
+        if matrix is None:
+            matrix = [[1.0 if row == column else 0.0 for column in range(4)] for row in range(4)]
+        self.matrix = [list(row) for row in matrix]
+
+    @property
+    def position(self) -> tuple[float, float, float]:
+        return tuple(self.matrix[3][:3])
+
+
+class Channel:
+    def __init__(self, item: 'Item', name: str) -> None:
+        self.item = item
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f'Channel({self.item.id}:{self.name})'
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Channel) and (other.item.id, other.name) == (self.item.id, self.name)
+
+    def __hash__(self) -> int:
+        return hash((self.item.id, self.name))
+
+    def get(self, time=None):
+        if self.name == WORLD_MATRIX_CHANNEL:
+            return self.item.get_world_matrix()
+        return self.item.channel_values[self.name]
+
+    def set(self, value, time=None, key=False) -> None:
+        if self.name == WORLD_MATRIX_CHANNEL:
+            raise RuntimeError(f'{self.item.id}:{self.name} is read only')
+        self.item.channel_values[self.name] = value
+        self.item.scene.channel_writes.append((self.item.id, self.name, value))
+
+    @property
+    def revLinked(self) -> list['Channel']:
+        return self.item.scene.get_channel_links(self, reverse=True)
+
+    @property
+    def fwdLinked(self) -> list['Channel']:
+        return self.item.scene.get_channel_links(self, reverse=False)
+
+
+class Transform:
+    def __init__(self) -> None:
+        self.values = (0.0, 0.0, 0.0)
+
+    def get(self, time=None) -> tuple[float, float, float]:
+        return self.values
+
+    def set(self, values, time=None, key=False) -> None:
+        self.values = tuple(float(value) for value in values)
+
+
+class ItemGraph:
+    def __init__(self, item: 'Item', graph: str) -> None:
+        self.item = item
+        self.graph = graph
+
+    def forward(self, index: Union[int, None] = None):
+        items = self.item.scene.get_graph_links(self.graph, self.item, reverse=False)
+        return items if index is None else items[index]
+
+    def reverse(self, index: Union[int, None] = None):
+        items = self.item.scene.get_graph_links(self.graph, self.item, reverse=True)
+        return items if index is None else items[index]
+
+
+class Item:
+    def __init__(self, scene: 'Scene', itype: str, name: str, item_id: str) -> None:
+        self.scene = scene
+        self.type = itype
+        self.id = item_id
+        self._name = name
+        self.channel_values: dict = dict(ITEM_CHANNELS.get(itype, {}))
+        self.parent: Union['Item', None] = None
+        self.child_items: list['Item'] = []
+        self.position = Transform()
+        self.rotation = Transform()
+        self.editor_color = ''
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.id}, {self._name})'
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Item) and other.id == self.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, value: str) -> None:
+        self.scene.rename(self, value)
+
+    def Ident(self) -> str:
+        return self.id
+
+    def channel(self, name: str) -> Union[Channel, None]:
+        if name == WORLD_MATRIX_CHANNEL or name in self.channel_values:
+            return Channel(self, name)
+        return None
+
+    def channelNames(self) -> list[str]:
+        return list(self.channel_values)
+
+    def itemGraph(self, graph: str) -> ItemGraph:
+        return ItemGraph(self, graph)
+
+    def children(self, recursive: bool = False, itemType: Union[str, None] = None) -> list['Item']:
+        # depth first, joint chains are deeper than the recursion limit
+        children: list[Item] = []
+        stack = list(reversed(self.child_items))
+        while stack:
+            child = stack.pop()
+            if itemType is None or child.type == itemType:
+                children.append(child)
+            if recursive:
+                stack.extend(reversed(child.child_items))
+        return children
+
+    def setParent(self, newParent: Union['Item', None] = None, index: Union[int, None] = None) -> None:
+        if self.parent:
+            self.parent.child_items.remove(self)
+        self.parent = newParent
+        if newParent:
+            if index is None or index >= len(newParent.child_items):
+                newParent.child_items.append(self)
+            else:
+                newParent.child_items.insert(index, self)
+
+    def get_world_matrix(self) -> list[list[float]]:
+        # translation only, rotation and scale are not evaluated
+        position = [0.0, 0.0, 0.0]
+        item: Union[Item, None] = self
+        while item:
+            position = [total + offset for total, offset in zip(position, item.position.get())]
+            item = item.parent
+        matrix = Matrix4().matrix
+        matrix[3][:3] = position
+        return matrix
+
+
+class Mesh(Item):
+    def __new__(cls, item=None, *args, **kwargs):
+        # modo.Mesh(item) wraps an existing mesh item or an lx.object.Item of a mesh
+        if isinstance(item, Mesh):
+            return item
+        if item is not None:
+            return Scene().item(item.Ident())
+        return super().__new__(cls)
+
+    def __init__(self, item=None, *args, **kwargs) -> None:
+        if item is not None:
+            return
+        super().__init__(*args, **kwargs)
+        self.geometry = meshgeometry.MeshGeometry(self)
+
+
+class Scene:
+    """Current fake scene, modo.Scene() returns the scene made current by new_scene or scene.open"""
+
+    current: Union['Scene', None] = None
+
+    def __new__(cls):
+        if not cls.current:
+            new_scene()
+        return cls.current
+
+    def reset(self, filename: str = '') -> None:
+        self.filename = filename
+        self.item_map: dict[str, Item] = {}
+        self.name_map: dict[str, list[Item]] = {}
+        self.item_counts: dict[str, int] = {}
+        self.selection: dict[str, Item] = {}
+        # meshes with selected vertices
+        self.vertex_selection: dict[str, Item] = {}
+        self.selection_type = 'item'
+        # graph: forward and reverse links by item id
+        self.graph_links: dict[str, tuple[dict[str, list[str]], dict[str, list[str]]]] = {}
+        # (item id, channel name): linked channels
+        self.channel_links_forward: dict[tuple[str, str], list[tuple[str, str]]] = {}
+        self.channel_links_reverse: dict[tuple[str, str], list[tuple[str, str]]] = {}
+        self.channel_writes: list[tuple[str, str, object]] = []
+        self.item_link_count = 0
+        self.channel_link_count = 0
+        self.is_setup_mode = False
+        self.preset_path = ''
+        self.saved = 0
+
+    # items
+
+    def new_item(self, itype: str, name: Union[str, None] = None, item_id: Union[str, None] = None) -> Item:
+        if not item_id:
+            count = self.item_counts.get(itype, 0) + 1
+            self.item_counts[itype] = count
+            item_id = f'{itype}{count:03d}'
+            while item_id in self.item_map:
+                count += 1
+                self.item_counts[itype] = count
+                item_id = f'{itype}{count:03d}'
+        if item_id in self.item_map:
+            raise ValueError(f'{item_id=}')
+        name = name or itype
+        if itype == MESH_TYPE:
+            item: Item = Mesh(None, self, itype, name, item_id)
+        else:
+            item = Item(self, itype, name, item_id)
+        self.item_map[item_id] = item
+        self.name_map.setdefault(name, []).append(item)
+        return item
+
+    def rename(self, item: Item, name: str) -> None:
+        items = self.name_map.get(item.name, [])
+        if item in items:
+            items.remove(item)
+            if not items:
+                del self.name_map[item.name]
+        item._name = name
+        if item.id in self.item_map:
+            self.name_map.setdefault(name, []).append(item)
+
+    def item(self, item_id: str) -> Item:
+        if isinstance(item_id, Item):
+            return item_id
+        if item := self.item_map.get(item_id):
+            return item
+        if items := self.name_map.get(item_id):
+            return items[0]
+        raise LookupError(f'{item_id=}')
+
+    def items(self, itype: Union[str, None] = None, superType: bool = True) -> list[Item]:
+        return [item for item in self.item_map.values() if itype is None or item.type == itype]
+
+    @property
+    def meshes(self) -> list[Item]:
+        return self.items(itype=MESH_TYPE)
+
+    @property
+    def renderCamera(self) -> Union[Item, None]:
+        cameras = self.items(itype=CAMERA_TYPE)
+        return cameras[0] if cameras else None
+
+    def addItem(self, itype: str, name: Union[str, None] = None) -> Item:
+        return self.new_item(itype, name)
+
+    def addMesh(self, name: Union[str, None] = None) -> Item:
+        return self.new_item(MESH_TYPE, name)
+
+    def duplicateItem(self, item: Item) -> Item:
+        duplicate = self.new_item(item.type, item.name)
+        duplicate.channel_values = dict(item.channel_values)
+        duplicate.position.set(item.position.get())
+        duplicate.rotation.set(item.rotation.get())
+        if isinstance(item, Mesh) and isinstance(duplicate, Mesh):
+            duplicate.geometry = item.geometry.copy(duplicate)
+        duplicate.setParent(item.parent)
+        return duplicate
+
+    def removeItems(self, items, children: bool = False) -> None:
+        if items is None:
+            return
+        if isinstance(items, Item):
+            items = [items]
+        items = [item for item in items if item is not None]
+        if children:
+            items.extend(child for item in list(items) for child in item.children(recursive=True))
+        for item in items:
+            if item.id not in self.item_map:
+                continue
+            for child in list(item.child_items):
+                child.setParent(item.parent)
+            self.remove_links(item)
+            item.setParent(None)
+            del self.item_map[item.id]
+            # drops the name entry, removed items are not added back
+            self.rename(item, item.name)
+            self.selection.pop(item.id, None)
+            self.vertex_selection.pop(item.id, None)
+
+    # selection
+
+    @property
+    def selected(self) -> list[Item]:
+        return list(self.selection.values())
+
+    def selectedByType(self, itype: str, superType: bool = True) -> list[Item]:
+        return [item for item in self.selection.values() if item.type == itype]
+
+    def select(self, items, add: bool = False) -> None:
+        if isinstance(items, Item):
+            items = [items]
+        if not add:
+            self.selection = {}
+        for item in items:
+            self.selection.pop(item.id, None)
+            self.selection[item.id] = item
+
+    def deselect(self, items=None) -> None:
+        if items is None:
+            self.selection = {}
+            return
+        if isinstance(items, Item):
+            items = [items]
+        for item in items:
+            self.selection.pop(item.id, None)
+
+    def select_vertices(self, geometry: meshgeometry.MeshGeometry, indices: Iterable[int], replace: bool) -> None:
+        if replace:
+            self.drop_vertex_selection()
+        for index in indices:
+            geometry.selected.pop(index, None)
+            geometry.selected[index] = None
+        if geometry.selected:
+            self.vertex_selection[geometry.mesh.id] = geometry.mesh
+
+    def drop_vertex_selection(self) -> None:
+        for mesh in self.vertex_selection.values():
+            mesh.geometry.selected = {}
+        self.vertex_selection = {}
+
+    def get_selected_vertices(self) -> list[meshgeometry.MeshVertex]:
+        return [vertex for mesh in self.vertex_selection.values() for vertex in mesh.geometry.vertices.selected]
+
+    # item graphs
+
+    def link_items(self, graph: str, source: Item, target: Item, replace: bool = False) -> None:
+        forward, reverse = self.graph_links.setdefault(graph, ({}, {}))
+        if replace:
+            for previous in reverse.pop(target.id, []):
+                forward[previous].remove(target.id)
+        if target.id in forward.get(source.id, []):
+            return
+        forward.setdefault(source.id, []).append(target.id)
+        reverse.setdefault(target.id, []).append(source.id)
+        self.item_link_count += 1
+
+    def unlink_items(self, graph: str, source: Item, target: Item) -> None:
+        forward, reverse = self.graph_links.get(graph, ({}, {}))
+        if target.id in forward.get(source.id, []):
+            forward[source.id].remove(target.id)
+            reverse[target.id].remove(source.id)
+
+    def get_graph_links(self, graph: str, item: Item, reverse: bool) -> list[Item]:
+        links = self.graph_links.get(graph, ({}, {}))[1 if reverse else 0]
+        return [self.item_map[item_id] for item_id in links.get(item.id, [])]
+
+    # channel links
+
+    def link_channels(self, source: Channel, target: Channel, replace: bool = False) -> None:
+        source_key = (source.item.id, source.name)
+        target_key = (target.item.id, target.name)
+        if replace:
+            self.unlink_channels(None, target)
+        if target_key in self.channel_links_forward.get(source_key, []):
+            return
+        self.channel_links_forward.setdefault(source_key, []).append(target_key)
+        self.channel_links_reverse.setdefault(target_key, []).append(source_key)
+        self.channel_link_count += 1
+
+    def unlink_channels(self, source: Union[Channel, None], target: Channel) -> None:
+        # all links into the target when no source is given
+        target_key = (target.item.id, target.name)
+        sources = self.channel_links_reverse.get(target_key, [])
+        for source_key in list(sources):
+            if source and source_key != (source.item.id, source.name):
+                continue
+            sources.remove(source_key)
+            self.channel_links_forward[source_key].remove(target_key)
+
+    def get_channel_links(self, channel: Channel, reverse: bool) -> list[Channel]:
+        links = self.channel_links_reverse if reverse else self.channel_links_forward
+        return [Channel(self.item_map[item_id], name) for item_id, name in links.get((channel.item.id, channel.name), [])]
+
+    def remove_links(self, item: Item) -> None:
+        for forward, reverse in self.graph_links.values():
+            for links, other in ((forward, reverse), (reverse, forward)):
+                for linked in links.pop(item.id, []):
+                    if item.id in other.get(linked, []):
+                        other[linked].remove(item.id)
+        for links, other in (
+                (self.channel_links_forward, self.channel_links_reverse),
+                (self.channel_links_reverse, self.channel_links_forward)):
+            for key in [key for key in links if key[0] == item.id]:
+                for linked in links.pop(key):
+                    if key in other.get(linked, []):
+                        other[linked].remove(key)
+
+    # files
+
+    def as_dict(self) -> dict:
+        items = []
+        for item in self.item_map.values():
+            data = {
+                'id': item.id,
+                'type': item.type,
+                'name': item.name,
+                'parent': item.parent.id if item.parent else None,
+                'channels': item.channel_values,
+                'position': list(item.position.get()),
+            }
+            if isinstance(item, Mesh):
+                data['geometry'] = item.geometry.as_dict()
+            items.append(data)
+        return {
+            'items': items,
+            'item_links': [
+                [graph, source, target]
+                for graph, (forward, _) in self.graph_links.items()
+                for source, targets in forward.items()
+                for target in targets
+            ],
+            'channel_links': [
+                [*source, *target]
+                for source, targets in self.channel_links_forward.items()
+                for target in targets
+            ],
+        }
+
+    def load(self, data: dict) -> None:
+        for item_data in data.get('items', []):
+            item = self.new_item(item_data['type'], item_data['name'], item_data['id'])
+            item.channel_values.update(item_data.get('channels', {}))
+            item.position.set(item_data.get('position', (0.0, 0.0, 0.0)))
+            if isinstance(item, Mesh) and 'geometry' in item_data:
+                item.geometry.load(item_data['geometry'])
+        for item_data in data.get('items', []):
+            if item_data.get('parent'):
+                self.item_map[item_data['id']].setParent(self.item_map[item_data['parent']])
+        for graph, source, target in data.get('item_links', []):
+            self.link_items(graph, self.item_map[source], self.item_map[target])
+        for source_id, source_name, target_id, target_name in data.get('channel_links', []):
+            self.link_channels(
+                Channel(self.item_map[source_id], source_name), Channel(self.item_map[target_id], target_name)
+            )
+
+    def save(self, filename: Union[str, None] = None) -> None:
+        if filename:
+            self.filename = filename
+        with open(self.filename, 'w') as file:
+            json.dump(self.as_dict(), file, indent=1)
+        self.saved += 1
+
+
+def new_scene(filename: str = '') -> Scene:
+    scene = object.__new__(Scene)
+    scene.reset(filename)
+    Scene.current = scene
+    return scene
+
+
+def open_scene(filename: str) -> Scene:
+    scene = new_scene(os.path.abspath(filename))
+    with open(filename) as file:
+        scene.load(json.load(file))
+    return scene
+
+
+__all__ = [
+    'constants',
+    'meshgeometry',
+    'Channel',
+    'Item',
+    'Matrix4',
+    'Mesh',
+    'Scene',
+    'new_scene',
+    'open_scene',
+]
@@ -0,0 +1,14 @@
+#!/usr/bin/python
+# ================================
+# (C)2024 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# python
+# fake modo.constants, item type names used by the kit
+
+MESH_TYPE = 'mesh'
+LOCATOR_TYPE = 'locator'
+GROUPLOCATOR_TYPE = 'groupLocator'
+WEIGHTCONTAINER_TYPE = 'weightContainer'
+GENINFLUENCE_TYPE = 'genInfluence'
+CAMERA_TYPE = 'camera'
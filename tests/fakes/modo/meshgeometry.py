@@ -0,0 +1,247 @@
+#!/usr/bin/python
+# ================================
+# (C)2024 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# python
+# fake modo.meshgeometry, vertices, polygons and vertex maps of a fake mesh item
+
+from typing import Iterator, Sequence, Union
+
+
+WEIGHT_MAP_TYPE = 'WGHT'
+PICK_MAP_TYPE = 'PICK'
+
+POLYGON_FACE = 'FACE'
+# polygon types without a closing edge between the last and the first vertex
+OPEN_POLYGON_TYPES = ('CURV', 'BEZR', 'BSPL', 'LINE')
+
+
+class MeshVertex:
+    def __init__(self, geometry: 'MeshGeometry', index: int) -> None:
+        self.geometry = geometry
+        self.index = index
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, MeshVertex) and (other.geometry, other.index) == (self.geometry, self.index)
+
+    def __hash__(self) -> int:
+        return hash((id(self.geometry), self.index))
+
+    def __repr__(self) -> str:
+        return f'MeshVertex({self.geometry.mesh.name}, {self.index})'
+
+    @property
+    def position(self) -> tuple[float, float, float]:
+        return self.geometry.positions[self.index]
+
+    @position.setter
+    def position(self, value: Sequence[float]) -> None:
+        self.geometry.positions[self.index] = tuple(float(axis) for axis in value)
+
+    @property
+    def vertices(self) -> list['MeshVertex']:
+        return [MeshVertex(self.geometry, index) for index in self.geometry.get_neighbors(self.index)]
+
+    def select(self, replace: bool = False) -> None:
+        self.geometry.mesh.scene.select_vertices(self.geometry, [self.index], replace)
+
+
+class MeshVertices:
+    def __init__(self, geometry: 'MeshGeometry') -> None:
+        self.geometry = geometry
+
+    def __iter__(self) -> Iterator[MeshVertex]:
+        return (MeshVertex(self.geometry, index) for index in range(len(self.geometry.positions)))
+
+    def __len__(self) -> int:
+        return len(self.geometry.positions)
+
+    def __getitem__(self, index: int) -> MeshVertex:
+        if not 0 <= index < len(self.geometry.positions):
+            raise IndexError(index)
+        return MeshVertex(self.geometry, index)
+
+    def new(self, position: Sequence[float]) -> MeshVertex:
+        self.geometry.positions.append(tuple(float(axis) for axis in position))
+        return MeshVertex(self.geometry, len(self.geometry.positions) - 1)
+
+    @property
+    def selected(self) -> list[MeshVertex]:
+        return [MeshVertex(self.geometry, index) for index in self.geometry.selected]
+
+    def select(self, vertices, replace: bool = False) -> None:
+        if isinstance(vertices, MeshVertex):
+            vertices = [vertices]
+        self.geometry.mesh.scene.select_vertices(self.geometry, [vertex.index for vertex in vertices], replace)
+
+
+class MeshPolygon:
+    def __init__(self, geometry: 'MeshGeometry', index: int) -> None:
+        self.geometry = geometry
+        self.index = index
+
+    @property
+    def type(self) -> str:
+        return self.geometry.polygons_data[self.index][0]
+
+    @property
+    def vertices(self) -> list[MeshVertex]:
+        return [MeshVertex(self.geometry, index) for index in self.geometry.polygons_data[self.index][1]]
+
+
+class MeshPolygons:
+    def __init__(self, geometry: 'MeshGeometry') -> None:
+        self.geometry = geometry
+
+    def __iter__(self) -> Iterator[MeshPolygon]:
+        return (MeshPolygon(self.geometry, index) for index in range(len(self.geometry.polygons_data)))
+
+    def __len__(self) -> int:
+        return len(self.geometry.polygons_data)
+
+    def new(self, vertices, ptype: str = POLYGON_FACE) -> MeshPolygon:
+        # the polygon type argument is fake only, curves are built with ptype='CURV'
+        indices = [vertex.index if isinstance(vertex, MeshVertex) else int(vertex) for vertex in vertices]
+        self.geometry.polygons_data.append((ptype, indices))
+        self.geometry.adjacency = None
+        return MeshPolygon(self.geometry, len(self.geometry.polygons_data) - 1)
+
+    def iterByType(self, ptype: str) -> Iterator[MeshPolygon]:
+        # a generator, like the real method
+        for index, (polygon_type, _) in enumerate(self.geometry.polygons_data):
+            if polygon_type == ptype:
+                yield MeshPolygon(self.geometry, index)
+
+
+class VertexMap:
+    """Per vertex values of a named map, vertices without a value are not stored"""
+
+    def __init__(self, name: str, map_type: str) -> None:
+        self.name = name
+        self.map_type = map_type
+        self.values: dict[int, float] = {}
+        # vertex writes, a measure of the work done by the caller
+        self.writes = 0
+
+    def __getitem__(self, index: int):
+        return self.values.get(index)
+
+    def __setitem__(self, index: int, value) -> None:
+        self.writes += 1
+        if value is None:
+            self.values.pop(index, None)
+            return
+        self.values[index] = value[0] if isinstance(value, (tuple, list)) else value
+
+
+class MeshMaps:
+    def __init__(self, geometry: 'MeshGeometry') -> None:
+        self.geometry = geometry
+
+    def __iter__(self) -> Iterator[VertexMap]:
+        return iter(list(self.geometry.maps))
+
+    def __len__(self) -> int:
+        return len(self.geometry.maps)
+
+    def getMapsByName(self, name: str) -> list[VertexMap]:
+        return [vertex_map for vertex_map in self.geometry.maps if vertex_map.name == name]
+
+    def getMapsByType(self, types) -> list[VertexMap]:
+        if isinstance(types, str):
+            types = [types]
+        return [vertex_map for vertex_map in self.geometry.maps if vertex_map.map_type in types]
+
+    def addMap(self, map_type: str, name: str) -> VertexMap:
+        vertex_map = VertexMap(name, map_type)
+        self.geometry.maps.append(vertex_map)
+        return vertex_map
+
+    def addWeightMap(self, name: str) -> VertexMap:
+        return self.addMap(WEIGHT_MAP_TYPE, name)
+
+    def removeMaps(self, maps) -> None:
+        removed = {id(vertex_map) for vertex_map in maps}
+        self.geometry.maps = [vertex_map for vertex_map in self.geometry.maps if id(vertex_map) not in removed]
+
+    @property
+    def weightMaps(self) -> list[VertexMap]:
+        return self.getMapsByType([WEIGHT_MAP_TYPE])
+
+
+class InternalMesh:
+    def __init__(self, geometry: 'MeshGeometry') -> None:
+        self.geometry = geometry
+
+    def BoundingBox(self, mark) -> tuple[tuple[float, ...], tuple[float, ...]]:
+        positions = self.geometry.positions
+        if not positions:
+            return (0.0, 0.0, 0.0), (0.0, 0.0, 0.0)
+        return (
+            tuple(min(position[axis] for position in positions) for axis in range(3)),
+            tuple(max(position[axis] for position in positions) for axis in range(3)),
+        )
+
+
+class MeshGeometry:
+    def __init__(self, mesh) -> None:
+        self.mesh = mesh
+        self.positions: list[tuple[float, float, float]] = []
+        self.polygons_data: list[tuple[str, list[int]]] = []
+        self.maps: list[VertexMap] = []
+        # selected vertex indices in selection order
+        self.selected: dict[int, None] = {}
+        self.adjacency: Union[list[set[int]], None] = None
+        self.vertices = MeshVertices(self)
+        self.polygons = MeshPolygons(self)
+        self.vmaps = MeshMaps(self)
+        self.internalMesh = InternalMesh(self)
+
+    def __enter__(self) -> 'MeshGeometry':
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.setMeshEdits()
+
+    def setMeshEdits(self) -> None:
+        self.adjacency = None
+
+    def get_neighbors(self, index: int) -> set[int]:
+        if self.adjacency is None or len(self.adjacency) != len(self.positions):
+            self.adjacency = [set() for _ in self.positions]
+            for ptype, indices in self.polygons_data:
+                edges = list(zip(indices, indices[1:]))
+                if ptype not in OPEN_POLYGON_TYPES and len(indices) > 2:
+                    edges.append((indices[-1], indices[0]))
+                for first, second in edges:
+                    self.adjacency[first].add(second)
+                    self.adjacency[second].add(first)
+        return self.adjacency[index]
+
+    def copy(self, mesh) -> 'MeshGeometry':
+        geometry = MeshGeometry(mesh)
+        geometry.positions = list(self.positions)
+        geometry.polygons_data = [(ptype, list(indices)) for ptype, indices in self.polygons_data]
+        for vertex_map in self.maps:
+            copied = geometry.vmaps.addMap(vertex_map.map_type, vertex_map.name)
+            copied.values = dict(vertex_map.values)
+        return geometry
+
+    def as_dict(self) -> dict:
+        return {
+            'positions': [list(position) for position in self.positions],
+            'polygons': [[ptype, indices] for ptype, indices in self.polygons_data],
+            'maps': [
+                {'name': vertex_map.name, 'type': vertex_map.map_type, 'values': vertex_map.values}
+                for vertex_map in self.maps
+            ],
+        }
+
+    def load(self, data: dict) -> None:
+        self.positions = [tuple(position) for position in data.get('positions', [])]
+        self.polygons_data = [(ptype, list(indices)) for ptype, indices in data.get('polygons', [])]
+        for map_data in data.get('maps', []):
+            vertex_map = self.vmaps.addMap(map_data['type'], map_data['name'])
+            vertex_map.values = {int(index): value for index, value in map_data['values'].items()}
+        self.adjacency = None
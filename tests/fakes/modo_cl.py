@@ -0,0 +1,53 @@
+#!/usr/bin/python
+# ================================
+# (C)2024 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# python
+# fake headless modo session for batch_setup.py, reads commands from stdin like modo_cl
+# usage:
+# - python tests/fakes/modo_cl.py < commands.txt
+# - @{kit_h3d_cable_setup:scripts/...} "arg" runs the kit script, app.quit ends the session
+
+import re
+import runpy
+import shlex
+import sys
+
+import fake_kit
+
+
+SCRIPT_PATTERN = re.compile(r'^@\{kit_(?P<kit>\w+):scripts/(?P<script>\w+)\.py\}\s*(?P<args>.*)$')
+QUIT_COMMAND = 'app.quit'
+
+
+def run_script(kit: str, script: str, args: list[str]) -> None:
+    import lx
+
+    lx.arguments[:] = args
+    try:
+        runpy.run_module(f'{kit}.scripts.{script}', run_name='__main__')
+    finally:
+        lx.arguments.clear()
+
+
+def main() -> int:
+    fake_kit.install()
+    import lx
+
+    lx.headless = True
+    for line in sys.stdin:
+        command = line.strip()
+        if not command:
+            continue
+        if command == QUIT_COMMAND:
+            return 0
+        if match := SCRIPT_PATTERN.match(command):
+            run_script(match['kit'], match['script'], shlex.split(match['args']))
+        else:
+            lx.eval(command)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,44 @@
+#!/usr/bin/python
+# ================================
+# (C)2024 Dmytro Holub
+# heap3d@gmail.com
+# --------------------------------
+# python
+# runs scripts/benchmark.py outside modo against the fake modo and lx modules
+# usage:
+# - python tests/run_benchmark.py [cables] [ik] [baseline] [latency:0.001]
+# - arguments are passed to benchmark.py, the baseline is tests/h3d_bench.benchmark.json
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fakes'))
+
+import fake_kit  # noqa: E402
+
+
+BENCH_SCENE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'h3d_bench.lxo')
+CURVE_NAME = 'h3d_bench_curve'
+CURVE_POINTS = 8
+
+
+def new_bench_scene():
+    import modo
+
+    scene = modo.new_scene(BENCH_SCENE)
+    scene.select(fake_kit.new_curve(scene, CURVE_NAME, CURVE_POINTS))
+    return scene
+
+
+def main() -> None:
+    fake_kit.install()
+    import lx
+    import h3d_cable_setup.scripts.benchmark as benchmark
+
+    new_bench_scene()
+    lx.arguments[:] = sys.argv[1:]
+    benchmark.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,221 @@
+import json
+import os
+import stat
+import sys
+
+import pytest
+
+import fake_kit
+from h3d_cable_setup.scripts.batch_setup import (
+    MODE_CABLES,
+    MODE_IK,
+    STATUS_FAILED,
+    STATUS_NOT_RUN,
+    STATUS_OK,
+    BatchJob,
+    SceneResult,
+    append_result,
+    get_chunks,
+    get_report,
+    get_session_commands,
+    read_results,
+    read_scene_list,
+    run_batch,
+    write_report_csv,
+    write_report_json,
+)
+
+
+IK_SELECTION_SET = 'IK chain'
+
+
+@pytest.fixture
+def modo_cl(tmp_path):
+    # executable started by batch_setup for every session
+    filename = tmp_path / 'modo_cl'
+    filename.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{os.path.join(fake_kit.FAKES_FOLDER, "modo_cl.py")}"\n')
+    filename.chmod(filename.stat().st_mode | stat.S_IEXEC)
+    return str(filename)
+
+
+def save_scene(filename: str, build) -> str:
+    import modo
+
+    scene = modo.new_scene(filename)
+    build(scene)
+    scene.save()
+    return filename
+
+
+def read_scene(filename: str):
+    import modo
+
+    return modo.open_scene(filename)
+
+
+def new_cable_scene(scene) -> None:
+    fake_kit.new_curve(scene, 'wire[d5:p8]')
+    fake_kit.new_curve(scene, 'hose[d12:p12]', offset=(1.0, 0.0, 0.0))
+    scene.addMesh('box')
+
+
+def new_ik_scene(scene) -> None:
+    mesh = fake_kit.new_chain(scene, 'arm', 6, is_selected=False)
+    pick_map = mesh.geometry.vmaps.addMap('PICK', IK_SELECTION_SET)
+    for vertex in range(6):
+        pick_map[vertex] = 1.0
+    fake_kit.new_chain(scene, 'leg', 6, is_selected=False)
+
+
+def test_job_round_trip(tmp_path):
+    job = BatchJob(['a.lxo'], MODE_IK, 'a.results.jsonl')
+    job.selection_set = IK_SELECTION_SET
+    job.joint_count = 4
+    filename = str(tmp_path / 'a.job.json')
+
+    job.write(filename)
+
+    assert BatchJob.read(filename).as_dict() == job.as_dict()
+    assert job.copy(['b.lxo'], 'b.results.jsonl').as_dict()['scenes'] == ['b.lxo']
+
+
+def test_job_rejects_unknown_mode_and_version():
+    with pytest.raises(ValueError):
+        BatchJob([], 'meshes', '')
+    data = BatchJob([], MODE_CABLES, '').as_dict()
+    data['version'] = 0
+    with pytest.raises(ValueError):
+        BatchJob.from_dict(data)
+
+
+def test_results_skip_partial_lines(tmp_path):
+    filename = str(tmp_path / 'session.results.jsonl')
+    result = SceneResult('a.lxo', MODE_CABLES)
+    result.status = STATUS_OK
+    append_result(filename, result)
+    with open(filename, 'a') as file:
+        file.write('{"scene": "b.lxo", "mo')
+
+    assert [result.as_dict() for result in read_results(filename)] == [result.as_dict()]
+    assert read_results(str(tmp_path / 'missing.jsonl')) == []
+
+
+def test_chunks():
+    assert get_chunks(['a', 'b', 'c'], 2) == [['a', 'b'], ['c']]
+    with pytest.raises(ValueError):
+        get_chunks(['a'], 0)
+
+
+def test_session_commands():
+    assert get_session_commands('job.json') == '@{kit_h3d_cable_setup:scripts/batch_scene.py} "job.json"\napp.quit\n'
+
+
+def test_scene_list_is_relative_to_the_list_file(tmp_path):
+    filename = tmp_path / 'scenes.txt'
+    filename.write_text('# scenes\na.lxo\n\n/abs/b.lxo\n')
+
+    assert read_scene_list(str(filename)) == [str(tmp_path / 'a.lxo'), '/abs/b.lxo']
+
+
+def test_reports(tmp_path):
+    ok = SceneResult('a.lxo', MODE_CABLES)
+    ok.status = STATUS_OK
+    ok.seconds = 1.0
+    failed = SceneResult('b.lxo', MODE_CABLES)
+    failed.message = 'no result reported by the session'
+    json_filename = str(tmp_path / 'report.json')
+    csv_filename = str(tmp_path / 'report.csv')
+
+    write_report_json(json_filename, [ok, failed], 2.0)
+    write_report_csv(csv_filename, [ok, failed])
+
+    with open(json_filename) as file:
+        assert json.load(file)['failed'] == 1
+    with open(csv_filename) as file:
+        assert len(file.readlines()) == 3
+    assert get_report([ok, failed], 2.0).splitlines() == [
+        '2 scenes, 1 failed, 2.0 s wall time, 1.0 s in scenes, 0.50 s per scene',
+        f'{STATUS_NOT_RUN}: b.lxo no result reported by the session',
+    ]
+
+
+def test_cable_batch(scene, tmp_path, modo_cl):
+    scenes = [save_scene(str(tmp_path / f'scene_{i}.lxo'), new_cable_scene) for i in range(3)]
+    job = BatchJob([], MODE_CABLES, '')
+
+    results = run_batch(scenes, job, modo_cl, workers=2, scenes_per_session=2)
+
+    assert [result.status for result in results] == [STATUS_OK] * 3
+    assert [result.session for result in results] == [0, 0, 1]
+    assert all(result.built == 2 for result in results)
+    saved = read_scene(scenes[0])
+    assert {'wire_cable', 'hose_cable'} <= {mesh.name for mesh in saved.meshes}
+
+
+def test_broad_pattern_skips_meshes_without_curves(scene, tmp_path, modo_cl):
+    filename = save_scene(str(tmp_path / 'scene.lxo'), new_cable_scene)
+    job = BatchJob([], MODE_CABLES, '')
+    job.curve_pattern = '.*'
+
+    result, = run_batch([filename], job, modo_cl, workers=1)
+
+    assert (result.status, result.matched, result.built) == (STATUS_OK, 3, 2)
+    assert 'box_cable' not in {mesh.name for mesh in read_scene(filename).meshes}
+
+
+def test_ik_batch(scene, tmp_path, modo_cl):
+    filename = save_scene(str(tmp_path / 'rig.lxo'), new_ik_scene)
+    job = BatchJob([], MODE_IK, '')
+    job.selection_set = IK_SELECTION_SET
+
+    result, = run_batch([filename], job, modo_cl, workers=1)
+
+    assert (result.status, result.matched, result.built) == (STATUS_OK, 1, 1)
+    group = read_scene(filename).item('arm_IK_set')
+    assert len(group.children(itemType='weightContainer')) == 6
+
+
+def test_batch_without_save(scene, tmp_path, modo_cl):
+    filename = save_scene(str(tmp_path / 'scene.lxo'), new_cable_scene)
+    with open(filename) as file:
+        content = file.read()
+    job = BatchJob([], MODE_CABLES, '')
+    job.is_save = False
+
+    result, = run_batch([filename], job, modo_cl, workers=1)
+
+    assert result.built == 2
+    with open(filename) as file:
+        assert file.read() == content
+
+
+def test_failed_scene_does_not_stop_the_session(scene, tmp_path, modo_cl):
+    filename = save_scene(str(tmp_path / 'scene.lxo'), new_cable_scene)
+    missing = str(tmp_path / 'missing.lxo')
+
+    results = run_batch([missing, filename], BatchJob([], MODE_CABLES, ''), modo_cl, workers=1)
+
+    assert [result.status for result in results] == [STATUS_FAILED, STATUS_OK]
+    assert 'FileNotFoundError' in results[0].message
+
+
+def test_missing_modo_cl(tmp_path):
+    result, = run_batch([str(tmp_path / 'scene.lxo')], BatchJob([], MODE_CABLES, ''), str(tmp_path / 'none'), 1)
+
+    assert result.status == STATUS_NOT_RUN
+    assert result.message.startswith(str(tmp_path / 'none'))
+
+
+def test_command_journal_is_cleared_between_scenes(scene, tmp_path):
+    from h3d_cable_setup.scripts import batch_scene
+
+    scenes = [save_scene(str(tmp_path / f'scene_{i}.lxo'), new_cable_scene) for i in range(2)]
+    job = BatchJob(scenes, MODE_CABLES, '')
+    job.is_save = False
+
+    for filename in scenes:
+        result = batch_scene.process_scene(job, filename)
+
+        assert (result.status, result.built) == (STATUS_OK, 2)
+        assert batch_scene.cable_setup.lxq.journal == []
+        assert batch_scene.ik_setup.lxq.journal == []
@@ -0,0 +1,114 @@
+import json
+import os
+
+import pytest
+
+import h3d_cable_setup.scripts.benchmark as benchmark
+import h3d_cable_setup.scripts.cable_setup as cable_setup
+from h3d_cable_setup.scripts.command_queue import SELECTION_COMMANDS
+from run_benchmark import BENCH_SCENE, new_bench_scene
+
+
+BASELINE_FILENAME = os.path.join(os.path.dirname(BENCH_SCENE), 'h3d_bench.benchmark.json')
+
+
+@pytest.fixture
+def curve(scene, monkeypatch):
+    # reduced sweep, keys are a subset of the stored full sweep baseline
+    monkeypatch.setattr(benchmark, 'CABLE_COUNTS', (1, 10))
+    monkeypatch.setattr(benchmark, 'IK_VERTEX_COUNTS', (10, 50))
+    monkeypatch.setattr(benchmark, 'SCENE_SIZES', (0, 1000))
+    return new_bench_scene().selected[0]
+
+
+def read_baseline() -> dict[str, float]:
+    with open(BASELINE_FILENAME) as file:
+        return json.load(file)
+
+
+def test_suite_matches_baseline(curve):
+    results = benchmark.run_suite(curve, is_cables=True, is_ik=True, latency=0.0)
+
+    baseline = read_baseline()
+    assert len(results) == 12
+    assert all(result.key in baseline for result in results)
+    assert benchmark.get_regressions(results, baseline) == []
+
+
+def test_suite_removes_bench_items(curve):
+    items = {item.id for item in curve.scene.items()}
+
+    benchmark.run_suite(curve, is_cables=True, is_ik=True, latency=0.0)
+
+    # the pooled profile and the level of detail control are shared by every cable and stay in the scene
+    added = [item for item in curve.scene.items() if item.id not in items]
+    assert sorted(item.type for item in added) == ['cmLinearBlend', 'locator', 'mesh', 'prim.cylinder.item']
+    assert sorted(item.name for item in added if item.type in ('locator', 'mesh')) == [
+        cable_setup.LOD_CONTROL_NAME, f'{cable_setup.CABLE_SHAREABLE_PROFILE_NAME}_p6'
+    ]
+
+
+def test_batch_build_issues_fewer_commands(curve):
+    results = {result.key: result for result in benchmark.run_suite(curve, True, False, 0.0)}
+
+    assert results['batch cables:10:0'].evals_per_item < results['serial cables:10:0'].evals_per_item
+    assert results['batch cables:10:0'].selection_events < results['serial cables:10:0'].selection_events
+
+
+def test_ik_setup_counts_vertex_selections(curve, monkeypatch):
+    import lx
+    import modo
+
+    selects: list[int] = []
+    select = modo.meshgeometry.MeshVertex.select
+    monkeypatch.setattr(modo.meshgeometry.MeshVertex, 'select', lambda self, replace=False: (
+        selects.append(self.index), select(self, replace)))
+    monkeypatch.setattr(benchmark, 'IK_VERTEX_COUNTS', (10,))
+    monkeypatch.setattr(benchmark, 'SCENE_SIZES', (0,))
+    lx.history.clear()
+
+    result, = benchmark.run_suite(curve, False, True, 0.0)
+
+    # the weight container vertex is selected and then selected again on restore
+    assert len(selects) == 2 * 10
+    commands = [command for command in lx.history if command.startswith(SELECTION_COMMANDS)]
+    assert result.selection_events == len(commands) + len(selects)
+
+
+def test_extra_command_per_cable_fails(curve, monkeypatch):
+    create_cable_controls = cable_setup.CableLive.create_cable_controls
+
+    def create_cable_controls_twice(self):
+        create_cable_controls(self)
+        cable_setup.lxq.eval(f'item.editorColor {cable_setup.HIGHLIGHT_COLOR}')
+
+    monkeypatch.setattr(cable_setup.CableLive, 'create_cable_controls', create_cable_controls_twice)
+    results = benchmark.run_suite(curve, is_cables=True, is_ik=False, latency=0.0)
+
+    regressions = benchmark.get_regressions(results, read_baseline())
+    assert any(regression.startswith('serial cables:10:0') for regression in regressions)
+
+
+def test_main_stores_and_checks_baseline(curve, tmp_path, monkeypatch):
+    import lx
+
+    curve.scene.filename = str(tmp_path / 'bench.lxo')
+    lx.arguments[:] = ['cables']
+    benchmark.main()
+    assert (tmp_path / 'bench.benchmark.json').exists()
+
+    monkeypatch.setattr(benchmark, 'BASELINE_TOLERANCE', -0.5)
+    curve.scene.select(curve)
+    with pytest.raises(RuntimeError, match='lx.eval count per item increased'):
+        benchmark.main()
+
+
+def test_latency_is_added_per_eval(curve, monkeypatch):
+    import lx
+
+    monkeypatch.setattr(benchmark, 'CABLE_COUNTS', (1,))
+    monkeypatch.setattr(benchmark, 'SCENE_SIZES', (0,))
+    lx.latency = 0.001
+    result = benchmark.run_suite(curve, is_cables=True, is_ik=False, latency=0.0)[0]
+
+    assert result.seconds >= result.evals * lx.latency
@@ -0,0 +1,176 @@
+import random
+
+import pytest
+
+from h3d_cable_setup.scripts.cable_params import (
+    DEFAULT_DIAMETER,
+    DEFAULT_SIDES,
+    MIN_SIDES,
+    MIN_STEPS,
+    POLYGON_TYPES,
+    CableNameError,
+    CableParams,
+    get_basename,
+    parse_cable_name,
+)
+
+
+def test_name_without_tokens_gives_defaults():
+    params = parse_cable_name('curve')
+
+    assert params.as_dict() == CableParams().as_dict()
+
+
+def test_all_tokens():
+    params = parse_cable_name('wire[d5:s24:f1:t1:p6:mat]')
+
+    assert params.basename == 'wire'
+    assert params.diameter == pytest.approx(0.005)
+    assert params.steps == 24
+    assert params.flip is True
+    assert params.polygon_type == 1
+    assert params.sides == 6
+    assert params.material_name == 'mat'
+
+
+def test_empty_tokens_keep_basename():
+    params = parse_cable_name(' wire [ ]')
+
+    assert params.basename == 'wire'
+    assert params.diameter == DEFAULT_DIAMETER
+    assert params.sides == DEFAULT_SIDES
+
+
+@pytest.mark.parametrize('token, diameter', [
+    ('5', 0.005),
+    ('d5mm', 0.005),
+    ('0.5cm', 0.005),
+    ('.5cm', 0.005),
+    ('2m', 2.0),
+])
+def test_diameter_units(token, diameter):
+    assert parse_cable_name(f'wire[{token}]').diameter == pytest.approx(diameter)
+
+
+def test_flip_values():
+    assert parse_cable_name('wire[f0]').flip is False
+    assert parse_cable_name('wire[f0:f]').flip is True
+
+
+@pytest.mark.parametrize('name, reason, token', [
+    ('wire[d5::s2]', 'empty token', ''),
+    ('wire[5km]', 'unknown unit', '5km'),
+    ('wire[s2cm]', 'unit not supported', 's2cm'),
+    ('wire[s2.5]', 'integer value expected', 's2.5'),
+    ('wire[d0]', 'diameter out of range', 'd0'),
+    ('wire[0.0cm]', 'diameter out of range', '0.0cm'),
+    ('wire[3m_tape]', 'unknown token', '3m_tape'),
+    ('wire[t3]', 'polygon type out of range', 't3'),
+    ('wire[s0]', 'steps out of range', 's0'),
+    ('wire[p0]', 'sides out of range', 'p0'),
+    ('wire[p2]', 'sides out of range', 'p2'),
+    ('wire[copper:steel]', 'duplicate material name', 'steel'),
+    ('wire[5x5]', 'unknown token', '5x5'),
+])
+def test_errors(name, reason, token):
+    with pytest.raises(CableNameError) as error:
+        parse_cable_name(name)
+
+    assert error.value.reason == reason
+    assert error.value.token == token
+    assert error.value.name == name
+    assert 0 <= error.value.position <= len(name)
+
+
+def test_last_bracket_group_holds_tokens():
+    params = parse_cable_name('a[b][d5]')
+
+    assert params.basename == 'a[b]'
+    assert params.diameter == pytest.approx(0.005)
+    assert params.material_name == ''
+
+
+def test_digit_leading_basename():
+    params = parse_cable_name('3m_tape[d5:tape]')
+
+    assert params.basename == '3m_tape'
+    assert params.diameter == pytest.approx(0.005)
+    assert params.material_name == 'tape'
+
+
+def test_error_position_points_at_value():
+    name = 'wire[d5:t7]'
+    with pytest.raises(CableNameError) as error:
+        parse_cable_name(name)
+
+    assert error.value.position == name.index('7')
+
+
+def test_parsed_params_are_copies():
+    params = parse_cable_name('wire[d5]')
+    params.diameter = 1.0
+
+    assert parse_cable_name('wire[d5]').diameter == pytest.approx(0.005)
+
+
+def test_params_dict_round_trip():
+    params = parse_cable_name('wire[d5:s12:f0:t2:p8:mat]')
+
+    assert CableParams.from_dict(params.as_dict()).as_dict() == params.as_dict()
+
+
+def test_params_from_dict_rejects_unknown_names():
+    with pytest.raises(ValueError):
+        CableParams.from_dict({'radius': 1.0})
+
+
+@pytest.mark.parametrize('name, basename', [
+    ('wire[t9]', 'wire'),
+    (' wire [d5]', 'wire'),
+    ('curve', ''),
+    ('a[b][d5]', 'a[b]'),
+])
+def test_get_basename(name, basename):
+    assert get_basename(name) == basename
+
+
+FUZZ_ALPHABET = 'dsftpmcx0123456789.:[] _-'
+FUZZ_MAX_LENGTH = 24
+FUZZ_COUNT = 20_000
+FUZZ_SEED = 0
+
+
+def check_params(params: CableParams) -> None:
+    assert isinstance(params.basename, str)
+    assert isinstance(params.material_name, str)
+    assert isinstance(params.diameter, float) and params.diameter > 0
+    assert isinstance(params.steps, int) and params.steps >= MIN_STEPS
+    assert isinstance(params.sides, int) and params.sides >= MIN_SIDES
+    assert isinstance(params.flip, bool)
+    assert params.polygon_type in POLYGON_TYPES
+
+
+def test_fuzzed_names_give_valid_params_or_name_errors():
+    rnd = random.Random(FUZZ_SEED)
+    errors = 0
+    for _ in range(FUZZ_COUNT):
+        name = ''.join(rnd.choice(FUZZ_ALPHABET) for _ in range(rnd.randint(0, FUZZ_MAX_LENGTH)))
+        try:
+            params = parse_cable_name(name)
+        except CableNameError as error:
+            errors += 1
+            assert 0 <= error.position <= len(name), name
+            assert error.name == name
+            continue
+        check_params(params)
+
+    # the alphabet produces both outcomes
+    assert 0 < errors < FUZZ_COUNT
+
+
+def test_parser_benchmark_runs_from_the_package(capsys):
+    from h3d_cable_setup.scripts import benchmark_parser
+
+    benchmark_parser.bench_parser(benchmark_parser.new_names(100, random.Random(FUZZ_SEED)))
+
+    assert capsys.readouterr().out.startswith('parse: 100 names')
@@ -0,0 +1,173 @@
+import pytest
+
+import h3d_cable_setup.scripts.cable_plan as cable_plan
+from h3d_cable_setup.scripts.cable_params import CableParams
+from h3d_cable_setup.scripts.cable_plan import (
+    ACTION_CREATE,
+    ACTION_REBUILD,
+    ACTION_SKIP,
+    ACTION_UPDATE,
+    CH_DIAMETER,
+    CH_FLIP,
+    CH_POLYGON_TYPE,
+    CH_PTAG,
+    CH_STEPS,
+    CH_STEPS_VIEWPORT,
+    BuildPlan,
+    CablePlan,
+    CurveSummary,
+    get_action,
+    get_camera_lod,
+    get_pooled_profile_name,
+    get_viewport_density,
+    plan_cable,
+    plan_cables,
+    read_manifest,
+    write_manifest,
+)
+
+
+def new_summary(name: str, curve_id: str = 'mesh001', is_curve: bool = True, is_setup_complete: bool = False,
+                has_cable: bool = False) -> CurveSummary:
+    return CurveSummary(curve_id, name, is_curve, is_setup_complete, has_cable)
+
+
+@pytest.mark.parametrize('is_curve, is_setup_complete, has_cable, action', [
+    (True, False, False, ACTION_CREATE),
+    (True, False, True, ACTION_REBUILD),
+    (True, True, True, ACTION_UPDATE),
+    (False, True, True, ACTION_UPDATE),
+    (False, False, False, ACTION_SKIP),
+    (False, False, True, ACTION_SKIP),
+])
+def test_get_action(is_curve, is_setup_complete, has_cable, action):
+    assert get_action(new_summary('wire', '', is_curve, is_setup_complete, has_cable)) == action
+
+
+def test_plan_shared_profile():
+    plan = plan_cable(new_summary('wire[d5:s24:f0:t2:p8:mat]'), is_profile_independent=False)
+
+    assert plan.action == ACTION_CREATE
+    assert plan.cable_name == 'wire_cable'
+    assert plan.is_profile_shared
+    assert plan.profile_name == get_pooled_profile_name(8)
+    expected = {
+        CH_DIAMETER: pytest.approx(0.005),
+        CH_POLYGON_TYPE: 2,
+        CH_STEPS: 24,
+        CH_STEPS_VIEWPORT: 6,
+        CH_FLIP: False,
+        CH_PTAG: 'mat',
+    }
+    assert {name: plan.channels[name] for name in expected} == expected
+    assert plan.message == ''
+
+
+def test_plan_independent_profile():
+    plan = plan_cable(new_summary('wire[p8]'), is_profile_independent=True)
+
+    assert not plan.is_profile_shared
+    assert plan.profile_name == 'wire_profile'
+
+
+def test_plan_skips_meshes_without_curves():
+    plan = plan_cable(new_summary('box', is_curve=False), is_profile_independent=False)
+
+    assert plan.action == ACTION_SKIP
+    assert plan.cable_name == ''
+    assert 'No curve found' in plan.message
+
+
+def test_plan_reports_name_errors():
+    plan = plan_cable(new_summary('wire[t9]'), is_profile_independent=False)
+
+    assert plan.action == ACTION_CREATE
+    assert 'polygon type out of range' in plan.message
+
+
+@pytest.mark.parametrize('is_setup_complete', [True, False])
+def test_plan_skips_existing_cables_on_name_errors(is_setup_complete):
+    plan = plan_cable(new_summary('wire[d5:t9]', is_setup_complete=is_setup_complete, has_cable=True), False)
+
+    assert plan.action == ACTION_SKIP
+    assert plan.channels == {}
+    assert plan.message.startswith('Cable update skipped')
+
+
+def test_plan_keeps_basename_on_name_errors():
+    plan = plan_cable(new_summary('wire[d5:t9]'), is_profile_independent=True)
+
+    assert plan.cable_name == 'wire_cable'
+    assert plan.profile_name == 'wire_profile'
+    assert plan.params.as_dict() == {**CableParams().as_dict(), 'basename': 'wire'}
+
+
+@pytest.mark.parametrize('value, minimum, density', [(24, 2, 6), (4, 2, 2), (2, 3, 2), (48, 3, 12)])
+def test_viewport_density(value, minimum, density):
+    assert get_viewport_density(value, minimum) == density
+
+
+def test_camera_lod():
+    assert get_camera_lod(1.0, 2.0, 20.0) == 1.0
+    assert get_camera_lod(11.0, 2.0, 20.0) == pytest.approx(0.5)
+    assert get_camera_lod(30.0, 2.0, 20.0) == 0.0
+    with pytest.raises(ValueError):
+        get_camera_lod(1.0, 2.0, 2.0)
+
+
+def test_shared_profiles_and_report():
+    plan = plan_cables([
+        new_summary('a[p6]', 'mesh001'),
+        new_summary('b[p6]', 'mesh002'),
+        new_summary('c[p8]', 'mesh003'),
+        new_summary('d[p12]', 'mesh004', is_setup_complete=True),
+        new_summary('box', 'mesh005', is_curve=False),
+    ], is_profile_independent=False, workers=0)
+
+    assert plan.get_shared_profiles() == {get_pooled_profile_name(6): 6, get_pooled_profile_name(8): 8}
+    assert plan.get_report() == '5 curves planned: 3 create, 0 rebuild, 1 update, 1 skip, 2 shared profiles'
+
+
+def test_plan_file_round_trip(tmp_path):
+    plan = plan_cables([new_summary('wire[d5:p8]'), new_summary('box', 'mesh002', is_curve=False)], False, workers=0)
+    filename = str(tmp_path / 'scene.plan.json')
+
+    plan.write(filename)
+
+    assert BuildPlan.read(filename).as_dict() == plan.as_dict()
+
+
+def test_plan_rejects_other_versions():
+    with pytest.raises(ValueError):
+        BuildPlan.from_dict({'version': 0, 'is_profile_independent': False, 'cables': []})
+    data = CablePlan('mesh001', 'wire').as_dict()
+    data['action'] = 'delete'
+    with pytest.raises(ValueError):
+        CablePlan.from_dict(data)
+
+
+def test_parallel_plan_matches_serial(monkeypatch):
+    monkeypatch.setattr(cable_plan, 'PARALLEL_PLAN_MIN_CURVES', 10)
+    summaries = [new_summary(f'wire_{i}[d{i % 7 + 1}:p{i % 5 + 3}]', f'mesh{i:03d}') for i in range(40)]
+
+    parallel = plan_cables(summaries, False, workers=2)
+    serial = plan_cables(summaries, False, workers=0)
+
+    assert parallel.as_dict() == serial.as_dict()
+
+
+def test_manifest_round_trip(tmp_path):
+    plans = plan_cables([new_summary(f'wire_{i}[d{i + 1}:p{i + 3}]', f'mesh{i:03d}') for i in range(3)], False, 0)
+    filename = str(tmp_path / 'scene.cables.jsonl')
+
+    assert write_manifest(filename, iter(plans.cables)) == 3
+
+    assert [plan.as_dict() for plan in read_manifest(filename)] == [plan.as_dict() for plan in plans.cables]
+
+
+def test_manifest_rejects_other_files(tmp_path):
+    filename = tmp_path / 'scene.cables.jsonl'
+    filename.write_text('{"format": "other", "version": 1}\n')
+
+    with pytest.raises(ValueError):
+        list(read_manifest(str(filename)))
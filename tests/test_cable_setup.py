@@ -0,0 +1,311 @@
+import pytest
+
+import fake_kit
+from h3d_utilites.scripts import h3d_utils
+import h3d_cable_setup.scripts.cable_setup as cable_setup
+from h3d_cable_setup.scripts.cable_params import DEFAULT_COMPENSATION
+from h3d_cable_setup.scripts.cable_plan import (
+    ACTION_CREATE,
+    ACTION_REBUILD,
+    ACTION_SKIP,
+    ACTION_UPDATE,
+    CH_COMP,
+    CH_DIAMETER,
+    CH_LOD,
+    CH_SIDES,
+    CH_STEPS,
+    CablePlan,
+    get_pooled_profile_name,
+)
+from h3d_cable_setup.scripts.cable_setup import CableLive, CableSceneIndex
+
+
+def build(meshes, is_profile_independent: bool = False) -> list[CableLive]:
+    cables = cable_setup.build_cables(meshes, is_profile_independent)
+    cable_setup.lxq.flush()
+    return cables
+
+
+def get_setup(curve):
+    return CableSceneIndex().get_cable_setup(curve)
+
+
+def test_single_cable(scene):
+    curve = fake_kit.new_curve(scene, 'wire[d5:s12:p8]')
+
+    cable, = build([curve])
+
+    assert cable.plan.action == ACTION_CREATE
+    setup = get_setup(curve)
+    assert setup.cable_mesh.name == 'wire_cable'
+    assert setup.profile_mesh.name == get_pooled_profile_name(8)
+    assert CableLive(curve, CableSceneIndex()).is_cable_setup_complete()
+    assert setup.cable_mesh.channel(CH_DIAMETER).get() == pytest.approx(0.005)
+    assert setup.profile_mesh.channel(CH_SIDES).get() == 8
+    assert setup.curve_sweep_mop.channel('size').revLinked[0].item == setup.math_mult_chmod
+    assert setup.curve_sweep_mop.channel('steps').revLinked[0].item == setup.lod_blend_chmod
+
+
+def test_meshes_without_curves_are_skipped(scene):
+    box = scene.addMesh('box[d5]')
+    with box.geometry as geometry:
+        geometry.polygons.new([geometry.vertices.new(position) for position in ((0, 0, 0), (1, 0, 0), (1, 1, 0))])
+    empty = scene.addMesh('empty')
+    curve = fake_kit.new_curve(scene, 'wire')
+
+    cables = build([box, empty, curve])
+
+    assert [cable.curve_mesh for cable in cables] == [curve]
+    assert not CableLive.is_general_curve(box)
+    assert get_setup(box) is None
+
+
+def test_batch_cables_share_profiles(scene):
+    curves = [fake_kit.new_curve(scene, f'wire_{i}[d{i + 1}:p{6 + i % 2 * 2}]') for i in range(4)]
+
+    build(curves)
+
+    setups = [get_setup(curve) for curve in curves]
+    assert all(CableLive(curve, CableSceneIndex()).is_cable_setup_complete() for curve in curves)
+    assert [setup.profile_mesh.name for setup in setups] == [
+        get_pooled_profile_name(sides) for sides in (6, 8, 6, 8)
+    ]
+    assert len({setup.math_mult_chmod.id for setup in setups}) == 4
+    assert not [item for item in scene.items() if item.name.startswith(cable_setup.CABLE_TEMPLATE_NAME)]
+
+
+def test_batch_cables_with_independent_profiles(scene):
+    curves = [fake_kit.new_curve(scene, f'wire_{i}[p{i + 3}]') for i in range(3)]
+
+    build(curves, is_profile_independent=True)
+
+    setups = [get_setup(curve) for curve in curves]
+    assert [setup.profile_mesh.name for setup in setups] == ['wire_0_profile', 'wire_1_profile', 'wire_2_profile']
+    assert [setup.profile_mesh.channel(CH_SIDES).get() for setup in setups] == [3, 4, 5]
+
+
+@pytest.mark.parametrize('count', [1, 3])
+def test_rebuild_removes_independent_profile(scene, count):
+    curves = [fake_kit.new_curve(scene, f'wire_{i}[p8]') for i in range(count)]
+    build(curves, is_profile_independent=True)
+    # setups built before level of detail support have no blend and are rebuilt
+    for curve in curves:
+        scene.removeItems(get_setup(curve).lod_blend_chmod)
+
+    cables = build(curves, is_profile_independent=True)
+
+    assert {cable.plan.action for cable in cables} == {ACTION_REBUILD}
+    assert sorted(mesh.name for mesh in scene.meshes if mesh.name.endswith('_profile')) == [
+        f'wire_{i}_profile' for i in range(count)
+    ]
+    assert len(scene.items(itype='prim.cylinder.item')) == count
+    # a blend per cable and per profile
+    assert len(scene.items(itype=cable_setup.LOD_BLEND_TYPE)) == 2 * count
+
+
+def test_rerun_updates_changed_channels_only(scene):
+    curve = fake_kit.new_curve(scene, 'wire[d5:s12]')
+    build([curve])
+    items = {item.id for item in scene.items()}
+    scene.channel_writes.clear()
+    journal_size = len(cable_setup.lxq.journal)
+
+    cable, = build([curve])
+    assert cable.plan.action == ACTION_UPDATE
+    assert scene.channel_writes == []
+    # no preset browser session without cables to create
+    assert not [command for command in cable_setup.lxq.journal[journal_size:] if 'presetBrowser' in command]
+
+    curve.name = 'wire[d5:s16]'
+    build([curve])
+    assert {item.id for item in scene.items()} == items
+    assert [(name, value) for _, name, value in scene.channel_writes] == [
+        (CH_STEPS, 16), (cable_setup.CH_STEPS_VIEWPORT, 4)
+    ]
+
+
+def test_rename_with_bad_token_keeps_cable(scene):
+    curve = fake_kit.new_curve(scene, 'wire[d5:s12:copper:p8]')
+    build([curve])
+    scene.channel_writes.clear()
+
+    curve.name = 'wire[d5:s12:copper:p8:t9]'
+    cable, = build([curve])
+
+    assert cable.plan.action == ACTION_SKIP
+    assert scene.channel_writes == []
+    setup = get_setup(curve)
+    assert setup.cable_mesh.channel(CH_DIAMETER).get() == pytest.approx(0.005)
+    assert setup.profile_mesh.name == get_pooled_profile_name(8)
+
+
+def test_sides_rename_relinks_pooled_profile(scene):
+    curve = fake_kit.new_curve(scene, 'wire[d5:p6]')
+    build([curve])
+
+    curve.name = 'wire[d5:p8]'
+    cable, = build([curve])
+
+    assert cable.plan.action == ACTION_UPDATE
+    setup = get_setup(curve)
+    assert setup.profile_mesh.name == get_pooled_profile_name(8)
+    assert setup.curve_sweep_mop.itemGraph('curve.sweep.prof').reverse() == [setup.profile_mesh]
+    # the unused pooled profile is left for eviction
+    assert CableSceneIndex().evict_unused_profiles() == [get_pooled_profile_name(6)]
+
+
+def test_updates_share_one_preset_browser_session(scene):
+    curves = [fake_kit.new_curve(scene, f'wire{i}[d5:p6]', offset=(i, 0.0, 0.0)) for i in range(5)]
+    build(curves)
+    h3d_utils.reset()
+
+    # every cable gets its own profile
+    cables = build(curves, is_profile_independent=True)
+
+    assert [cable.plan.action for cable in cables] == [ACTION_UPDATE] * 5
+    assert h3d_utils.preset_browser_toggles == 2
+
+
+def test_updates_without_new_profiles_keep_preset_browser(scene):
+    curves = [fake_kit.new_curve(scene, f'wire{i}[d5:p6]', offset=(i, 0.0, 0.0)) for i in range(5)]
+    build(curves)
+    h3d_utils.reset()
+
+    for i, curve in enumerate(curves):
+        curve.name = f'wire{i}[d4:p6]'
+    build(curves)
+
+    assert h3d_utils.preset_browser_toggles == 0
+
+
+def test_sides_rename_resizes_independent_profile(scene):
+    curve = fake_kit.new_curve(scene, 'wire[p6]')
+    build([curve], is_profile_independent=True)
+    profile = get_setup(curve).profile_mesh
+
+    curve.name = 'wire[p8]'
+    build([curve], is_profile_independent=True)
+
+    assert get_setup(curve).profile_mesh == profile
+    assert profile.channel(CH_SIDES).get() == 8
+
+
+def test_independent_profile_replaced_by_pooled_profile(scene):
+    curve = fake_kit.new_curve(scene, 'wire[p6]')
+    build([curve], is_profile_independent=True)
+
+    build([curve])
+
+    assert get_setup(curve).profile_mesh.name == get_pooled_profile_name(6)
+    assert 'wire_profile' not in {mesh.name for mesh in scene.meshes}
+    assert len(scene.items(itype='prim.cylinder.item')) == 1
+
+
+def test_manifest_import_updates_compensation_and_profile(scene, tmp_path):
+    curve = fake_kit.new_curve(scene, 'wire[d5:p8]')
+    build([curve])
+    filename = str(tmp_path / 'scene.cables.jsonl')
+    cable_setup.export_manifest(filename, CableSceneIndex())
+    setup = get_setup(curve)
+    setup.cable_mesh.channel(CH_COMP).set(1.0)
+    build([curve], is_profile_independent=True)
+    assert get_setup(curve).profile_mesh.name == 'wire_profile'
+
+    cable_setup.import_manifest(filename, CableSceneIndex())
+    cable_setup.lxq.flush()
+
+    setup = get_setup(curve)
+    assert setup.cable_mesh.channel(CH_COMP).get() == pytest.approx(DEFAULT_COMPENSATION)
+    assert setup.profile_mesh.name == get_pooled_profile_name(8)
+
+
+def test_manifest_round_trip(scene, tmp_path):
+    curves = [fake_kit.new_curve(scene, f'wire_{i}[d{i + 1}:p8]') for i in range(3)]
+    build(curves)
+    filename = str(tmp_path / 'scene.cables.jsonl')
+
+    assert cable_setup.export_manifest(filename, CableSceneIndex()) == 3
+    for curve in curves:
+        CableLive(curve, CableSceneIndex()).remove_cable_setup()
+    cables = cable_setup.import_manifest(filename, CableSceneIndex())
+    cable_setup.lxq.flush()
+
+    assert len(cables) == 3
+    assert [get_setup(curve).cable_mesh.channel(CH_DIAMETER).get() for curve in curves] == pytest.approx(
+        [0.001, 0.002, 0.003]
+    )
+
+
+def test_unused_profiles_are_evicted(scene):
+    curve = fake_kit.new_curve(scene, 'wire[p8]')
+    build([curve])
+    CableLive(curve, CableSceneIndex()).remove_cable_setup()
+
+    assert CableSceneIndex().evict_unused_profiles() == [get_pooled_profile_name(8)]
+    assert scene.items(itype='prim.cylinder.item') == []
+    assert scene.items(itype=cable_setup.LOD_BLEND_TYPE) == []
+
+
+def get_lod_sources(item) -> list[str]:
+    return [channel.item.name for channel in item.channel(CH_LOD).revLinked]
+
+
+def test_scene_control_drives_every_lod(scene):
+    curves = [fake_kit.new_curve(scene, f'wire_{i}[p{6 + i % 2 * 2}]') for i in range(3)]
+    build(curves)
+    build([fake_kit.new_curve(scene, 'single[p12]')])
+
+    setups = [get_setup(curve) for curve in scene.meshes if get_setup(curve)]
+    controls = {setup.cable_mesh.id: setup.cable_mesh for setup in setups}
+    controls.update({setup.profile_mesh.id: setup.profile_mesh for setup in setups})
+    assert len(controls) == 4 + 3
+    assert all(get_lod_sources(control) == [cable_setup.LOD_CONTROL_NAME] for control in controls.values())
+    assert len(scene.items(itype='locator')) == 1
+
+    cable_setup.set_lod(0.25, CableSceneIndex())
+    assert scene.item(cable_setup.LOD_CONTROL_NAME).channel(CH_LOD).get() == 0.25
+    with pytest.raises(ValueError):
+        cable_setup.set_lod(2.0, CableSceneIndex())
+
+
+def test_camera_lod_overrides_and_update_relinks(scene):
+    curve = fake_kit.new_curve(scene, 'wire[p8]')
+    cable, = build([curve])
+    scene.addItem('camera').position.set((0.0, 0.0, 11.0))
+
+    cable_setup.set_camera_lod([cable], cable.index)
+    cable_setup.lxq.flush()
+    assert get_lod_sources(cable.cable_mesh) == []
+    assert get_lod_sources(cable.profile_mesh) == []
+    assert 0.0 < cable.cable_mesh.channel(CH_LOD).get() < 1.0
+
+    build([curve])
+    assert get_lod_sources(cable.cable_mesh) == [cable_setup.LOD_CONTROL_NAME]
+    assert get_lod_sources(cable.profile_mesh) == [cable_setup.LOD_CONTROL_NAME]
+
+
+def test_manifest_curve_with_reused_id_is_matched_by_name(scene):
+    curve = fake_kit.new_curve(scene, 'wire[d5]')
+    other = fake_kit.new_curve(scene, 'hose[d5]')
+    plan = CablePlan(other.id, 'wire[d5]')
+
+    assert cable_setup.get_manifest_curve(plan, CableSceneIndex()) == curve
+    plan.curve_id = scene.addItem('locator', 'wire[d5]').id
+    assert cable_setup.get_manifest_curve(plan, CableSceneIndex()) == curve
+    plan.curve_id = curve.id
+    assert cable_setup.get_manifest_curve(plan, CableSceneIndex()) == curve
+
+
+@pytest.mark.parametrize('command', ['dryrun', 'export'])
+def test_profile_is_reported_by_early_returns(scene, tmp_path, capsys, command):
+    import lx
+
+    scene.filename = str(tmp_path / 'scene.lxo')
+    scene.select(fake_kit.new_curve(scene, 'wire[d5]'))
+    lx.arguments[:] = ['profile', 'json', command]
+
+    cable_setup.main()
+
+    assert not cable_setup.profiler.is_enabled
+    assert 'lx.eval' in capsys.readouterr().out
+    assert (tmp_path / 'scene.profile.json').exists()
@@ -0,0 +1,81 @@
+import math
+
+import pytest
+
+from h3d_cable_setup.scripts.chain_resample import (
+    MIN_JOINT_COUNT,
+    ChainResampling,
+    get_arc_lengths,
+    get_chain_weights,
+    get_joint_arc_lengths,
+    resample_chain,
+)
+
+
+def new_line(count: int, step: float = 0.1) -> list[tuple[float, float, float]]:
+    return [(0.0, i * step, 0.0) for i in range(count)]
+
+
+def test_resampling_is_off_by_default():
+    assert not ChainResampling().is_enabled
+    assert ChainResampling(joint_count=4).is_enabled
+    assert ChainResampling(max_segment_length=0.5).is_enabled
+
+
+@pytest.mark.parametrize('joint_count, max_segment_length', [(-1, 0.0), (0, -0.5)])
+def test_resampling_rejects_negative_values(joint_count, max_segment_length):
+    with pytest.raises(ValueError):
+        ChainResampling(joint_count, max_segment_length)
+
+
+@pytest.mark.parametrize('resampling, chain_length, vertex_count, joint_count', [
+    (ChainResampling(joint_count=8), 1.0, 100, 8),
+    (ChainResampling(joint_count=8), 1.0, 5, 5),
+    (ChainResampling(joint_count=1), 1.0, 100, MIN_JOINT_COUNT),
+    (ChainResampling(max_segment_length=0.25), 1.0, 100, 5),
+    (ChainResampling(max_segment_length=0.3), 1.0, 100, 5),
+    (ChainResampling(max_segment_length=10.0), 1.0, 100, MIN_JOINT_COUNT),
+])
+def test_joint_count(resampling, chain_length, vertex_count, joint_count):
+    assert resampling.get_joint_count(chain_length, vertex_count) == joint_count
+
+
+@pytest.mark.parametrize('vertex_count', [0, 1])
+def test_joint_count_rejects_chains_shorter_than_two_vertices(vertex_count):
+    with pytest.raises(ValueError):
+        ChainResampling(joint_count=8).get_joint_count(0.0, vertex_count)
+
+
+def test_arc_lengths():
+    assert get_arc_lengths([(0.0, 0.0, 0.0), (3.0, 4.0, 0.0), (3.0, 4.0, 1.0)]) == pytest.approx([0.0, 5.0, 6.0])
+
+
+def test_resampled_joints_are_evenly_spaced():
+    positions = new_line(101)
+    arc_lengths = get_arc_lengths(positions)
+    joint_arc_lengths = get_joint_arc_lengths(arc_lengths[-1], 5)
+
+    joints = [tuple(joint) for joint in resample_chain(positions, arc_lengths, joint_arc_lengths)]
+
+    assert joints[0] == pytest.approx(positions[0])
+    assert joints[-1] == pytest.approx(positions[-1])
+    spacing = [math.dist(first, second) for first, second in zip(joints, joints[1:])]
+    assert spacing == pytest.approx([2.5] * 4)
+
+
+def test_weights_blend_between_neighboring_joints():
+    positions = new_line(21)
+    arc_lengths = get_arc_lengths(positions)
+    joint_arc_lengths = get_joint_arc_lengths(arc_lengths[-1], 3)
+
+    weight_maps = get_chain_weights(arc_lengths, joint_arc_lengths).get_weight_maps(3)
+
+    assert len(weight_maps) == 3
+    for vertex in range(len(positions)):
+        assert sum(weight_map.get(vertex, 0.0) for weight_map in weight_maps) == pytest.approx(1.0)
+        assert sum(vertex in weight_map for weight_map in weight_maps) <= 2
+    assert weight_maps[0][0] == pytest.approx(1.0)
+    assert weight_maps[1][10] == pytest.approx(1.0)
+    assert weight_maps[2][20] == pytest.approx(1.0)
+    assert weight_maps[0][5] == pytest.approx(0.5)
+    assert weight_maps[1][5] == pytest.approx(0.5)
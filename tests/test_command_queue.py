@@ -0,0 +1,119 @@
+import pytest
+
+from h3d_cable_setup.scripts.command_queue import PRESET_BROWSER_COMMAND, CommandQueue, replay
+
+
+@pytest.fixture
+def queue(scene):
+    return CommandQueue()
+
+
+def test_repeated_selection_is_collapsed(queue):
+    queue.eval('select.drop item')
+    queue.eval('select.drop item')
+    queue.eval('layer.new')
+    queue.eval('layer.new')
+
+    assert queue.commands == ['select.drop item', 'layer.new', 'layer.new']
+    assert queue.issued == 4
+
+
+def test_setup_mode_toggles_cancel_out(queue):
+    queue.eval('anim.setup on')
+    queue.eval('anim.setup off')
+    queue.eval('anim.setup off')
+    queue.eval('anim.setup on')
+
+    assert queue.commands == []
+
+
+def test_item_selection_set_overrides_preceding_selections(scene, queue):
+    first = scene.addMesh('first')
+    second = scene.addMesh('second')
+    queue.select(first)
+    queue.select(second, replace=False)
+    queue.select(first)
+
+    assert queue.commands == [f'select.item {first.id} set']
+
+
+def test_flush_executes_in_order(scene, queue):
+    import lx
+
+    mesh = scene.addMesh('mesh')
+    queue.eval('select.drop item')
+    queue.select(mesh)
+    queue.eval(f'item.editorColor orange')
+    assert lx.history == []
+
+    queue.flush()
+
+    assert lx.history == ['select.drop item', f'select.item {mesh.id} set', 'item.editorColor orange']
+    assert queue.commands == []
+    assert queue.executed == 3
+    assert queue.selection_events == 2
+    assert mesh.editor_color == 'orange'
+
+
+def test_preset_browser_state_is_cached(queue):
+    from h3d_utilites.scripts import h3d_utils
+
+    queue.preset_browser(False)
+    assert queue.commands == []
+
+    queue.preset_browser(True)
+    queue.flush()
+
+    assert h3d_utils.preset_browser_opened
+    assert queue.journal == [f'{PRESET_BROWSER_COMMAND} True']
+
+
+def test_consecutive_preset_browser_toggles_cancel_out(queue):
+    queue.preset_browser(True)
+    queue.preset_browser(False)
+
+    assert queue.commands == []
+    assert not queue.is_preset_browser_opened()
+
+
+def test_headless_session_skips_preset_browser(queue):
+    import lx
+
+    lx.headless = True
+    queue.preset_browser(True)
+
+    assert queue.commands == []
+    assert queue.issued == 1
+
+
+def test_journal_dump_and_replay(scene, queue, tmp_path):
+    from h3d_utilites.scripts import h3d_utils
+
+    mesh = scene.addMesh('mesh')
+    queue.preset_browser(True)
+    queue.select(mesh)
+    queue.eval('item.editorColor orange')
+    filename = str(tmp_path / 'scene.journal')
+
+    queue.dump(filename)
+    h3d_utils.reset()
+    replayed: list[str] = []
+
+    assert replay(filename, replayed.append) == 3
+    assert replayed == [f'select.item {mesh.id} set', 'item.editorColor orange']
+    assert h3d_utils.preset_browser_opened
+
+
+def test_vertex_selection_runs_after_queued_commands(scene, queue):
+    import lx
+
+    mesh = scene.addMesh('mesh')
+    with mesh.geometry as geometry:
+        vertex = geometry.vertices.new((0.0, 0.0, 0.0))
+    queue.eval('select.typeFrom vertex')
+
+    queue.select_vertex(vertex)
+
+    assert lx.history == ['select.typeFrom vertex']
+    assert [selected.index for selected in mesh.geometry.vertices.selected] == [vertex.index]
+    assert queue.selection_events == 2
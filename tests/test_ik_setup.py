@@ -0,0 +1,192 @@
+import pytest
+
+import fake_kit
+import h3d_cable_setup.scripts.ik_setup_by_selected_vertices as ik_setup
+from h3d_cable_setup.scripts.chain_resample import ChainResampling
+from h3d_cable_setup.scripts.ik_setup_by_selected_vertices import (
+    STATUS_CREATED,
+    STATUS_SKIPPED,
+    STATUS_UNCHANGED,
+    STATUS_UPDATED,
+    IkSet,
+)
+
+
+def build(meshes, resampling=None) -> list[ik_setup.IkResult]:
+    results = ik_setup.build_ik_setups(meshes, resampling)
+    ik_setup.lxq.flush()
+    return results
+
+
+def reselect(mesh, count: int, is_reversed: bool = False) -> None:
+    # the chain starts at the first selected vertex, select in the same order as fake_kit.new_chain() by default
+    vertices = list(mesh.geometry.vertices)[:count]
+    mesh.scene.drop_vertex_selection()
+    mesh.geometry.vertices.select(vertices if is_reversed else vertices[::-1], replace=False)
+
+
+def test_chain_from_selected_vertices(scene):
+    mesh = fake_kit.new_chain(scene, 'arm', 5)
+
+    result, = build([mesh])
+
+    assert result.status == STATUS_CREATED
+    ik_set = IkSet.find(mesh)
+    assert ik_set.is_consistent()
+    assert len(ik_set.joints) == 5
+    heights = sorted(position[1] for position in ik_set.get_joint_positions())
+    assert heights == pytest.approx([0.0, 0.1, 0.2, 0.3, 0.4])
+    assert not scene.is_setup_mode
+
+
+def test_build_keeps_vertex_selection(scene):
+    mesh = fake_kit.new_chain(scene, 'arm', 5)
+    selection = [vertex.index for vertex in mesh.geometry.vertices.selected]
+
+    build([mesh])
+
+    assert [vertex.index for vertex in mesh.geometry.vertices.selected] == selection
+
+
+def test_rerun_with_same_vertices_is_unchanged(scene):
+    mesh = fake_kit.new_chain(scene, 'arm', 5)
+    build([mesh])
+    items = {item.id for item in scene.items()}
+    reselect(mesh, 5)
+
+    result, = build([mesh])
+
+    assert result.status == STATUS_UNCHANGED
+    assert {item.id for item in scene.items()} == items
+
+
+def test_rerun_with_fewer_vertices_removes_joints(scene):
+    mesh = fake_kit.new_chain(scene, 'arm', 5)
+    build([mesh])
+    reselect(mesh, 3)
+
+    result, = build([mesh])
+
+    assert result.status == STATUS_UPDATED
+    ik_set = IkSet.find(mesh)
+    assert len(ik_set.joints) == 3
+    assert len(ik_set.weight_containers) == 3
+    assert len(scene.items(itype='genInfluence')) == 3
+
+
+def test_rerun_edits_joints_in_setup_mode(scene, monkeypatch):
+    mesh = fake_kit.new_chain(scene, 'arm', 5)
+    build([mesh])
+    reselect(mesh, 3)
+    modes: list[bool] = []
+    for name in ('remove_joint', 'set_chain'):
+        edit = getattr(ik_setup, name)
+        monkeypatch.setattr(ik_setup, name, lambda *args, edit=edit: (modes.append(scene.is_setup_mode), edit(*args)))
+
+    build([mesh])
+
+    assert modes == [True, True, True]
+    assert not scene.is_setup_mode
+
+
+def get_ik_item_names(scene) -> list[str]:
+    return sorted(item.name for item in scene.items() if '_IK_solver' in item.name or '_IK_goal' in item.name)
+
+
+def test_rerun_replaces_solver_and_goal(scene):
+    mesh = fake_kit.new_chain(scene, 'arm', 5)
+    build([mesh])
+    assert get_ik_item_names(scene) == ['arm_IK_goal', 'arm_IK_solver']
+    reselect(mesh, 3)
+
+    build([mesh])
+
+    assert get_ik_item_names(scene) == ['arm_IK_goal', 'arm_IK_solver']
+    solver, = scene.items(itype='ikFullBody')
+    assert IkSet.find(mesh).joints[-1] in solver.itemGraph('ikfb').forward()
+
+
+def test_reversed_selection_reassigns_ik(scene):
+    mesh = fake_kit.new_chain(scene, 'arm', 5)
+    build([mesh])
+    reselect(mesh, 5, is_reversed=True)
+    journal_size = len(ik_setup.lxq.journal)
+
+    result, = build([mesh])
+
+    assert result.status == STATUS_UPDATED
+    assert 'ikfb.assign' in ik_setup.lxq.journal[journal_size:]
+    ik_set = IkSet.find(mesh)
+    assert ik_set.get_joint_positions()[0][1] == pytest.approx(0.0)
+    solver, = scene.items(itype='ikFullBody')
+    assert set(solver.itemGraph('ikfb').forward()) == {ik_set.joints[0], ik_set.joints[-1]}
+    assert get_ik_item_names(scene) == ['arm_IK_goal', 'arm_IK_solver']
+
+
+def test_remove_leaves_no_ik_items(scene):
+    mesh = fake_kit.new_chain(scene, 'arm', 5)
+    items = {item.id for item in scene.items()}
+    build([mesh])
+
+    IkSet.find(mesh).remove()
+
+    assert {item.id for item in scene.items()} == items
+
+
+def test_rerun_with_one_vertex_is_skipped(scene, capsys):
+    mesh = fake_kit.new_chain(scene, 'arm', 5)
+    build([mesh])
+    items = {item.id for item in scene.items()}
+    reselect(mesh, 1)
+
+    result, = build([mesh])
+
+    assert result.status == STATUS_SKIPPED
+    assert {item.id for item in scene.items()} == items
+    assert 'Select at least 2 vertices' in capsys.readouterr().out
+
+
+def test_several_meshes_in_one_pass(scene):
+    meshes = [fake_kit.new_chain(scene, name, 4) for name in ('arm', 'leg')]
+
+    results = build(meshes)
+
+    assert [result.status for result in results] == [STATUS_CREATED, STATUS_CREATED]
+    assert [ik_setup.lxq.journal.count(command) for command in ('anim.setup on', 'anim.setup off')] == [1, 1]
+
+
+def test_resampled_chain(scene):
+    mesh = fake_kit.new_chain(scene, 'tail', 41, step=0.01)
+
+    result, = build([mesh], ChainResampling(joint_count=5))
+
+    assert result.joints == 5
+    assert len(IkSet.find(mesh).joints) == 5
+    weight_maps = mesh.geometry.vmaps.weightMaps
+    assert [weight_map.name for weight_map in weight_maps] == [f'tail_IK_weight_{i}' for i in range(5)]
+    assert len(scene.items(itype='genInfluence')) == 5
+    assert scene.items(itype='weightContainer') == []
+
+
+def test_resampled_rerun_replaces_weight_maps(scene):
+    mesh = fake_kit.new_chain(scene, 'tail', 41, step=0.01)
+    build([mesh], ChainResampling(joint_count=5))
+    reselect(mesh, 41)
+
+    build([mesh], ChainResampling(joint_count=3))
+
+    weight_maps = mesh.geometry.vmaps.weightMaps
+    assert [weight_map.name for weight_map in weight_maps] == [f'tail_IK_weight_{i}' for i in range(3)]
+    # a vertex is weighted by at most two neighbouring joints, nothing else is written
+    assert sum(weight_map.writes for weight_map in weight_maps) <= 2 * 41
+    assert len(scene.items(itype='genInfluence')) == 3
+
+
+def test_remove_resampled_set_removes_weight_maps(scene):
+    mesh = fake_kit.new_chain(scene, 'tail', 41, step=0.01)
+    build([mesh], ChainResampling(joint_count=5))
+
+    IkSet.find(mesh).remove()
+
+    assert mesh.geometry.vmaps.weightMaps == []
+    assert scene.items(itype='genInfluence') == []
@@ -0,0 +1,83 @@
+import pytest
+
+from h3d_cable_setup.scripts.command_queue import CommandQueue
+from h3d_cable_setup.scripts.preset_cache import PresetCache
+
+
+PRESET_SWEEP = '[itemtypes]:MeshOperations/curve/curve.sweep.itemtype'
+PRESET_MULTIPLY = '[itemtypes]:ChannelModifiers/math/cmMathBasic(mul).itemtype'
+
+
+@pytest.fixture
+def presets(scene):
+    return PresetCache(CommandQueue())
+
+
+def test_preset_is_resolved_once_per_session(scene, presets):
+    mesh = scene.addMesh('mesh')
+    presets.command_queue.select(mesh)
+    with presets:
+        presets.do(PRESET_SWEEP)
+        presets.do(PRESET_SWEEP)
+
+    journal = presets.command_queue.journal
+    assert sum(command.startswith('select.preset') for command in journal) == 1
+    assert journal.count('preset.do') == 2
+    assert len(mesh.itemGraph('deformers').reverse()) == 2
+    assert (presets.resolved, presets.instantiated, presets.sessions) == (1, 2, 1)
+
+
+def test_preset_is_resolved_again_in_the_next_session(scene, presets):
+    presets.command_queue.select(scene.addMesh('mesh'))
+    presets.do(PRESET_SWEEP)
+    presets.do(PRESET_SWEEP)
+
+    assert (presets.resolved, presets.sessions) == (2, 2)
+
+
+def test_items_are_cloned_from_a_session_template(scene, presets):
+    with presets:
+        items = [presets.new_item(PRESET_MULTIPLY, 'cmMathBasic') for _ in range(3)]
+        assert len(scene.items(itype='cmMathBasic')) == 4
+
+    assert scene.items(itype='cmMathBasic') == items
+    assert all(item.channel('operation').get() == 'mul' for item in items)
+    assert (presets.instantiated, presets.cloned) == (1, 3)
+    assert presets.templates == {}
+
+
+def test_preset_browser_is_opened_once_and_restored(scene, presets):
+    from h3d_utilites.scripts import h3d_utils
+
+    presets.command_queue.select(scene.addMesh('mesh'))
+    with presets:
+        presets.do(PRESET_SWEEP)
+        with presets:
+            presets.do(PRESET_SWEEP)
+    presets.command_queue.flush()
+
+    assert not h3d_utils.preset_browser_opened
+    assert h3d_utils.preset_browser_toggles == 2
+
+
+def test_opened_preset_browser_is_left_open(scene, presets):
+    from h3d_utilites.scripts import h3d_utils
+
+    h3d_utils.preset_browser_opened = True
+    presets.command_queue.select(scene.addMesh('mesh'))
+    presets.do(PRESET_SWEEP)
+    presets.command_queue.flush()
+
+    assert h3d_utils.preset_browser_opened
+    assert h3d_utils.preset_browser_toggles == 0
+
+
+def test_empty_session_does_not_toggle_preset_browser(scene, presets):
+    from h3d_utilites.scripts import h3d_utils
+
+    with presets:
+        with presets:
+            pass
+
+    assert presets.command_queue.journal == []
+    assert h3d_utils.preset_browser_toggles == 0
@@ -0,0 +1,91 @@
+import csv
+import json
+
+import pytest
+
+from h3d_cable_setup.scripts.command_queue import CommandQueue
+from h3d_cable_setup.scripts.profiling import StageProfiler
+
+
+@pytest.fixture
+def profiler(scene):
+    return StageProfiler()
+
+
+def test_disabled_profiler_records_nothing(profiler):
+    @profiler.stage('noop')
+    def noop():
+        return 1
+
+    assert noop() == 1
+    assert profiler.stages == {}
+
+
+def test_stage_counts_calls_and_commands(scene, profiler):
+    queue = CommandQueue()
+    mesh = scene.addMesh('mesh')
+
+    @profiler.stage('color')
+    def color():
+        queue.select(mesh)
+        queue.eval('item.editorColor orange')
+        queue.flush()
+
+    profiler.start(queue)
+    color()
+    color()
+    profiler.stop()
+
+    stats = profiler.stages['color']
+    assert (stats.calls, stats.commands, stats.evals) == (2, 4, 4)
+    assert stats.seconds > 0.0
+    assert 'color' in profiler.get_report()
+
+
+def test_queued_commands_are_charged_to_their_stage(scene, profiler):
+    queue = CommandQueue()
+    mesh = scene.addMesh('mesh')
+
+    @profiler.stage('select')
+    def select():
+        queue.select(mesh)
+
+    profiler.start(queue)
+    queue.eval('item.editorColor orange')
+    select()
+
+    stats = profiler.stages['select']
+    assert (stats.commands, stats.evals) == (1, 1)
+    assert queue.commands == []
+
+
+def test_stage_is_recorded_when_it_raises(profiler):
+    @profiler.stage('fail')
+    def fail():
+        raise RuntimeError('fail')
+
+    profiler.start(CommandQueue())
+    with pytest.raises(RuntimeError):
+        fail()
+
+    assert profiler.stages['fail'].calls == 1
+
+
+def test_reports_are_written(profiler, tmp_path):
+    @profiler.stage('noop')
+    def noop():
+        ...
+
+    profiler.start(CommandQueue())
+    noop()
+    json_filename = str(tmp_path / 'scene.profile.json')
+    csv_filename = str(tmp_path / 'scene.profile.csv')
+    profiler.write_json(json_filename, 'scene.lxo')
+    profiler.write_csv(csv_filename, 'scene.lxo')
+    profiler.write_csv(csv_filename, 'scene.lxo')
+
+    with open(json_filename) as file:
+        assert json.load(file)['stages'][0]['stage'] == 'noop'
+    with open(csv_filename) as file:
+        rows = list(csv.DictReader(file))
+    assert [row['stage'] for row in rows] == ['noop', 'noop']
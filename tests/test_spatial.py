@@ -0,0 +1,62 @@
+import math
+import random
+
+import pytest
+
+from h3d_cable_setup.scripts.spatial import KdTree
+
+
+def new_points(count: int, seed: int = 0) -> list[tuple[float, float, float]]:
+    rnd = random.Random(seed)
+    return [(rnd.uniform(-1, 1), rnd.uniform(-1, 1), rnd.uniform(-1, 1)) for _ in range(count)]
+
+
+def get_nearest(points, removed: set[int], point) -> int:
+    return min((i for i in range(len(points)) if i not in removed), key=lambda i: math.dist(points[i], point))
+
+
+def test_nearest_matches_brute_force():
+    points = new_points(500)
+    tree = KdTree(points)
+
+    for query in new_points(100, seed=1):
+        index, distance = tree.nearest(query)
+        assert index == get_nearest(points, set(), query)
+        assert distance == pytest.approx(math.dist(points[index], query))
+
+
+def test_removed_points_are_skipped():
+    points = new_points(200)
+    tree = KdTree(points)
+    removed: set[int] = set()
+
+    for query in new_points(150, seed=2):
+        index, _ = tree.nearest(query)
+        assert index == get_nearest(points, removed, query)
+        tree.remove(index)
+        removed.add(index)
+    tree.remove(next(iter(removed)))
+
+    assert sum(tree.removed) == len(removed)
+    assert tree.counts[tree.root] == len(points) - len(removed)
+
+
+def test_max_distance():
+    tree = KdTree([(0.0, 0.0, 0.0), (1.0, 0.0, 0.0)])
+
+    assert tree.nearest((0.9, 0.0, 0.0), 0.2)[0] == 1
+    assert tree.nearest((0.5, 0.5, 0.0), 0.1) == (-1, math.inf)
+
+
+def test_empty_tree():
+    tree = KdTree([])
+
+    assert len(tree) == 0
+    assert tree.nearest((0.0, 0.0, 0.0)) == (-1, math.inf)
+
+
+def test_all_points_removed():
+    tree = KdTree([(0.0, 0.0, 0.0)])
+    tree.remove(0)
+
+    assert tree.nearest((0.0, 0.0, 0.0)) == (-1, math.inf)
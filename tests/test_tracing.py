@@ -0,0 +1,55 @@
+import logging
+
+import pytest
+
+from h3d_cable_setup.scripts.tracing import Tracer, start_tracing, tracer
+
+
+@pytest.fixture
+def trace():
+    trace = Tracer('h3d_cable_setup_test')
+    yield trace
+    trace.stop()
+
+
+def test_stop_resets_timing_and_spans(trace, tmp_path):
+    trace.start(str(tmp_path / 'scene.log'), logging.INFO, is_timing=True)
+    with trace.span('wire', 'create'):
+        pass
+    assert 'wire' in trace.spans
+
+    trace.stop()
+
+    assert not trace.is_timing
+    assert trace.spans == {}
+    assert not trace.logger.isEnabledFor(logging.INFO)
+
+
+def test_restart_does_not_keep_previous_spans(trace, tmp_path):
+    trace.start(str(tmp_path / 'scene.log'), logging.INFO, is_timing=True)
+    with trace.span('wire', 'create'):
+        pass
+
+    trace.start(str(tmp_path / 'scene.log'), logging.INFO, is_timing=True)
+
+    assert trace.spans == {}
+
+
+def test_start_tracing_without_flags_keeps_tracer_off(tmp_path):
+    start_tracing(['independent'], str(tmp_path / 'scene.lxo'))
+
+    assert tracer.listener is None
+    assert not tracer.is_timing
+
+
+def test_start_tracing_writes_log_next_to_scene(tmp_path):
+    try:
+        start_tracing(['timing'], str(tmp_path / 'scene.lxo'))
+        assert tracer.is_timing
+        assert not tracer.is_debug
+        with tracer.span('wire', 'create'):
+            pass
+    finally:
+        tracer.stop()
+
+    assert 'wire create' in (tmp_path / 'scene.log').read_text()
@@ -0,0 +1,81 @@
+import random
+
+import pytest
+
+from h3d_cable_setup.scripts.vertex_order import (
+    ORDER_LOOP,
+    ORDER_NEAREST,
+    ORDER_PATH,
+    ORDER_SELECTION,
+    get_adjacency,
+    get_chain_order,
+)
+
+
+def shuffle_chain(count: int, is_loop: bool, seed: int = 0) -> tuple[list, list[list[int]], list[int]]:
+    # positions and neighbors in a shuffled selection order, chain index per selected vertex
+    rnd = random.Random(seed)
+    chain = list(range(count))
+    rnd.shuffle(chain)
+    selection = {vertex: i for i, vertex in enumerate(chain)}
+    positions = [(float(vertex), 0.0, 0.0) for vertex in chain]
+    neighbors = []
+    for vertex in chain:
+        vertex_neighbors = [vertex - 1, vertex + 1]
+        if is_loop:
+            vertex_neighbors = [neighbor % count for neighbor in vertex_neighbors]
+        neighbors.append([selection[neighbor] for neighbor in vertex_neighbors if neighbor in selection])
+    return positions, neighbors, chain
+
+
+def test_open_path_is_walked_end_to_end():
+    positions, neighbors, chain = shuffle_chain(50, is_loop=False)
+
+    order, method = get_chain_order(positions, neighbors)
+
+    assert method == ORDER_PATH
+    walked = [chain[i] for i in order]
+    assert walked in (list(range(50)), list(reversed(range(50))))
+
+
+def test_loop_is_walked_around():
+    positions, neighbors, chain = shuffle_chain(20, is_loop=True)
+
+    order, method = get_chain_order(positions, neighbors)
+
+    assert method == ORDER_LOOP
+    walked = [chain[i] for i in order]
+    steps = {(second - first) % 20 for first, second in zip(walked, walked[1:])}
+    assert len(steps) == 1 and steps <= {1, 19}
+
+
+def test_branching_selection_falls_back_to_nearest_order():
+    positions = [(0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (2.0, 0.0, 0.0), (1.0, 1.0, 0.0)]
+    neighbors = [[1], [0, 2, 3], [1], [1]]
+
+    order, method = get_chain_order(positions, neighbors)
+
+    assert method == ORDER_NEAREST
+    assert sorted(order) == [0, 1, 2, 3]
+
+
+def test_vertices_without_edges_use_nearest_order():
+    positions = [(float(x), 0.0, 0.0) for x in (3, 0, 4, 1, 2)]
+
+    order, method = get_chain_order(positions, [[] for _ in positions])
+
+    assert method == ORDER_NEAREST
+    assert [positions[i][0] for i in order] in ([0, 1, 2, 3, 4], [4, 3, 2, 1, 0])
+
+
+def test_short_selection_keeps_selection_order():
+    assert get_chain_order([(0.0, 0.0, 0.0), (1.0, 0.0, 0.0)], [[1], [0]]) == ([0, 1], ORDER_SELECTION)
+
+
+def test_mismatched_neighbors():
+    with pytest.raises(ValueError):
+        get_chain_order([(0.0, 0.0, 0.0)], [])
+
+
+def test_adjacency_is_symmetric_without_self_references():
+    assert get_adjacency([[1, 0], [], [1]]) == [[1], [0, 2], [1]]